@@ -0,0 +1,256 @@
+"""
+Giao diện dòng lệnh (không hỏi input), dùng cho tự động hóa:
+
+    python cli.py task add --project P25_00001 --id TP25_00001_00003 --name "Thiết kế CSDL" \\
+        --assignee NV_00002 --start 01/12/2025 --deadline 10/12/2025 --priority High
+    python cli.py task add --jsonl tasks.jsonl        (mỗi dòng 1 task, "-" = đọc từ stdin)
+    python cli.py task list --project P25_00001
+    python cli.py report weekly --all --until 31/12/2025
+    python cli.py report portfolio --sort progress
+    python cli.py import --staff staff.csv --projects projects.csv --tasks tasks.jsonl
+    python cli.py export --dir export
+
+Mỗi lần chạy: đọc dữ liệu 1 lần, mọi thay đổi ghi 1 lần khi kết thúc.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from main import DATA_FILES, build_managers, make_stores
+from managers.staff_manager import STAFF_CSV_FIELDS
+from managers.storage import write_csv
+from managers.unit_of_work import UnitOfWork
+from models.project import Project
+from models.task import Task
+from reports.final_report import FinalReport
+from reports.portfolio_report import PortfolioReport
+from reports.weekly_report import WeeklyReport
+from services.bulk_import import IMPORT_ORDER, BulkImporter
+from services.task_service import TaskService
+
+DATE_FORMAT = "%d/%m/%Y"
+
+# Trường của 1 bản ghi task: tên tham số dòng lệnh / khóa trong JSON -> trường của TaskService
+TASK_RECORD_FIELDS = {
+    "project": "project_id",
+    "id": "task_id",
+    "name": "task_name",
+    "description": "task_description",
+    "assignee": "assignee_id",
+    "start": "start_date",
+    "deadline": "deadline",
+    "priority": "priority",
+    "status": "status_task",
+    "depends_on": "depends_on",
+}
+
+
+# ================= TASK =================
+def _parse_date(value, field):
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} không hợp lệ (dd/mm/yyyy): {value!r}")
+
+
+def _to_task_fields(record):
+    """Khóa dòng lệnh / JSON -> tên trường của TaskService (tên trường gốc giữ nguyên)"""
+    if not isinstance(record, dict):
+        return record
+    return {TASK_RECORD_FIELDS.get(k, k): v for k, v in record.items()}
+
+
+def _read_jsonl(path, line_numbers, errors):
+    """Đọc từng dòng JSON; số dòng của bản ghi thứ i ghi vào line_numbers[i]"""
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                errors.append((line_no, f"JSON không hợp lệ: {e}"))
+                continue
+            line_numbers.append(line_no)
+            yield _to_task_fields(record)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _format_errors(errors):
+    return "; ".join(f"{e['field']}: {e['message']}" if e["field"] else e["message"] for e in errors)
+
+
+def task_add(args, managers):
+    service = TaskService(managers[2])
+
+    line_numbers, errors = [], []
+    if args.jsonl:
+        records = _read_jsonl(args.jsonl, line_numbers, errors)
+    else:
+        line_numbers.append(None)
+        records = [_to_task_fields({f: getattr(args, f) for f in TASK_RECORD_FIELDS})]
+
+    result = service.create_many(records)
+    errors.extend((line_numbers[e["index"]], _format_errors(e["errors"])) for e in result.errors)
+
+    for line_no, message in sorted(errors, key=lambda e: e[0] or 0):
+        where = f"dòng {line_no}" if line_no else "task"
+        print(f"Lỗi {where}: {message}", file=sys.stderr)
+    print(f"Đã thêm {len(result.items)} task, {len(errors)} lỗi.")
+    return 1 if errors else 0
+
+
+def task_list(args, managers):
+    task_manager = managers[2]
+    if args.project:
+        tasks = task_manager.tasks_of_project(args.project)
+    elif args.assignee:
+        tasks = task_manager.tasks_of_assignee(args.assignee)
+    else:
+        tasks = task_manager.items
+
+    lines = []
+    for t in tasks:
+        lines.append("\t".join([
+            t.project_id, t.id, t.name, t.assignee_id or "",
+            t.deadline.strftime(DATE_FORMAT) if t.deadline else "",
+            t.priority, t.status_task,
+        ]))
+    print("\n".join(lines))
+    return 0
+
+
+# ================= REPORT =================
+def report_weekly(args, managers):
+    staff_manager, project_manager, task_manager, weekly_manager, _ = managers
+    until_date = _parse_date(args.until, "--until") if args.until else None
+    project_ids = None if args.all else args.project
+
+    reports, skipped = weekly_manager.generate_missing_reports(
+        project_manager, staff_manager, task_manager,
+        until_date, project_ids, workers=args.workers
+    )
+    for pid in skipped:
+        print(f"Bỏ qua {pid}: PM của dự án không hợp lệ.", file=sys.stderr)
+    print(f"Đã tạo {len(reports)} báo cáo cho {len({r.p_id for r in reports})} dự án.")
+    return 0
+
+
+def report_portfolio(args, managers):
+    PortfolioReport(managers[1], managers[2]).display(args.sort)
+    return 0
+
+
+# ================= EXPORT =================
+def export(args, managers):
+    """Ghi dữ liệu hiện tại (mọi chế độ lưu trữ) ra các file CSV trong thư mục --dir"""
+    staff_manager, project_manager, task_manager, weekly_manager, final_manager = managers
+    os.makedirs(args.dir, exist_ok=True)
+
+    tables = {
+        "staff": (STAFF_CSV_FIELDS, staff_manager._all_rows()),
+        "projects": (Project.csv_fields(), project_manager._all_rows()),
+        "tasks": (Task.csv_fields(), task_manager._all_rows()),
+        "weekly_reports": (WeeklyReport.csv_fields(), weekly_manager._load_all()),
+        "final_reports": (FinalReport.csv_fields(), final_manager._load_all()),
+    }
+    for name, (fields, rows) in tables.items():
+        path = os.path.join(args.dir, DATA_FILES[name])
+        write_csv(path, fields, [{f: r.get(f, "") for f in fields} for r in rows])
+        print(f"Đã xuất {len(rows)} dòng ra {path}")
+    return 0
+
+
+# ================= IMPORT =================
+def import_data(args, managers):
+    sources = {kind: getattr(args, kind) for kind in IMPORT_ORDER if getattr(args, kind)}
+    if not sources:
+        raise ValueError("Cần ít nhất 1 file: --staff / --projects / --tasks")
+
+    results = BulkImporter(*managers[:3]).run(sources)
+    failed = False
+    for kind, result in results.items():
+        for row_no, errors in result.errors:
+            print(f"Lỗi {result.path} dòng {row_no}: {_format_errors(errors)}", file=sys.stderr)
+        print(f"{kind}: đã nhập {result.imported} dòng, {len(result.errors)} lỗi ({result.path})")
+        failed = failed or bool(result.errors)
+    return 1 if failed else 0
+
+
+# ================= PARSER =================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Quản lý dự án - dòng lệnh")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # task
+    task = commands.add_parser("task", help="Quản lý công việc").add_subparsers(dest="action", required=True)
+
+    add = task.add_parser("add", help="Thêm 1 task (tham số) hoặc nhiều task (--jsonl)")
+    add.add_argument("--jsonl", help="File JSON Lines, mỗi dòng 1 task (\"-\" = stdin)")
+    add.add_argument("--project")
+    add.add_argument("--id")
+    add.add_argument("--name")
+    add.add_argument("--description", default="")
+    add.add_argument("--assignee", default="")
+    add.add_argument("--start", help="dd/mm/yyyy")
+    add.add_argument("--deadline", help="dd/mm/yyyy")
+    add.add_argument("--priority", default="Low", choices=Task.PRIORITY_LEVELS)
+    add.add_argument("--status", default="To Do", choices=Task.STATUS_LIST)
+    add.add_argument("--depends-on", dest="depends_on", nargs="*", default=[])
+    add.set_defaults(handler=task_add)
+
+    lst = task.add_parser("list", help="Liệt kê task (phân cách bằng tab)")
+    lst.add_argument("--project")
+    lst.add_argument("--assignee")
+    lst.set_defaults(handler=task_list)
+
+    # report
+    report = commands.add_parser("report", help="Báo cáo").add_subparsers(dest="action", required=True)
+
+    weekly = report.add_parser("weekly", help="Tạo các báo cáo tuần còn thiếu")
+    scope = weekly.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--all", action="store_true", help="Tất cả dự án")
+    scope.add_argument("--project", nargs="+", help="Mã dự án")
+    weekly.add_argument("--until", help="Tạo đến ngày dd/mm/yyyy (mặc định hôm nay)")
+    weekly.add_argument("--workers", type=int, help="Số tiến trình tính thống kê")
+    weekly.set_defaults(handler=report_weekly)
+
+    portfolio = report.add_parser("portfolio", help="Tổng quan tất cả dự án")
+    portfolio.add_argument("--sort", default="risk", choices=list(PortfolioReport.SORT_KEYS))
+    portfolio.set_defaults(handler=report_portfolio)
+
+    # import
+    imp = commands.add_parser("import", help="Nhập hàng loạt từ file CSV / JSON Lines (.jsonl)")
+    imp.add_argument("--staff", help="File nhân viên")
+    imp.add_argument("--projects", help="File dự án")
+    imp.add_argument("--tasks", help="File task (task phụ thuộc phải ở dòng trước)")
+    imp.set_defaults(handler=import_data)
+
+    # export
+    exp = commands.add_parser("export", help="Xuất toàn bộ dữ liệu ra CSV")
+    exp.add_argument("--dir", default="export", help="Thư mục đích (mặc định: export)")
+    exp.set_defaults(handler=export)
+
+    return parser
+
+
+def run(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # 1 lần đọc dữ liệu cho cả lần chạy
+    UnitOfWork.recover()
+    managers = build_managers(make_stores())
+    try:
+        return args.handler(args, managers)
+    except ValueError as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
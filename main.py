@@ -1,9 +1,117 @@
-from managers.staff_manager import StaffManager
+import os
+import sys
+from datetime import datetime
+from managers.staff_manager import StaffManager, STAFF_CSV_FIELDS
 from managers.project_manager import ProjectManager
 from managers.task_manager import TaskManager
 from managers.weekly_report_manager import WeeklyReportManager
 from managers.final_report_manager import FinalReportManager
+from managers.storage import JournalStore, SQLiteDatabase
+from managers.unit_of_work import UnitOfWork
+from managers.task_history import TaskHistory
+from managers.dependency_graph import DependencyGraph, DEPENDENCY_FIELDS
 from models.progress import Progress
+from models.project import Project
+from models.task import Task
+from reports.base_report import BaseReport
+from reports.weekly_report import WeeklyReport
+from reports.final_report import FinalReport
+from reports.portfolio_report import PortfolioReport
+from reports.forecast_report import ForecastReport
+from reports.workload_report import WorkloadReport
+
+# Chế độ lưu trữ (có thể đặt qua biến môi trường PM_STORAGE):
+# - "csv"    : ghi đè toàn bộ file sau mỗi thay đổi
+# - "journal": dự án/task chỉ ghi nối thay đổi vào <file>.journal, gộp định kỳ ở luồng nền
+# - "sqlite" : toàn bộ dữ liệu lưu trong SQLITE_FILE, có chỉ mục theo dự án/nhân viên/deadline/trạng thái
+STORAGE_MODE = os.environ.get("PM_STORAGE", "csv")
+SQLITE_FILE = "project_management.db"
+# Phiên bản dữ liệu SQLite sau khi đã chuyển từ các file CSV cũ
+SQLITE_VERSION = 1
+# Lịch sử thay đổi task (chỉ ghi nối), dùng để dựng lại báo cáo của các kỳ đã qua
+HISTORY_FILE = "task_history.csv"
+DATA_FILES = {
+    "staff": "staff.csv",
+    "projects": "projects.csv",
+    "tasks": "tasks.csv",
+    "weekly_reports": "weekly_reports.csv",
+    "final_reports": "final_reports.csv",
+    # Quan hệ phụ thuộc giữa các task
+    "dependencies": "task_dependencies.csv",
+}
+
+TASK_DATE_FORMATS = {
+    "start_date": "%d/%m/%Y",
+    "deadline": "%d/%m/%Y",
+    "completed_date": "%d/%m/%Y",
+}
+
+
+def report_workers():
+    """Số tiến trình khi tạo hàng loạt báo cáo tuần (biến môi trường PM_REPORT_WORKERS, 1 = tuần tự)"""
+    value = os.environ.get("PM_REPORT_WORKERS", "1")
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print(f"PM_REPORT_WORKERS không hợp lệ ({value!r}), dùng 1 tiến trình.", file=sys.stderr)
+        return 1
+    return workers
+
+
+def make_stores():
+    """Trả về dict tên bảng -> store (None = manager dùng file CSV mặc định)"""
+    stores = dict.fromkeys(DATA_FILES)
+
+    if STORAGE_MODE == "journal":
+        stores["projects"] = JournalStore(DATA_FILES["projects"], Project.csv_fields(), "project_id")
+        stores["tasks"] = JournalStore(DATA_FILES["tasks"], Task.csv_fields(), "task_id")
+        stores["dependencies"] = JournalStore(DATA_FILES["dependencies"], DEPENDENCY_FIELDS, "task_id")
+
+    elif STORAGE_MODE == "sqlite":
+        db = SQLiteDatabase(SQLITE_FILE)
+        stores["staff"] = db.table("staff", STAFF_CSV_FIELDS, "staff_id", indexes=["role"])
+        stores["projects"] = db.table(
+            "projects", Project.csv_fields(), "project_id",
+            indexes=["pm_id", "status_project"]
+        )
+        stores["tasks"] = db.table(
+            "tasks", Task.csv_fields(), "task_id",
+            indexes=["project_id", "assignee_id", "deadline", "status_task"],
+            date_fields=TASK_DATE_FORMATS
+        )
+        stores["weekly_reports"] = db.table(
+            "weekly_reports", WeeklyReport.csv_fields(), "report_id", indexes=["project_id"]
+        )
+        stores["final_reports"] = db.table(
+            "final_reports", FinalReport.csv_fields(), "report_id", indexes=["project_id"]
+        )
+        stores["dependencies"] = db.table("task_dependencies", DEPENDENCY_FIELDS, "task_id")
+
+        # Chỉ 1 lần (DB chưa đánh dấu phiên bản): chuyển dữ liệu từ các file CSV cũ sang SQLite.
+        # Sau đó bảng trống là do người dùng xóa hết -> không nhập lại.
+        if db.version < SQLITE_VERSION:
+            for name, store in stores.items():
+                if store.count() == 0 and os.path.exists(DATA_FILES[name]):
+                    if name in ("weekly_reports", "final_reports"):
+                        # File báo cáo có dòng sửa/xóa ghi nối -> gộp trước khi chuyển
+                        rows = BaseReport.load_from_csv(DATA_FILES[name])
+                        store.save_all(rows)
+                        n = len(rows)
+                    else:
+                        n = store.import_csv(DATA_FILES[name])
+                    print(f"Đã chuyển {n} dòng từ {DATA_FILES[name]} sang SQLite")
+            db.version = SQLITE_VERSION
+
+    return stores
+
+
+def export_to_csv(stores):
+    """Xuất dữ liệu SQLite ra lại các file CSV"""
+    for name, store in stores.items():
+        n = store.export_csv(DATA_FILES[name])
+        print(f"Đã xuất {n} dòng ra {DATA_FILES[name]}")
 
 
 def staff_menu(staff_manager):
@@ -14,6 +122,7 @@ def staff_menu(staff_manager):
         print("3. Xóa nhân viên")
         print("4. Tìm kiếm nhân viên")
         print("5. Hiển thị danh sách nhân viên")
+        print("6. Khối lượng công việc theo tuần")
         print("0. Quay lại")
 
         choice = input("Chọn chức năng: ").strip()
@@ -28,12 +137,36 @@ def staff_menu(staff_manager):
             staff_manager.search_staff()
         elif choice == "5":
             staff_manager.display_all()
+        elif choice == "6":
+            workload_menu(staff_manager)
         elif choice == "0":
             break
         else:
             print("Lựa chọn không hợp lệ")
 
 
+def workload_menu(staff_manager):
+    print("\n--- KHỐI LƯỢNG CÔNG VIỆC ---")
+    while True:
+        s_str = input("Từ tuần chứa ngày (dd/mm/yyyy, Enter = tuần này): ").strip()
+        try:
+            start_date = datetime.strptime(s_str, "%d/%m/%Y") if s_str else None
+            break
+        except ValueError:
+            print("Sai định dạng ngày.")
+    while True:
+        w_str = input("Số tuần (Enter = 8): ").strip()
+        if not w_str:
+            weeks = 8
+            break
+        if w_str.isdigit() and int(w_str) > 0:
+            weeks = int(w_str)
+            break
+        print("Số tuần phải là số nguyên dương.")
+
+    WorkloadReport(staff_manager, staff_manager.task_manager, start_date, weeks).display()
+
+
 def project_menu(project_manager):
     while True:
         print("\n--- QUẢN LÝ DỰ ÁN ---")
@@ -74,6 +207,9 @@ def task_menu(task_manager):
         print("4. Tìm kiếm task")
         print("5. Hiển thị danh sách task")
         print("6. Kiểm tra task quá hạn")
+        print("7. Task sắp đến hạn")
+        print("8. Phụ thuộc & đường găng")
+        print("9. Tự động giao task chưa có người làm")
         print("0. Quay lại")
 
         choice = input("Chọn chức năng: ").strip()
@@ -90,6 +226,12 @@ def task_menu(task_manager):
             task_manager.display_all_tasks()
         elif choice == "6":
             task_manager.display_overdue_tasks()
+        elif choice == "7":
+            task_manager.display_due_soon_tasks()
+        elif choice == "8":
+            task_manager.manage_dependencies()
+        elif choice == "9":
+            task_manager.auto_assign_tasks()
         elif choice == "0":
             break
         else:
@@ -97,12 +239,34 @@ def task_menu(task_manager):
 
 
 def progress_menu(project_manager, task_manager):
-    print("\n--- KIỂM TRA TIẾN ĐỘ DỰ ÁN ---")
-    progress = Progress(
-        project_list=project_manager.items, 
-        all_tasks=task_manager.items
-    )
-    progress.display_summary_with_tasks()
+    while True:
+        print("\n--- KIỂM TRA TIẾN ĐỘ ---")
+        print("1. Tiến độ 1 dự án")
+        print("2. Tổng quan tất cả dự án")
+        print("3. Dự báo ngày hoàn thành")
+        print("0. Quay lại")
+
+        choice = input("Chọn chức năng: ").strip()
+
+        if choice == "1":
+            print("\n--- KIỂM TRA TIẾN ĐỘ DỰ ÁN ---")
+            progress = Progress(
+                project_list=project_manager.items, 
+                task_manager=task_manager
+            )
+            progress.display_summary_with_tasks()
+        elif choice == "2":
+            print("Sắp xếp theo: 1. Rủi ro  2. Tiến độ  3. Số ngày còn lại  4. Ngân sách")
+            sort_by = {"2": "progress", "3": "days_left", "4": "budget"}.get(
+                input("Chọn (Enter = rủi ro): ").strip(), "risk"
+            )
+            PortfolioReport(project_manager, task_manager).display(sort_by)
+        elif choice == "3":
+            ForecastReport(project_manager, task_manager, task_manager.staff_manager).display()
+        elif choice == "0":
+            break
+        else:
+            print("Lựa chọn không hợp lệ.")
 
 
 def report_menu(weekly_manager, final_manager, project_manager, staff_manager, task_manager):
@@ -123,6 +287,8 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                 print("3. Tìm kiếm báo cáo")
                 print("4. Hiển thị danh sách (Tóm tắt)")
                 print("5. Xóa báo cáo")
+                print("6. Nén file báo cáo")
+                print("7. Tạo các báo cáo tuần còn thiếu")
                 print("0. Quay lại")
 
                 c = input("Chọn chức năng: ").strip()
@@ -137,6 +303,10 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                     weekly_manager.display_all()
                 elif c == "5":
                     weekly_manager.delete_report()
+                elif c == "6":
+                    weekly_manager.compact_file()
+                elif c == "7":
+                    weekly_manager.backfill_reports(project_manager, staff_manager, task_manager)
                 elif c == "0":
                     break
                 else:
@@ -151,6 +321,7 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                 print("3. Tìm kiếm báo cáo")
                 print("4. Hiển thị danh sách (Tóm tắt)")
                 print("5. Xóa báo cáo")
+                print("6. Nén file báo cáo")
                 print("0. Quay lại")
 
                 c = input("Chọn chức năng: ").strip()
@@ -165,6 +336,8 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                     final_manager.display_all()
                 elif c == "5":
                     final_manager.delete_report()
+                elif c == "6":
+                    final_manager.compact_file()
                 elif c == "0":
                     break
                 else:
@@ -176,33 +349,54 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
             print("Lựa chọn không hợp lệ.")
 
 
-def main():
+def build_managers(stores):
+    """Khởi tạo và liên kết các manager -> (staff, project, task, weekly report, final report)"""
     # 1. Khởi tạo StaffManager
-    staff_manager = StaffManager("staff.csv")
+    staff_manager = StaffManager(DATA_FILES["staff"], store=stores["staff"])
 
     # 2. Khởi tạo ProjectManager TRƯỚC (chưa có task_manager)
     project_manager = ProjectManager(
-        "projects.csv",
+        DATA_FILES["projects"],
         staff_manager=staff_manager,
-        task_manager=None
+        task_manager=None,
+        store=stores["projects"]
     )
 
     # 3. Khởi tạo TaskManager (TRUYỀN project_manager)
     task_manager = TaskManager(
-        filename="tasks.csv",
+        filename=DATA_FILES["tasks"],
         staff_manager=staff_manager,
-        project_manager=project_manager
+        project_manager=project_manager,
+        store=stores["tasks"],
+        history=TaskHistory(HISTORY_FILE)
     )
 
     # 4. GÁN NGƯỢC task_manager cho project_manager
     project_manager.task_manager = task_manager
+    task_manager.dependencies = DependencyGraph(
+        DATA_FILES["dependencies"], task_manager, store=stores["dependencies"]
+    )
 
     # 5. Gán task_manager cho staff_manager
     staff_manager.set_task_manager(task_manager)
 
     # 6. Khởi tạo các manager báo cáo
-    weekly_report_manager = WeeklyReportManager("weekly_reports.csv")
-    final_report_manager = FinalReportManager("final_reports.csv")
+    weekly_report_manager = WeeklyReportManager(
+        DATA_FILES["weekly_reports"], store=stores["weekly_reports"], workers=report_workers()
+    )
+    final_report_manager = FinalReportManager(DATA_FILES["final_reports"], store=stores["final_reports"])
+
+    return staff_manager, project_manager, task_manager, weekly_report_manager, final_report_manager
+
+
+def main():
+    # Hoàn tất lần lưu bị dừng giữa chừng (nếu có) trước khi đọc dữ liệu
+    UnitOfWork.recover()
+    stores = make_stores()
+    (
+        staff_manager, project_manager, task_manager,
+        weekly_report_manager, final_report_manager
+    ) = build_managers(stores)
 
     # ===== MENU CHÍNH =====
     while True:
@@ -212,6 +406,8 @@ def main():
         print("3. Quản lý công việc")
         print("4. Kiểm tra tiến độ")
         print("5. Quản lý báo cáo")
+        if STORAGE_MODE == "sqlite":
+            print("6. Xuất dữ liệu SQLite ra CSV")
         print("0. Thoát chương trình")
 
         choice = input("Chọn chức năng: ").strip()
@@ -232,6 +428,8 @@ def main():
                 staff_manager,
                 task_manager
             )
+        elif choice == "6" and STORAGE_MODE == "sqlite":
+            export_to_csv(stores)
         elif choice == "0":
             print("Đã thoát chương trình.")
             break
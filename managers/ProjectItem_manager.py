@@ -1,52 +1,225 @@
-import csv
+import copy
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
+from managers.search_index import TextIndex, TrigramIndex
+from managers.snapshot import ItemSnapshot
+from managers.storage import CsvStore
+from managers.unit_of_work import UnitOfWork
 
 
 class ProjectItemManager:
-    def __init__(self, filename, cls, fieldnames, id_field="id"):
+    def __init__(self, filename, cls, fieldnames, id_field="id", store=None):
         self.filename = filename
         self.cls = cls
         self.fieldnames = fieldnames
         self.id_field = id_field
-        self.items = []
+        # Mặc định ghi đè cả file CSV, có thể thay bằng JournalStore
+        self.store = store or CsvStore(filename, fieldnames, id_field)
+        self.items = []       # giữ thứ tự để hiển thị
+        self._by_id = {}      # chỉ mục khóa chính: id -> object
+        # Snapshot đang được giữ (tự mất khi không còn ai dùng)
+        self._snapshots = weakref.WeakSet()
         self.load_from_file()
 
     # ================= FILE =================
     def load_from_file(self):
         self.items = []
-        try:
-            with open(self.filename, "r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    obj = self.cls.from_dict(row)
-                    self.items.append(obj)
-        except FileNotFoundError:
-            pass
+        self._by_id = {}
+        self._shared = False  # items/_by_id đang dùng chung với snapshot
+        # id(obj) -> vị trí trong items (theo object vì mã có thể đổi khi sửa), dựng khi cần
+        self._positions = None
+        self._text_index = TextIndex()
+        self._trigram_index = TrigramIndex()
+        for row in self.store.load():
+            obj = self.cls.from_dict(row)
+            self.items.append(obj)
+            self._index_item(obj)
 
     def save_to_file(self):
-        with open(self.filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-            for obj in self.items:
-                writer.writerow(obj.to_dict())  # <- sửa ở đây
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_full(self)
+            return
+        self.store.save_all(self._all_rows())
+
+    def persist_item(self, obj):
+        """Lưu 1 item vừa thêm/sửa (journal/SQLite: chỉ ghi 1 dòng)"""
+        self.persist_items([obj])
+
+    def persist_items(self, objs):
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_put(self, objs)
+            return
+        if not self.store.incremental:
+            self.save_to_file()
+            return
+        ops = []
+        for obj in objs:
+            row = self._to_row(obj)
+            ops.append(("put", row[self.id_field], row))
+        self.store.apply(ops)
+        self._compact_if_needed()
+
+    def persist_delete(self, obj):
+        """Lưu việc xóa item (gọi sau khi đã bỏ obj khỏi self.items)"""
+        self.persist_deletes([obj])
+
+    def persist_deletes(self, objs):
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_delete(self, objs)
+            return
+        if not self.store.incremental:
+            self.save_to_file()
+            return
+        self.store.apply([("del", self._item_id(obj), None) for obj in objs])
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self.store.should_compact():
+            self.store.compact(self._all_rows())
+
+    # Chuyển đổi object <-> dòng dữ liệu (dùng chung với UnitOfWork)
+    def _row_id(self, obj):
+        return self._item_id(obj)
+
+    def _to_row(self, obj):
+        return obj.to_dict()
+
+    def _all_rows(self):
+        return [obj.to_dict() for obj in self.items]
+
+    # ================= CHỈ MỤC =================
+    def _item_id(self, obj):
+        # Task lưu mã ở thuộc tính id, Project ở project_id
+        if hasattr(obj, self.id_field):
+            return getattr(obj, self.id_field)
+        return obj.id
+
+    def _index_item(self, obj):
+        self._detach()
+        item_id = self._item_id(obj)
+        self._by_id[item_id] = obj
+        self._text_index.add(item_id, self._search_texts(obj))
+        self._trigram_index.add(item_id, self._substring_texts(obj))
+
+    def _unindex_item(self, obj):
+        self._detach()
+        item_id = self._item_id(obj)
+        self._by_id.pop(item_id, None)
+        self._text_index.remove(item_id)
+        self._trigram_index.remove(item_id)
 
+    def _search_texts(self, obj):
+        """Các trường được đưa vào chỉ mục tìm kiếm (mặc định: mọi trường)"""
+        return [str(v) for v in obj.to_dict().values()]
+
+    def _substring_texts(self, obj):
+        """Các trường tìm được theo chuỗi con (mã, tên...)"""
+        return self._search_texts(obj)
+
+    def search_ids(self, keyword):
+        """
+        Tìm theo chỉ mục, không phân biệt dấu/hoa thường -> danh sách object
+        Khớp đầu từ (chỉ mục từ) hoặc chuỗi con (chỉ mục trigram)
+        """
+        ids = self._text_index.search(keyword) | self._trigram_index.search(keyword)
+        # Giữ thứ tự trong danh sách như khi duyệt tuần tự
+        positions = self._position_map()
+        return sorted((self._by_id[i] for i in ids), key=lambda obj: positions[id(obj)])
+
+    def find_by_id(self, item_id):
+        return self._by_id.get(item_id)
+
+    def insert_item(self, obj):
+        """Thêm object vào danh sách và các chỉ mục (chưa lưu file)"""
+        self._detach()
+        self.items.append(obj)
+        if self._positions is not None:
+            self._positions[id(obj)] = len(self.items) - 1
+        self._index_item(obj)
+
+    def remove_item(self, obj):
+        """Bỏ object khỏi danh sách và các chỉ mục (chưa lưu file)"""
+        self._detach()
+        self.items.remove(obj)
+        # Các item phía sau dịch vị trí -> dựng lại khi cần
+        self._positions = None
+        self._unindex_item(obj)
+
+    @contextmanager
+    def editing(self, obj):
+        """
+        Dùng khi sửa object đang được quản lý:
+            with manager.editing(obj) as obj:
+                obj.update_info(...)
+        Gỡ khỏi chỉ mục trước khi sửa, thêm lại sau khi sửa (kể cả khi đổi ID)
+        Đang có snapshot: sửa trên bản sao của obj (snapshot vẫn thấy bản cũ)
+        """
+        self._unindex_item(obj)
+        if self._snapshots:
+            obj = self._replace_with_copy(obj)
+        try:
+            yield obj
+        finally:
+            self._index_item(obj)
+
+    # ================= SNAPSHOT =================
+    def snapshot(self):
+        """Ảnh chụp chỉ đọc tại thời điểm gọi, tạo trong O(1)"""
+        snap = self._make_snapshot()
+        self._snapshots.add(snap)
+        self._shared = True
+        return snap
+
+    def _make_snapshot(self):
+        return ItemSnapshot(self.items, self._by_id)
+
+    def _detach(self):
+        """Gọi trước khi sửa danh sách/chỉ mục: thôi dùng chung với snapshot"""
+        if not self._shared:
+            return
+        self._shared = False
+        if self._snapshots:
+            self._copy_shared()
+
+    def _copy_shared(self):
+        # Chỉ sao chép tham chiếu, không sao chép object
+        self.items = list(self.items)
+        self._by_id = dict(self._by_id)
+
+    def _position_map(self):
+        if self._positions is None:
+            self._positions = {id(o): i for i, o in enumerate(self.items)}
+        return self._positions
+
+    def _replace_with_copy(self, obj):
+        clone = copy.copy(obj)
+        self._detach()
+        i = self._position_map().pop(id(obj))
+        self.items[i] = clone
+        self._positions[id(clone)] = i
+        return clone
 
     # ================= CRUD =================
     # Thêm item
     def add_item(self, obj):
-        if any(getattr(x, self.id_field) == getattr(obj, self.id_field) for x in self.items):
+        if self._item_id(obj) in self._by_id:
             print("ID đã tồn tại")
             return False
-        self.items.append(obj)
-        self.save_to_file()
+        self.insert_item(obj)
+        self.persist_item(obj)
         print("Thêm thành công")
         return True
     # Sửa item
     def update_item(self, item_id):
-        for obj in self.items:
-            if getattr(obj, self.id_field) == item_id:
-                print("Nhập thông tin mới (Enter để giữ nguyên):")
+        obj = self.find_by_id(item_id)
+        if obj:
+            print("Nhập thông tin mới (Enter để giữ nguyên):")
 
+            with self.editing(obj) as obj:
                 for field in self.fieldnames:
                     if field == self.id_field:
                         continue
@@ -64,28 +237,24 @@ class ProjectItemManager:
 
                     setattr(obj, field, new_val)
 
-                self.save_to_file()
-                print("Cập nhật thành công")
-                return True
+            self.persist_item(obj)
+            print("Cập nhật thành công")
+            return True
         print("Không tìm thấy")
         return False
     # Xóa item
     def delete_item(self, item_id):
-        for obj in self.items:
-            if getattr(obj, self.id_field) == item_id:
-                self.items.remove(obj)
-                self.save_to_file()
-                print("Đã xóa")
-                return True
+        obj = self.find_by_id(item_id)
+        if obj:
+            self.remove_item(obj)
+            self.persist_delete(obj)
+            print("Đã xóa")
+            return True
         print("Không tìm thấy")
         return False
     # Tìm kiếm item
     def search_item(self, keyword):
-        keyword = keyword.lower()
-        return [
-            obj for obj in self.items
-            if any(keyword in str(v).lower() for v in obj.to_dict().values())
-        ]
+        return self.search_ids(keyword)
 
     # Hiển thị tất cả item
     def display_all(self):
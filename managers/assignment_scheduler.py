@@ -0,0 +1,122 @@
+import heapq
+from models.staff import CAP_DO_HOP_LE
+from managers.unit_of_work import UnitOfWork
+from reports.workload_report import PRIORITY_WEIGHTS
+
+# Task ưu tiên cao xếp trước
+PRIORITY_ORDER = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+
+CLOSED_STATUSES = ("Completed", "Cancelled")
+
+
+class AssignmentScheduler:
+    """
+    Tự động giao các task chưa có người làm (Unassigned / nhân viên đã bị xóa)
+    - Task xếp theo độ ưu tiên rồi deadline (gần nhất trước)
+    - Nhân viên hợp lệ: không giữ chức danh quản lý,
+      vai trò nằm trong roles (None = mọi vai trò),
+      cấp độ >= min_levels[độ ưu tiên của task] (None = mọi cấp độ)
+    - Mỗi cấp độ có 1 min-heap theo tải hiện tại (tổng trọng số ưu tiên task đang mở)
+      -> mỗi task chỉ xem đỉnh vài heap: O(n log s)
+    """
+
+    def __init__(self, staff_manager, task_manager, roles=None, min_levels=None):
+        self.staff_manager = staff_manager
+        self.task_manager = task_manager
+        self.roles = set(roles) if roles is not None else None
+        # VD: {"Critical": "Senior"} -> task Critical chỉ giao cho Senior
+        self.min_levels = min_levels or {}
+
+    # ================= DỮ LIỆU =================
+    def _is_unassigned(self, task):
+        if task.status_task in CLOSED_STATUSES:
+            return False
+        assignee = (task.assignee_id or "").strip()
+        return assignee in ("", "Unassigned") or not self.staff_manager.find_by_id(assignee)
+
+    def unassigned_tasks(self):
+        # Chỉ đọc các nhóm task theo người phụ trách: Unassigned / để trống / nhân viên đã bị xóa
+        tasks = []
+        for assignee in self.task_manager.assignee_ids():
+            if assignee in ("", "UNASSIGNED") or not self.staff_manager.find_by_id(assignee):
+                tasks.extend(t for t in self.task_manager.tasks_of_assignee(assignee) if self._is_unassigned(t))
+        tasks.sort(key=lambda t: (
+            PRIORITY_ORDER.get(t.priority, len(PRIORITY_ORDER)),
+            t.deadline is None,
+            t.deadline or 0,
+            t.id,
+        ))
+        return tasks
+
+    def _eligible(self, staff):
+        return (
+            not staff.management_title
+            and (self.roles is None or staff.role in self.roles)
+            and staff.level in CAP_DO_HOP_LE
+        )
+
+    def _current_load(self, staff):
+        return sum(
+            PRIORITY_WEIGHTS.get(t.priority, 1)
+            for t in self.task_manager.tasks_of_assignee(staff.staff_id)
+            if t.status_task not in CLOSED_STATUSES
+        )
+
+    def _build_heaps(self):
+        """1 heap (tải, mã NV) cho mỗi cấp độ"""
+        heaps = [[] for _ in CAP_DO_HOP_LE]
+        for s in self.staff_manager.staff_list:
+            if self._eligible(s):
+                heaps[CAP_DO_HOP_LE.index(s.level)].append((self._current_load(s), s.staff_id))
+        for h in heaps:
+            heapq.heapify(h)
+        return heaps
+
+    # ================= LẬP KẾ HOẠCH =================
+    def plan(self):
+        """
+        Trả về (danh sách (task, staff_id), danh sách task không giao được)
+        Chưa thay đổi dữ liệu.
+        """
+        heaps = self._build_heaps()
+        assignments, skipped = [], []
+
+        for task in self.unassigned_tasks():
+            min_level = CAP_DO_HOP_LE.index(self.min_levels.get(task.priority, CAP_DO_HOP_LE[0]))
+
+            # Heap có nhân viên tải thấp nhất trong các cấp độ đủ điều kiện
+            best = None
+            for level in range(min_level, len(heaps)):
+                if heaps[level] and (best is None or heaps[level][0] < heaps[best][0]):
+                    best = level
+            if best is None:
+                skipped.append(task)
+                continue
+
+            load, staff_id = heaps[best][0]
+            heapq.heapreplace(heaps[best], (load + PRIORITY_WEIGHTS.get(task.priority, 1), staff_id))
+            assignments.append((task, staff_id))
+
+        return assignments, skipped
+
+    # ================= ÁP DỤNG =================
+    def apply(self, assignments):
+        """Giao task theo kế hoạch, tasks / staff ghi 1 lần khi commit"""
+        if not assignments:
+            return
+
+        tasks, changed_staff = [], {}
+        with UnitOfWork():
+            for task, staff_id in assignments:
+                with self.task_manager.editing(task) as task:
+                    task.assignee_id = staff_id
+                tasks.append(task)
+
+                staff = self.staff_manager.find_by_id(staff_id)
+                if task.id not in staff.task_list:
+                    staff.task_list.append(task.id)
+                changed_staff[staff_id] = staff
+
+            self.task_manager.persist_items(tasks)
+            for staff in changed_staff.values():
+                self.staff_manager.persist_staff(staff)
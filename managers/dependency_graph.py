@@ -0,0 +1,236 @@
+from collections import deque
+from datetime import timedelta
+from managers.storage import CsvStore
+from managers.unit_of_work import UnitOfWork
+
+# Mỗi dòng: 1 task và các task nó phụ thuộc (cách nhau ";")
+DEPENDENCY_FIELDS = ["task_id", "predecessor_ids"]
+
+
+class DependencyGraph:
+    """
+    Quan hệ phụ thuộc giữa các task (DAG), lưu ở task_dependencies.csv
+    - Task chỉ bắt đầu được sau khi mọi task phụ thuộc (predecessor) xong
+    - Thêm cạnh tạo chu trình -> bị từ chối
+    - Lịch sớm nhất (earliest start/finish) tính 1 lần khi load,
+      sau đó chỉ tính lại phần phía sau (downstream) của task vừa đổi
+    """
+
+    def __init__(self, filename, task_manager, store=None):
+        self.filename = filename
+        self.task_manager = task_manager
+        self.store = store or CsvStore(filename, DEPENDENCY_FIELDS, "task_id")
+        self.preds = {}    # task_id -> set(predecessor_id)
+        self.succs = {}    # task_id -> set(successor_id)
+        self.early = {}    # task_id -> (earliest start, earliest finish)
+        self._driver = {}  # task_id -> predecessor quyết định earliest start
+        self.load_from_file()
+
+    # ================= FILE =================
+    def load_from_file(self):
+        self.preds, self.succs = {}, {}
+        for row in self.store.load():
+            tid = row["task_id"]
+            if not self.task_manager.find_by_id(tid):
+                continue
+            for pid in filter(None, row["predecessor_ids"].split(";")):
+                # Bỏ cạnh trỏ tới task không còn tồn tại
+                if self.task_manager.find_by_id(pid):
+                    self._link(tid, pid)
+        self._recompute_all()
+
+    def persist(self, task_ids):
+        """Lưu dòng phụ thuộc của các task vừa đổi (task không còn phụ thuộc -> xóa dòng)"""
+        with UnitOfWork() as uow:
+            uow.mark_put(self, [tid for tid in task_ids if tid in self.preds])
+            uow.mark_delete(self, [tid for tid in task_ids if tid not in self.preds])
+
+    def _row_id(self, task_id):
+        return task_id
+
+    def _to_row(self, task_id):
+        return {"task_id": task_id, "predecessor_ids": ";".join(sorted(self.preds.get(task_id, ())))}
+
+    def _all_rows(self):
+        return [self._to_row(tid) for tid in self.preds]
+
+    # ================= CẠNH =================
+    def _link(self, task_id, pred_id):
+        self.preds.setdefault(task_id, set()).add(pred_id)
+        self.succs.setdefault(pred_id, set()).add(task_id)
+
+    def _unlink(self, task_id, pred_id):
+        for index, key, value in ((self.preds, task_id, pred_id), (self.succs, pred_id, task_id)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del index[key]
+
+    def predecessors(self, task_id):
+        return sorted(self.preds.get(task_id, ()))
+
+    def _reaches(self, start_id, target_id):
+        """Đi theo cạnh successor từ start_id có tới được target_id không"""
+        seen, stack = {start_id}, [start_id]
+        while stack:
+            node = stack.pop()
+            if node == target_id:
+                return True
+            for nxt in self.succs.get(node, ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+
+    def add_dependency(self, task_id, pred_id):
+        """Thêm cạnh pred_id -> task_id, ValueError nếu không hợp lệ hoặc tạo chu trình"""
+        task = self.task_manager.find_by_id(task_id)
+        pred = self.task_manager.find_by_id(pred_id)
+        if not task or not pred:
+            raise ValueError("Task không tồn tại")
+        if task_id == pred_id:
+            raise ValueError("Task không thể phụ thuộc chính nó")
+        if task.project_id != pred.project_id:
+            raise ValueError("Chỉ được phụ thuộc task cùng dự án")
+        if pred_id in self.preds.get(task_id, ()):
+            raise ValueError("Phụ thuộc đã tồn tại")
+        # pred -> task tạo chu trình nếu từ task đã đi tới được pred
+        if self._reaches(task_id, pred_id):
+            raise ValueError("Phụ thuộc tạo vòng lặp")
+
+        self._link(task_id, pred_id)
+        self._recompute_from(task_id)
+        self.persist([task_id])
+
+    def remove_dependency(self, task_id, pred_id):
+        if pred_id not in self.preds.get(task_id, ()):
+            return False
+        self._unlink(task_id, pred_id)
+        self._recompute_from(task_id)
+        self.persist([task_id])
+        return True
+
+    def remove_task(self, task_id):
+        """Gọi khi xóa task: bỏ mọi cạnh liên quan"""
+        successors = list(self.succs.get(task_id, ()))
+        if not successors and task_id not in self.preds:
+            self.early.pop(task_id, None)
+            return
+        for pid in list(self.preds.get(task_id, ())):
+            self._unlink(task_id, pid)
+        for sid in successors:
+            self._unlink(sid, task_id)
+        self.early.pop(task_id, None)
+        self._driver.pop(task_id, None)
+        for sid in successors:
+            self._recompute_from(sid)
+        self.persist([task_id] + successors)
+
+    # ================= LỊCH SỚM NHẤT =================
+    def _compute(self, task_id):
+        """(ES, EF, predecessor quyết định ES) của 1 task từ EF các predecessor"""
+        task = self.task_manager.find_by_id(task_id)
+        if task is None:
+            return None, None, None
+        start = task.start_date or task.deadline
+        duration = timedelta(0)
+        if task.start_date and task.deadline and task.deadline >= task.start_date:
+            duration = task.deadline - task.start_date
+
+        es, driver = start, None
+        for pid in self.preds.get(task_id, ()):
+            pred_ef = self.early.get(pid, (None, None))[1]
+            if pred_ef is None:
+                continue
+            # Bắt đầu ngày hôm sau khi predecessor xong
+            candidate = pred_ef + timedelta(days=1)
+            if es is None or candidate > es:
+                es, driver = candidate, pid
+        ef = es + duration if es is not None else None
+        return es, ef, driver
+
+    def _update(self, task_id):
+        """Tính lại 1 task, trả về True nếu earliest finish thay đổi"""
+        es, ef, driver = self._compute(task_id)
+        old = self.early.get(task_id)
+        self.early[task_id] = (es, ef)
+        self._driver[task_id] = driver
+        return old is None or old[1] != ef
+
+    def _recompute_all(self):
+        """Sắp xếp topo toàn bộ (chỉ dùng khi load)"""
+        self.early, self._driver = {}, {}
+        indegree = {t.id: len(self.preds.get(t.id, ())) for t in self.task_manager.items}
+        queue = deque(tid for tid, d in indegree.items() if d == 0)
+        while queue:
+            tid = queue.popleft()
+            self._update(tid)
+            for sid in self.succs.get(tid, ()):
+                indegree[sid] -= 1
+                if indegree[sid] == 0:
+                    queue.append(sid)
+
+    def _recompute_from(self, task_id):
+        """
+        Tính lại task_id và các task phía sau theo thứ tự topo của riêng phần đó.
+        Task nào có EF không đổi thì không lan tiếp sang successor của nó.
+        """
+        # 1. Tập downstream
+        downstream, stack = {task_id}, [task_id]
+        while stack:
+            for sid in self.succs.get(stack.pop(), ()):
+                if sid not in downstream:
+                    downstream.add(sid)
+                    stack.append(sid)
+
+        # 2. Kahn trong phạm vi downstream
+        indegree = {
+            tid: len([p for p in self.preds.get(tid, ()) if p in downstream])
+            for tid in downstream
+        }
+        queue = deque(tid for tid, d in indegree.items() if d == 0)
+        dirty = {task_id}
+        while queue:
+            tid = queue.popleft()
+            if tid in dirty and self._update(tid):
+                dirty.update(self.succs.get(tid, ()))
+            for sid in self.succs.get(tid, ()):
+                indegree[sid] -= 1
+                if indegree[sid] == 0:
+                    queue.append(sid)
+
+    def task_changed(self, task_id):
+        """Gọi sau khi sửa ngày của task, bỏ cạnh tới các task không còn tồn tại"""
+        if not self.task_manager.find_by_id(task_id):
+            self.remove_task(task_id)
+            return
+        missing = [pid for pid in self.preds.get(task_id, ()) if not self.task_manager.find_by_id(pid)]
+        for pid in missing:
+            self._unlink(task_id, pid)
+            self.early.pop(pid, None)
+            self._driver.pop(pid, None)
+        self._recompute_from(task_id)
+        if missing:
+            self.persist([task_id])
+
+    # ================= ĐƯỜNG GĂNG =================
+    def critical_path(self, project_id):
+        """
+        Chuỗi task quyết định ngày kết thúc sớm nhất của dự án:
+        bắt đầu từ task có EF lớn nhất, lần ngược theo predecessor quyết định ES
+        """
+        tasks = [
+            t for t in self.task_manager.tasks_of_project(project_id)
+            if self.early.get(t.id, (None, None))[1] is not None
+        ]
+        if not tasks:
+            return []
+        last = max(tasks, key=lambda t: (self.early[t.id][1], t.id))
+
+        path, tid = [], last.id
+        while tid is not None:
+            path.append(tid)
+            tid = self._driver.get(tid)
+        path.reverse()
+        return path
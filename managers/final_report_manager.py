@@ -1,11 +1,13 @@
-import csv
 import re 
 from datetime import datetime
+from reports.base_report import BaseReport
 from reports.final_report import FinalReport
 
 class FinalReportManager:
-    def __init__(self, filename="final_reports.csv"):
+    def __init__(self, filename="final_reports.csv", store=None):
         self.filename = filename
+        # store = None: đọc/ghi trực tiếp file CSV
+        self.store = store
 
     # CREATE FINAL REPORT
     def create_report(self, project_manager, staff_manager, task_manager):
@@ -28,7 +30,7 @@ class FinalReportManager:
             
             # Kiểm tra xem đã có báo cáo chưa (Tránh tạo trùng)
             expected_id = f"FR{project.project_id}"
-            if any(r['report_id'] == expected_id for r in self._load_all()):
+            if self._find_report(expected_id):
                 print(f"Lỗi: Báo cáo tổng kết cho dự án {pid} đã tồn tại.")
                 return
 
@@ -83,7 +85,7 @@ class FinalReportManager:
 
             confirm = input("\nXác nhận lưu báo cáo? (y/n): ").lower()
             if confirm == "y":
-                report.save()
+                self._save_report(report)
                 print("Đã lưu báo cáo tổng kết thành công.")
             else:
                 print("Đã hủy lưu báo cáo.")
@@ -100,7 +102,7 @@ class FinalReportManager:
             if not re.match(r"^FRP\d{2}_\d{5}$", rid):
                 print("Lỗi định dạng! Mã báo cáo phải có dạng: FR{Mã_Dự_Án}. Ví dụ đúng: FRP25_00001")
                 continue
-            data = next((r for r in self._load_all() if r["report_id"] == rid), None)
+            data = self._find_report(rid)
 
             if not data:
                 print("Không tìm thấy báo cáo.")
@@ -165,8 +167,7 @@ class FinalReportManager:
         print("\n--- XÓA BÁO CÁO ---")
         rid = input("Nhập mã báo cáo cần xóa: ").strip()
         
-        data = self._load_all()
-        target = next((r for r in data if r["report_id"] == rid), None)
+        target = self._find_report(rid)
 
         if not target:
             print("Không tìm thấy báo cáo.")
@@ -175,30 +176,42 @@ class FinalReportManager:
         confirm = input(f"CẢNH BÁO: Xóa báo cáo {rid}? (y/n): ").lower()
         if confirm != "y":
             return
-        remaining_data = [r for r in data if r["report_id"] != rid]
-        valid_fields = set(FinalReport.csv_fields())
-        cleaned_data = []
-        
-        for row in remaining_data:
-            clean_row = {k: v for k, v in row.items() if k in valid_fields}
-            cleaned_data.append(clean_row)
 
-        try:
-            with open(self.filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=FinalReport.csv_fields())
-                writer.writeheader()
-                writer.writerows(cleaned_data) # Ghi dữ liệu đã làm sạch
+        if self.store:
+            self.store.delete(rid)
             print("Đã xóa báo cáo thành công.")
-        except Exception as e:
-            print(f"Lỗi khi ghi file: {e}")
+            return
+
+        if BaseReport.delete_item(self.filename, rid):
+            print("Đã xóa báo cáo thành công.")
+        else:
+            print("Không thể xóa báo cáo.")
+
+    # COMPACT
+    def compact_file(self):
+        """Ghi lại file báo cáo, bỏ các dòng đã bị sửa/xóa"""
+        if self.store:
+            print("Dữ liệu lưu trong SQLite, không cần nén.")
+            return
+        n = BaseReport.compact(self.filename, FinalReport.csv_fields())
+        print(f"Đã nén file báo cáo ({n} báo cáo).")
 
     # INTERNAL
     def _load_all(self):
-        try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                return list(csv.DictReader(f))
-        except FileNotFoundError:
-            return []
+        if self.store:
+            return self.store.load()
+        return BaseReport.load_from_csv(self.filename)
+
+    def _find_report(self, rid):
+        if self.store:
+            return next(iter(self.store.find(report_id=rid)), None)
+        return next((r for r in self._load_all() if r["report_id"] == rid), None)
+
+    def _save_report(self, report):
+        if self.store:
+            self.store.put(report.report_id, report.as_dict())
+        else:
+            report.save()
 
     def _display_table(self, data):
         print("-" * 90)
@@ -0,0 +1,100 @@
+def overlaps_period(task, period_start, period_end):
+    """
+    Task có thuộc kỳ [period_start, period_end] không:
+    - bắt đầu trong kỳ, hoặc
+    - deadline trong kỳ, hoặc
+    - bắt đầu trước kỳ và deadline sau kỳ
+    """
+    return bool(
+        (task.start_date and period_start <= task.start_date <= period_end)
+        or
+        (task.deadline and period_start <= task.deadline <= period_end)
+        or
+        (
+            task.start_date and task.deadline
+            and task.start_date < period_start
+            and task.deadline > period_end
+        )
+    )
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+
+class IntervalIndex:
+    """
+    Cây khoảng (centered interval tree) trên [start_date, deadline] của task.
+    query(lo, hi) trả về các task giao với [lo, hi] trong O(log n + k).
+
+    Task thiếu ngày hoặc có deadline < start_date không đưa vào cây,
+    được kiểm tra riêng bằng overlaps_period().
+    """
+
+    def __init__(self, tasks):
+        regular = []
+        self._irregular = []
+        for t in tasks:
+            if t.start_date and t.deadline and t.start_date <= t.deadline:
+                regular.append(t)
+            else:
+                self._irregular.append(t)
+        self._size = len(regular)
+        self._root = self._build(regular)
+
+    def __len__(self):
+        return self._size + len(self._irregular)
+
+    def _build(self, tasks):
+        if not tasks:
+            return None
+
+        # Tâm = trung vị của các đầu mút -> cây cân bằng
+        points = sorted([t.start_date for t in tasks] + [t.deadline for t in tasks])
+        center = points[len(points) // 2]
+
+        left, right, here = [], [], []
+        for t in tasks:
+            if t.deadline < center:
+                left.append(t)
+            elif t.start_date > center:
+                right.append(t)
+            else:
+                here.append(t)
+
+        node = _Node()
+        node.center = center
+        node.by_start = sorted(here, key=lambda t: t.start_date)
+        node.by_end = sorted(here, key=lambda t: t.deadline, reverse=True)
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
+
+    def query(self, lo, hi):
+        result = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if hi < node.center:
+                # Mọi khoảng ở node đều chứa center > hi -> chỉ cần start <= hi
+                for t in node.by_start:
+                    if t.start_date > hi:
+                        break
+                    result.append(t)
+                stack.append(node.left)
+            elif lo > node.center:
+                # Mọi khoảng ở node đều chứa center < lo -> chỉ cần deadline >= lo
+                for t in node.by_end:
+                    if t.deadline < lo:
+                        break
+                    result.append(t)
+                stack.append(node.right)
+            else:
+                result.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+
+        result.extend(t for t in self._irregular if overlaps_period(t, lo, hi))
+        return result
@@ -1,6 +1,6 @@
 from managers.ProjectItem_manager import ProjectItemManager
 from models.project import Project
-import csv
+from managers.unit_of_work import UnitOfWork
 import re
 
 class ProjectManager(ProjectItemManager):
@@ -8,31 +8,17 @@ class ProjectManager(ProjectItemManager):
     Quản lý nghiệp vụ Project – đồng bộ Project / Task / Staff
     """
 
-    def __init__(self, filename, staff_manager, task_manager):
+    def __init__(self, filename, staff_manager, task_manager, store=None):
         super().__init__(
             filename=filename,
             cls=Project,
             fieldnames=Project.csv_fields(),
-            id_field="project_id"
+            id_field="project_id",
+            store=store
         )
         self.staff_manager = staff_manager
         self.task_manager = task_manager
 
-    # ================= FILE =================
-    def save_to_file(self):
-        with open(self.filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-            for obj in self.items:
-                writer.writerow(obj.to_dict())
-
-    # ================= BASIC FIND =================
-    def find_by_id(self, project_id):
-        return next(
-            (p for p in self.items if p.project_id == project_id),
-            None
-        )
-
     # ================= HÀM NHẬP MÃ DỰ ÁN HỢP LỆ =================
     def _input_valid_project_id(self):
         while True:
@@ -45,10 +31,7 @@ class ProjectManager(ProjectItemManager):
             if not re.fullmatch(r"P\d{2}_\d{5}", pid):
                 print("Sai định dạng mã dự án (VD: P25_00001)")
                 continue
-            project = next(
-                (p for p in self.items if p.project_id == pid),
-                None
-            )
+            project = self.find_by_id(pid)
             if not project:
                 print("Mã dự án không tồn tại trong hệ thống.")
                 continue
@@ -62,8 +45,9 @@ class ProjectManager(ProjectItemManager):
         """
         project = self.find_by_id(project_id)
         if project:
-            project.auto_update_status(task_manager)
-            self.save_to_file()
+            with self.editing(project) as project:
+                project.auto_update_status(task_manager)
+            self.persist_item(project)
 
     # ================= CRUD =================
     def add_project(self):
@@ -72,7 +56,7 @@ class ProjectManager(ProjectItemManager):
 
         # 1. Nhập thông tin cơ bản dự án 
         project.input_info(
-            existing_project_ids=[p.project_id for p in self.items]
+            existing_project_ids=self._by_id.keys()
         )
 
         # 2. Nhập PM của dự án
@@ -97,8 +81,8 @@ class ProjectManager(ProjectItemManager):
             break
 
         # 3. Thêm dự án vào danh sách và lưu file
-        self.items.append(project)
-        self.save_to_file()
+        self.insert_item(project)
+        self.persist_item(project)
         print(f"Thêm dự án '{project.project_name}' thành công với PM: {project.pm_id}")
 
     def update_project(self):
@@ -116,24 +100,25 @@ class ProjectManager(ProjectItemManager):
         # Lưu ý: Hàm update_info() nằm trong ProjectItem hoặc Project.
         # Nếu Project không override lại thì nó sẽ dùng của cha.
         # Logic nhập tay status_project KHÔNG được phép có ở đây.
-        project.update_info()
-
-        # Cập nhật PM 
-        while True:
-            pm_id = input(f"Mã PM hiện tại [{getattr(project,'pm_id','')}], nhập mới hoặc Enter để giữ: ").strip()
-            if not pm_id:
+        with self.editing(project) as project:
+            project.update_info()
+
+            # Cập nhật PM 
+            while True:
+                pm_id = input(f"Mã PM hiện tại [{getattr(project,'pm_id','')}], nhập mới hoặc Enter để giữ: ").strip()
+                if not pm_id:
+                    break
+                pm = self.staff_manager.find_by_id(pm_id)
+                if not pm:
+                    print("Nhân viên không tồn tại.")
+                    continue
+                if getattr(pm, "management_title", "") != "Project Manager":
+                    print("Người này không phải Project Manager.")
+                    continue
+                project.pm_id = pm_id
                 break
-            pm = self.staff_manager.find_by_id(pm_id)
-            if not pm:
-                print("Nhân viên không tồn tại.")
-                continue
-            if getattr(pm, "management_title", "") != "Project Manager":
-                print("Người này không phải Project Manager.")
-                continue
-            project.pm_id = pm_id
-            break
 
-        self.save_to_file()
+        self.persist_item(project)
         print("Cập nhật dự án thành công")
 
     def delete_project(self):
@@ -153,38 +138,49 @@ class ProjectManager(ProjectItemManager):
             print("Đã hủy thao tác")
             return
 
-        # XÓA TẤT CẢ TASK THUỘC PROJECT 
-        tasks_to_delete = [
-            t for t in self.task_manager.items
-            if t.project_id == project.project_id
-        ]
+        # Mỗi file (projects / tasks / staff) chỉ ghi 1 lần khi commit
+        with UnitOfWork():
+            # XÓA TẤT CẢ TASK THUỘC PROJECT 
+            tasks_to_delete = self.task_manager.tasks_of_project(project.project_id)
 
-        for task in tasks_to_delete:
-            # gỡ task khỏi tất cả nhân viên
-            self.staff_manager.remove_task_from_all_staff(task.id)
+            # gỡ task khỏi task_list của người phụ trách (tra chỉ mục, không duyệt mọi nhân viên)
+            removed = {}
+            for task in tasks_to_delete:
+                staff = self.staff_manager.find_by_id(task.assignee_id)
+                if staff:
+                    removed.setdefault(staff.staff_id, (staff, set()))[1].add(task.id)
+
+                # xóa task khỏi task manager
+                self.task_manager.remove_item(task)
 
-            # xóa task khỏi task manager
-            self.task_manager.items.remove(task)
+            for staff, task_ids in removed.values():
+                staff.task_list = [tid for tid in staff.task_list if tid not in task_ids]
+                self.staff_manager.persist_staff(staff)
 
-        # XÓA PROJECT 
-        self.items.remove(project)
+            # XÓA PROJECT 
+            self.remove_item(project)
 
-        # LƯU FILE
-        self.save_to_file()
-        self.task_manager.save_to_file()
-        self.staff_manager.save_to_file()
+            # LƯU FILE
+            self.persist_delete(project)
+            self.task_manager.persist_deletes(tasks_to_delete)
 
         print(f"Đã xóa dự án {project.project_name} và toàn bộ task liên quan.")
 
 
     # ================= SEARCH & DISPLAY =================
+    def _search_texts(self, project):
+        return [project.project_id, project.project_name, project.customer, project.description]
+
+    def _substring_texts(self, project):
+        return [project.project_id, project.customer, project.description]
+
     def search_project(self):
-        keyword = input("Nhập mã hoặc khách hàng: ").strip().lower()
+        keyword = input("Nhập mã hoặc khách hàng: ").strip()
         if not keyword:
             print("Không được để trống")
             return
 
-        result = [p for p in self.items if keyword in p.project_id.lower() or keyword in p.customer.lower()]
+        result = self.search_ids(keyword)
         if not result:
             print("Không tìm thấy dự án")
             return
@@ -208,7 +204,7 @@ class ProjectManager(ProjectItemManager):
         if not self.task_manager:
             print("Chưa kết nối với Task Manager.")
             return
-        tasks_of_project = [t for t in self.task_manager.items if t.project_id == project_id]
+        tasks_of_project = self.task_manager.tasks_of_project(project_id)
         if not tasks_of_project:
             print("Dự án này chưa có công việc nào.")
             return
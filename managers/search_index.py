@@ -0,0 +1,136 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+
+def normalize(text):
+    """
+    Chuẩn hóa để tìm kiếm không phân biệt dấu/hoa thường:
+    "Phương" -> "phuong", "Đặng" -> "dang"
+    """
+    text = unicodedata.normalize("NFD", str(text))
+    text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+    return text.replace("đ", "d").replace("Đ", "D").casefold()
+
+
+def tokenize(text):
+    # Mã "TP25_00001_00002" -> ["tp25", "00001", "00002"]
+    return re.findall(r"[0-9a-z]+", normalize(text))
+
+
+class TextIndex:
+    """
+    Chỉ mục ngược theo từ: token -> tập id.
+    - add(doc_id, texts) / remove(doc_id) khi thêm/sửa/xóa object
+    - search(keyword): mỗi từ của keyword khớp đầu 1 token ("phu" -> "phuong"),
+      kết quả là các id chứa đủ mọi từ
+    """
+
+    def __init__(self):
+        self._postings = {}    # token -> set(id)
+        self._doc_tokens = {}  # id -> set(token), để gỡ khi sửa/xóa
+        self._vocab = []       # các token đã sắp xếp, dùng để tìm theo tiền tố
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def add(self, doc_id, texts):
+        self.remove(doc_id)
+        tokens = set()
+        for text in texts:
+            if text:
+                tokens.update(tokenize(text))
+        self._doc_tokens[doc_id] = tokens
+        for tok in tokens:
+            ids = self._postings.get(tok)
+            if ids is None:
+                ids = self._postings[tok] = set()
+                insort(self._vocab, tok)
+            ids.add(doc_id)
+
+    def remove(self, doc_id):
+        for tok in self._doc_tokens.pop(doc_id, ()):
+            ids = self._postings[tok]
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[tok]
+                del self._vocab[bisect_left(self._vocab, tok)]
+
+    def _prefix_ids(self, prefix):
+        result = set()
+        i = bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            result |= self._postings[self._vocab[i]]
+            i += 1
+        return result
+
+    def search(self, keyword):
+        tokens = tokenize(keyword)
+        if not tokens:
+            return set()
+        # Từ dài thường ít kết quả hơn -> giao trước cho nhanh
+        tokens.sort(key=len, reverse=True)
+        result = self._prefix_ids(tokens[0])
+        for tok in tokens[1:]:
+            if not result:
+                break
+            result &= self._prefix_ids(tok)
+        return result
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Chỉ mục trigram để tìm chuỗi con ("00004", "ang" trong "hàng"):
+    - Lấy các id chứa đủ mọi trigram của keyword làm ứng viên
+    - Kiểm tra lại "keyword in text" trên ứng viên
+    Keyword ngắn hơn 3 ký tự thì duyệt các chuỗi đã chuẩn hóa sẵn
+    """
+
+    def __init__(self):
+        self._postings = {}  # trigram -> set(id)
+        self._docs = {}      # id -> [chuỗi đã chuẩn hóa]
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, texts):
+        self.remove(doc_id)
+        texts = [normalize(t) for t in texts if t]
+        self._docs[doc_id] = texts
+        for gram in set().union(*map(trigrams, texts)):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        texts = self._docs.pop(doc_id, None)
+        if texts is None:
+            return
+        for gram in set().union(*map(trigrams, texts)):
+            ids = self._postings[gram]
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[gram]
+
+    def search(self, keyword):
+        keyword = normalize(keyword).strip()
+        if not keyword:
+            return set()
+
+        grams = trigrams(keyword)
+        if grams:
+            postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= ids
+        else:
+            candidates = self._docs.keys()
+
+        return {
+            doc_id for doc_id in candidates
+            if any(keyword in text for text in self._docs[doc_id])
+        }
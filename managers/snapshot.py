@@ -0,0 +1,88 @@
+from collections import Counter
+from datetime import datetime
+from managers.interval_index import IntervalIndex
+
+
+class ItemSnapshot:
+    """
+    Ảnh chụp chỉ đọc các item của manager, dùng chung list/dict cho tới khi manager ghi lần đầu
+    Không được sửa các item lấy từ snapshot.
+    """
+
+    def __init__(self, items, by_id):
+        self.items = items
+        self._by_id = by_id
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def find_by_id(self, item_id):
+        return self._by_id.get(item_id)
+
+    def snapshot(self):
+        # Snapshot vốn bất biến
+        return self
+
+
+class TaskSnapshot(ItemSnapshot):
+    """Snapshot của TaskManager với các hàm đọc mà báo cáo dùng (tasks_of_project, tasks_overlapping...)"""
+
+    def __init__(self, items, by_id, by_project, intervals, all_intervals, analytics,
+                 owner=None, version=None):
+        super().__init__(items, by_id)
+        self._by_project = by_project
+        self._intervals = intervals
+        self._all_intervals = all_intervals
+        self._analytics = analytics
+        # Cache dựng trên snapshot được trả lại cho manager nếu manager chưa đổi từ lúc chụp
+        self._owner = owner
+        self._version = version
+
+    @property
+    def task_list(self):
+        return self.items
+
+    def tasks_of_project(self, project_id):
+        return list(self._by_project.get(project_id, {}).values())
+
+    def count_of_project(self, project_id):
+        return len(self._by_project.get(project_id, ()))
+
+    def status_counts(self, project_id):
+        return dict(Counter(t.status_task for t in self._by_project.get(project_id, {}).values()))
+
+    def overdue_count(self, project_id, now=None):
+        now = now or datetime.now()
+        return sum(
+            1 for t in self._by_project.get(project_id, {}).values()
+            if t.deadline and t.deadline < now
+            and t.status_task not in ("Completed", "Cancelled")
+        )
+
+    def analytics(self, build=True):
+        if self._analytics is None and build:
+            try:
+                from reports.analytics import TaskAnalytics
+            except ImportError:
+                return None
+            self._analytics = TaskAnalytics(self.items)
+            if self._owner is not None:
+                self._owner._adopt_cache(self._version, analytics=self._analytics)
+        return self._analytics
+
+    def tasks_overlapping(self, period_start, period_end, project_id=None):
+        if project_id is None:
+            if self._all_intervals is None:
+                self._all_intervals = IntervalIndex(self.items)
+                if self._owner is not None:
+                    self._owner._adopt_cache(self._version, all_intervals=self._all_intervals)
+            return self._all_intervals.query(period_start, period_end)
+
+        index = self._intervals.get(project_id)
+        if index is None:
+            index = IntervalIndex(self.tasks_of_project(project_id))
+            self._intervals[project_id] = index
+        return index.query(period_start, period_end)
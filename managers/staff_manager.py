@@ -1,7 +1,9 @@
 #file staff_manager.py
-import csv
 import re
 from models.staff import Staff
+from managers.search_index import TextIndex, TrigramIndex
+from managers.storage import CsvStore
+from managers.unit_of_work import UnitOfWork
 
 CAP_DO_HOP_LE = ["Intern", "Junior", "Senior"]
 
@@ -14,6 +16,16 @@ VAI_TRO_HOP_LE = [
 
 CHUC_DANH_QUAN_LY = ["Team Leader", "Project Manager"]
 
+STAFF_CSV_FIELDS = [
+    "staff_id",
+    "full_name",
+    "age",
+    "level",
+    "role",
+    "management_title",
+    "task_list",
+]
+
 
 class StaffManager:
     """
@@ -22,9 +34,11 @@ class StaffManager:
     - Không lưu project_list (suy ra từ task)
     """
 
-    def __init__(self, filename="staffs.csv"):
+    def __init__(self, filename="staffs.csv", store=None):
         self.filename = filename
-        self.staff_list = []
+        self.store = store or CsvStore(filename, STAFF_CSV_FIELDS, "staff_id")
+        self.staff_list = []   # giữ thứ tự để hiển thị
+        self._by_id = {}       # chỉ mục khóa chính: staff_id -> Staff
         self.load_from_file()
         self.task_manager = None
     def set_task_manager(self, task_manager):
@@ -32,57 +46,86 @@ class StaffManager:
     # FILE
     def load_from_file(self):
         self.staff_list = []
-
-        try:
-            with open(self.filename, "r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    staff = Staff(
-                        staff_id=row["staff_id"],
-                        full_name=row["full_name"],
-                        age=int(row["age"]),
-                        level=row["level"],
-                        role=row["role"],
-                        management_title=row["management_title"] or None,
-                        task_list=row["task_list"].split(";") if row["task_list"] else []
-                    )
-                    self.staff_list.append(staff)
-        except FileNotFoundError:
-            pass
+        self._by_id = {}
+        self._text_index = TextIndex()
+        self._trigram_index = TrigramIndex()
+
+        for row in self.store.load():
+            staff = Staff(
+                staff_id=row["staff_id"],
+                full_name=row["full_name"],
+                age=int(row["age"]),
+                level=row["level"],
+                role=row["role"],
+                management_title=row["management_title"] or None,
+                task_list=row["task_list"].split(";") if row["task_list"] else []
+            )
+            self.staff_list.append(staff)
+            self._index_staff(staff)
+
+    # Chỉ mục: staff_id -> Staff, và chỉ mục tìm kiếm theo mã/họ tên
+    def _index_staff(self, staff):
+        self._by_id[staff.staff_id] = staff
+        self._text_index.add(staff.staff_id, [staff.staff_id, staff.full_name])
+        self._trigram_index.add(staff.staff_id, [staff.staff_id, staff.full_name])
+
+    def _unindex_staff(self, staff):
+        self._by_id.pop(staff.staff_id, None)
+        self._text_index.remove(staff.staff_id)
+        self._trigram_index.remove(staff.staff_id)
+
+    def _to_row(self, s):
+        return {
+            "staff_id": s.staff_id,
+            "full_name": s.full_name,
+            "age": s.age,
+            "level": s.level,
+            "role": s.role,
+            "management_title": s.management_title or "",
+            "task_list": ";".join(s.task_list),
+        }
+
+    def _row_id(self, s):
+        return s.staff_id
+
+    def _all_rows(self):
+        return [self._to_row(s) for s in self.staff_list]
 
     def save_to_file(self):
-        with open(self.filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "staff_id",
-                    "full_name",
-                    "age",
-                    "level",
-                    "role",
-                    "management_title",
-                    "task_list",
-                ]
-            )
-            writer.writeheader()
-
-            for s in self.staff_list:
-                writer.writerow({
-                    "staff_id": s.staff_id,
-                    "full_name": s.full_name,
-                    "age": s.age,
-                    "level": s.level,
-                    "role": s.role,
-                    "management_title": s.management_title or "",
-                    "task_list": ";".join(s.task_list),
-                })
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_full(self)
+            return
+        self.store.save_all(self._all_rows())
+
+    def persist_staff(self, staff):
+        """Lưu 1 nhân viên vừa thêm/sửa (SQLite/journal: không ghi lại cả file)"""
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_put(self, [staff])
+            return
+        if not self.store.incremental:
+            self.save_to_file()
+            return
+        self.store.put(staff.staff_id, self._to_row(staff))
+
+    def persist_delete(self, staff):
+        uow = UnitOfWork.current()
+        if uow:
+            uow.mark_delete(self, [staff])
+            return
+        if not self.store.incremental:
+            self.save_to_file()
+            return
+        self.store.delete(staff.staff_id)
 
     # CRUD
     def add_staff(self):
         staff = Staff()
         staff.input_info(self.staff_list)
         self.staff_list.append(staff)
-        self.save_to_file()
+        self._index_staff(staff)
+        self.persist_staff(staff)
         print("Thêm nhân viên thành công")
 
     def update_staff(self):
@@ -102,7 +145,8 @@ class StaffManager:
 
                 # 3. Hợp lệ → cập nhật
                 staff.update_info()
-                self.save_to_file()
+                self._index_staff(staff)
+                self.persist_staff(staff)
                 print("Cập nhật nhân viên thành công")
                 return True
     def delete_staff(self):
@@ -115,7 +159,7 @@ class StaffManager:
                 continue
 
             # 2. Kiểm tra tồn tại
-            staff = next((s for s in self.staff_list if s.staff_id == staff_id), None)
+            staff = self.find_by_id(staff_id)
             if not staff:
                 print("Nhân viên không tồn tại, vui lòng nhập lại")
                 continue
@@ -130,17 +174,19 @@ class StaffManager:
             print("Đã hủy thao tác xóa.")
             return
 
-        # 4. Gỡ nhân viên khỏi các task (chuyển sang Unassigned)
-        if self.task_manager:
-            self.task_manager.unassign_staff(staff_id)
-        else:
-            print("Cảnh báo: Chưa kết nối TaskManager.")
+        with UnitOfWork():
+            # 4. Gỡ nhân viên khỏi các task (chuyển sang Unassigned)
+            if self.task_manager:
+                self.task_manager.unassign_staff(staff_id)
+            else:
+                print("Cảnh báo: Chưa kết nối TaskManager.")
 
-        # 5. Xóa nhân viên khỏi danh sách
-        self.staff_list.remove(staff)
+            # 5. Xóa nhân viên khỏi danh sách
+            self.staff_list.remove(staff)
+            self._unindex_staff(staff)
 
-        # 6. Lưu file
-        self.save_to_file()
+            # 6. Lưu file
+            self.persist_delete(staff)
         print(f"Đã xóa nhân viên {staff_id} thành công.")
 
     # DISPLAY
@@ -180,10 +226,8 @@ class StaffManager:
                         print("Mã nhân viên sai định dạng (VD: NV_00001)")
                         continue
 
-                    result = [
-                        s for s in self.staff_list
-                        if s.staff_id.upper() == keyword
-                    ]
+                    staff = self.find_by_id(keyword)
+                    result = [staff] if staff else []
                     break
 
             # ================= THEO HỌ TÊN =================
@@ -195,10 +239,13 @@ class StaffManager:
                         print("Họ tên không hợp lệ (không chứa số hoặc ký tự đặc biệt)")
                         continue
 
-                    keyword_lower = keyword.lower()
+                    # "Phuong" tìm được "Phương"
                     result = [
-                        s for s in self.staff_list
-                        if keyword_lower in s.full_name.lower()
+                        self._by_id[sid]
+                        for sid in sorted(
+                            self._text_index.search(keyword)
+                            | self._trigram_index.search(keyword)
+                        )
                     ]
                     break
 
@@ -244,25 +291,23 @@ class StaffManager:
 
     # NGHIỆP VỤ LIÊN KẾT
     def find_by_id(self, staff_id):
-        return next(
-            (s for s in self.staff_list if s.staff_id == staff_id),
-            None
-        )
+        return self._by_id.get(staff_id)
 
     def remove_task_from_all_staff(self, task_id):
         """
         Khi task bị xóa hoặc hủy
         gỡ task khỏi toàn bộ nhân viên
         """
-        changed = False
+        changed = []
 
         for s in self.staff_list:
             if task_id in s.task_list:
                 s.task_list.remove(task_id)
-                changed = True
+                changed.append(s)
 
-        if changed:
-            self.save_to_file()
+        with UnitOfWork():
+            for s in changed:
+                self.persist_staff(s)
 
     def add_task_to_staff(self, staff_id, task_id):
         """
@@ -274,4 +319,4 @@ class StaffManager:
 
         if task_id not in staff.task_list:
             staff.task_list.append(task_id)
-            self.save_to_file()
\ No newline at end of file
+            self.persist_staff(staff)
\ No newline at end of file
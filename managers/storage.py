@@ -0,0 +1,373 @@
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+# Cột task_list của nhân viên nhận nhiều task (VD: sau khi nhập hàng loạt)
+# có thể dài hơn giới hạn mặc định 128KB của module csv
+try:
+    csv.field_size_limit(sys.maxsize)
+except OverflowError:
+    csv.field_size_limit(2**31 - 1)
+
+
+def _to_csv_value(v):
+    # Giống cách csv.DictWriter ghi ra file: None -> "", còn lại -> str
+    return "" if v is None else str(v)
+
+
+def write_csv(filename, fieldnames, rows):
+    """Ghi toàn bộ rows ra file CSV"""
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_csv_atomic(filename, fieldnames, rows):
+    """Ghi ra file tạm rồi đổi tên -> file cũ không bị hỏng nếu lỗi giữa chừng"""
+    tmp = filename + ".tmp"
+    write_csv(tmp, fieldnames, rows)
+    os.replace(tmp, filename)
+
+
+class CsvStore:
+    """
+    Lưu trữ mặc định: 1 file CSV, mỗi lần lưu ghi đè toàn bộ file
+    """
+
+    incremental = False
+
+    def __init__(self, filename, fieldnames, id_field):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.id_field = id_field
+
+    def load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8", newline="") as f:
+                return list(csv.DictReader(f))
+        except FileNotFoundError:
+            return []
+
+    def save_all(self, rows, commit=True):
+        write_csv_atomic(self.filename, self.fieldnames, rows)
+
+    def write_temp(self, rows):
+        """Ghi ra file tạm (UnitOfWork sẽ đổi tên khi commit)"""
+        tmp = self.filename + ".tmp"
+        write_csv(tmp, self.fieldnames, rows)
+        return tmp
+
+    def should_compact(self):
+        return False
+
+
+class JournalStore(CsvStore):
+    """
+    Lưu trữ dạng journal:
+    - File CSV là snapshot
+    - Mỗi thao tác thêm/sửa/xóa chỉ ghi nối 1 dòng JSON vào <file>.journal
+    - Khi load: đọc snapshot rồi áp dụng lần lượt các dòng journal
+    - Khi journal vượt ngưỡng: gộp lại thành snapshot mới ở luồng nền
+    """
+
+    incremental = True
+
+    def __init__(self, filename, fieldnames, id_field, compact_threshold=1000):
+        super().__init__(filename, fieldnames, id_field)
+        self.journal_file = filename + ".journal"
+        # Journal đang được gộp vào snapshot (đổi tên từ journal_file)
+        self.old_journal_file = self.journal_file + ".old"
+        self.compact_threshold = compact_threshold
+        self.pending = 0
+        self._compactor = None
+
+    # ================= LOAD =================
+    def load(self):
+        self.wait_compaction()
+
+        rows = {row[self.id_field]: row for row in super().load()}
+        self._replay(self.old_journal_file, rows)
+        self.pending = self._replay(self.journal_file, rows)
+        result = list(rows.values())
+
+        # Lần gộp trước bị dừng giữa chừng -> gộp lại ngay
+        if os.path.exists(self.old_journal_file):
+            self.save_all(result)
+        return result
+
+    def _replay(self, path, rows):
+        count = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Dòng cuối ghi dở khi chương trình bị tắt đột ngột
+                        break
+                    if record["op"] == "put":
+                        rows[record["id"]] = record["row"]
+                    elif record["op"] == "del":
+                        rows.pop(record["id"], None)
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    # ================= GHI =================
+    def _append(self, records):
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.pending += len(records)
+
+    def put(self, item_id, row):
+        self.apply([("put", item_id, row)])
+
+    def delete(self, item_id):
+        self.apply([("del", item_id, None)])
+
+    def apply(self, ops, commit=True):
+        """ops: danh sách (op, id, row) với op là "put" hoặc "del" -> ghi nối 1 lần"""
+        records = []
+        for op, item_id, row in ops:
+            if op == "put":
+                row = {k: _to_csv_value(v) for k, v in row.items()}
+                records.append({"op": "put", "id": item_id, "row": row})
+            else:
+                records.append({"op": "del", "id": item_id})
+        self._append(records)
+
+    def save_all(self, rows, commit=True):
+        """Ghi snapshot đầy đủ và bỏ toàn bộ journal"""
+        self.wait_compaction()
+        self._write_snapshot(rows)
+        self._remove(self.journal_file)
+        self._remove(self.old_journal_file)
+        self.pending = 0
+
+    # ================= GỘP JOURNAL =================
+    def should_compact(self):
+        return self.pending >= self.compact_threshold and not self.is_compacting()
+
+    def is_compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact(self, rows):
+        """
+        rows: trạng thái hiện tại (snapshot + journal) đã chuyển sang dict.
+        Journal hiện tại được đổi tên, các thao tác mới ghi vào journal mới,
+        luồng nền ghi snapshot rồi xóa journal cũ.
+        """
+        if self.is_compacting():
+            return
+        if os.path.exists(self.old_journal_file):
+            # Lần gộp trước thất bại -> không được ghi đè journal cũ
+            self.save_all(rows)
+            return
+        if os.path.exists(self.journal_file):
+            os.replace(self.journal_file, self.old_journal_file)
+        self.pending = 0
+
+        self._compactor = threading.Thread(
+            target=self._compact_worker, args=(rows,)
+        )
+        self._compactor.start()
+
+    def _compact_worker(self, rows):
+        self._write_snapshot(rows)
+        self._remove(self.old_journal_file)
+
+    def wait_compaction(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _write_snapshot(self, rows):
+        write_csv_atomic(self.filename, self.fieldnames, rows)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteDatabase:
+    """
+    1 file SQLite dùng chung cho tất cả các bảng
+    """
+
+    def __init__(self, path="project_management.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+
+    def table(self, name, fieldnames, id_field, indexes=(), date_fields=None):
+        return SQLiteStore(self, name, fieldnames, id_field, indexes, date_fields)
+
+    # Phiên bản dữ liệu (PRAGMA user_version), 0 = chưa chuyển dữ liệu từ CSV
+    @property
+    def version(self):
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @version.setter
+    def version(self, value):
+        with self.conn:
+            self.conn.execute(f"PRAGMA user_version = {int(value)}")
+
+    def close(self):
+        self.conn.close()
+
+
+class SQLiteStore:
+    """
+    Lưu 1 loại đối tượng vào 1 bảng SQLite
+    - Mỗi cột là TEXT (giống CSV), id_field là khóa chính
+    - indexes: các cột cần đánh chỉ mục để tìm kiếm/lọc
+    - date_fields: {cột: định dạng ngày trong CSV}, lưu trong DB dạng YYYY-MM-DD
+      để so sánh/sắp xếp theo khoảng thời gian được
+    """
+
+    incremental = True
+
+    def __init__(self, db, table, fieldnames, id_field, indexes=(), date_fields=None):
+        self.db = db
+        self.table = table
+        self.fieldnames = fieldnames
+        self.id_field = id_field
+        self.date_fields = date_fields or {}
+
+        cols = ", ".join(
+            f'"{f}" TEXT PRIMARY KEY' if f == id_field else f'"{f}" TEXT'
+            for f in fieldnames
+        )
+        with db.conn:
+            db.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({cols})')
+            for col in indexes:
+                db.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_{col}" ON "{table}" ("{col}")'
+                )
+
+        col_list = ", ".join(f'"{f}"' for f in fieldnames)
+        updates = ", ".join(f'"{f}" = excluded."{f}"' for f in fieldnames if f != id_field)
+        self._select_sql = f'SELECT {col_list} FROM "{table}"'
+        self._upsert_sql = (
+            f'INSERT INTO "{table}" ({col_list}) VALUES ({", ".join("?" * len(fieldnames))}) '
+            f'ON CONFLICT("{id_field}") DO UPDATE SET {updates}'
+        )
+
+    # ================= CHUYỂN ĐỔI =================
+    def _to_db(self, row):
+        values = []
+        for f in self.fieldnames:
+            v = _to_csv_value(row.get(f))
+            if v and f in self.date_fields:
+                try:
+                    v = datetime.strptime(v, self.date_fields[f]).strftime("%Y-%m-%d")
+                except ValueError:
+                    pass
+            values.append(v)
+        return values
+
+    def _from_db(self, values):
+        row = dict(zip(self.fieldnames, values))
+        for f, fmt in self.date_fields.items():
+            if row.get(f):
+                try:
+                    row[f] = datetime.strptime(row[f], "%Y-%m-%d").strftime(fmt)
+                except ValueError:
+                    pass
+        return row
+
+    def _where_value(self, col, value):
+        if value and col in self.date_fields and isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d")
+        return value
+
+    # ================= LOAD / SAVE =================
+    def load(self):
+        cur = self.db.conn.execute(self._select_sql + " ORDER BY rowid")
+        return [self._from_db(r) for r in cur]
+
+    def save_all(self, rows, commit=True):
+        try:
+            self.db.conn.execute(f'DELETE FROM "{self.table}"')
+            self.db.conn.executemany(self._upsert_sql, (self._to_db(r) for r in rows))
+        except Exception:
+            if commit:
+                self.db.conn.rollback()
+            raise
+        if commit:
+            self.db.conn.commit()
+
+    def put(self, item_id, row):
+        self.apply([("put", item_id, row)])
+
+    def delete(self, item_id):
+        self.apply([("del", item_id, None)])
+
+    def apply(self, ops, commit=True):
+        """ops: danh sách (op, id, row); commit=False khi UnitOfWork commit chung"""
+        delete_sql = f'DELETE FROM "{self.table}" WHERE "{self.id_field}" = ?'
+        try:
+            for op, item_id, row in ops:
+                if op == "put":
+                    self.db.conn.execute(self._upsert_sql, self._to_db(row))
+                else:
+                    self.db.conn.execute(delete_sql, (item_id,))
+        except Exception:
+            if commit:
+                self.db.conn.rollback()
+            raise
+        if commit:
+            self.db.conn.commit()
+
+    def should_compact(self):
+        return False
+
+    # ================= TRUY VẤN =================
+    def find(self, **conditions):
+        """Tìm theo điều kiện bằng, VD: find(project_id="P25_00001", status_task="To Do")"""
+        sql = self._select_sql
+        params = []
+        if conditions:
+            sql += " WHERE " + " AND ".join(f'"{c}" = ?' for c in conditions)
+            params = [self._where_value(c, v) for c, v in conditions.items()]
+        cur = self.db.conn.execute(sql + " ORDER BY rowid", params)
+        return [self._from_db(r) for r in cur]
+
+    def find_range(self, col, low=None, high=None):
+        """Tìm các dòng có low <= col <= high (dùng cho cột ngày)"""
+        clauses, params = [f'"{col}" != \'\''], []
+        if low is not None:
+            clauses.append(f'"{col}" >= ?')
+            params.append(self._where_value(col, low))
+        if high is not None:
+            clauses.append(f'"{col}" <= ?')
+            params.append(self._where_value(col, high))
+        sql = f'{self._select_sql} WHERE {" AND ".join(clauses)} ORDER BY "{col}"'
+        return [self._from_db(r) for r in self.db.conn.execute(sql, params)]
+
+    def count(self):
+        return self.db.conn.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    # ================= CSV =================
+    def import_csv(self, filename):
+        """Nạp toàn bộ dữ liệu từ file CSV cũ (ghi đè bảng)"""
+        rows = CsvStore(filename, self.fieldnames, self.id_field).load()
+        self.save_all(rows)
+        return len(rows)
+
+    def export_csv(self, filename):
+        rows = self.load()
+        write_csv(filename, self.fieldnames, rows)
+        return len(rows)
@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from models.task import Task
+
+HISTORY_FIELDS = ["task_id", "project_id", "field", "value", "changed_at"]
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Các trường task được theo dõi (giá trị lưu giống cột trong tasks.csv)
+TRACKED_FIELDS = [f for f in Task.csv_fields() if f != "task_id"]
+
+# Dòng đặc biệt: task được tạo / bị xóa (value = toàn bộ dòng task dạng JSON)
+CREATED = "created"
+DELETED = "deleted"
+
+# Giá trị trước lần thay đổi đầu tiên (chưa rõ thời điểm) -> coi như có từ đầu
+BASELINE = datetime.min
+
+
+class TaskHistory:
+    """
+    Lịch sử thay đổi task, file CSV chỉ ghi nối (task_history.csv)
+    - Mỗi dòng: task_id, project_id, trường, giá trị mới, thời điểm
+    - Trong bộ nhớ: task_id -> trường -> (danh sách thời điểm, danh sách giá trị)
+      đã sắp xếp theo thời gian, tra giá trị tại 1 thời điểm bằng bisect
+    """
+
+    def __init__(self, filename="task_history.csv"):
+        self.filename = filename
+        self._changes = {}   # task_id -> {field: ([thời điểm], [giá trị])}
+        self._created = {}   # task_id -> thời điểm tạo
+        self._deleted = {}   # task_id -> (thời điểm xóa, dòng task)
+        self._members = {}   # project_id -> mã các task từng thuộc dự án
+        self._pending = None # đang trong batch(): các dòng chờ ghi
+        self.load()
+
+    # ================= FILE =================
+    def load(self):
+        self._changes, self._created, self._deleted, self._members = {}, {}, {}, {}
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                when = (
+                    datetime.strptime(row["changed_at"], TIME_FORMAT)
+                    if row["changed_at"] else BASELINE
+                )
+                self._apply(row["task_id"], row["project_id"], row["field"], row["value"], when)
+
+    def _append(self, rows):
+        if not rows:
+            return
+        if self._pending is not None:
+            self._pending.extend(rows)
+            return
+        new_file = not os.path.exists(self.filename)
+        with open(self.filename, "a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    @contextmanager
+    def batch(self):
+        """Gom các dòng ghi nối trong khối with thành 1 lần mở file"""
+        if self._pending is not None:
+            yield
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            rows, self._pending = self._pending, None
+            self._append(rows)
+
+    def _apply(self, task_id, project_id, field, value, when):
+        self._members.setdefault(project_id, set()).add(task_id)
+        if field == "project_id":
+            self._members.setdefault(value, set()).add(task_id)
+
+        if field == CREATED:
+            self._created[task_id] = when
+            # Tạo lại task cùng mã sau khi xóa: bỏ lịch sử của task cũ
+            self._deleted.pop(task_id, None)
+            self._changes.pop(task_id, None)
+        elif field == DELETED:
+            self._deleted[task_id] = (when, json.loads(value))
+        else:
+            times, values = self._changes.setdefault(task_id, {}).setdefault(field, ([], []))
+            times.append(when)
+            values.append(value)
+
+    def _row(self, task_id, project_id, field, value, when):
+        if when != BASELINE:
+            # File lưu đến giây -> giữ giống nhau trước và sau khi đọc lại
+            when = when.replace(microsecond=0)
+        self._apply(task_id, project_id, field, value, when)
+        return {
+            "task_id": task_id,
+            "project_id": project_id,
+            "field": field,
+            "value": value,
+            "changed_at": when.strftime(TIME_FORMAT) if when != BASELINE else "",
+        }
+
+    # ================= GHI NHẬN =================
+    @staticmethod
+    def snapshot(task):
+        return task.to_dict()
+
+    def record_created(self, task, when=None):
+        # Task nhập sau với ngày bắt đầu đã qua: coi như có từ ngày bắt đầu
+        when = when or datetime.now()
+        if task.start_date and task.start_date < when:
+            when = task.start_date
+        self._append([self._row(task.id, task.project_id, CREATED, "", when)])
+
+    def record_changes(self, task, before, when=None):
+        """before: snapshot(task) trước khi sửa -> ghi các trường đã đổi"""
+        when = when or datetime.now()
+        after = self.snapshot(task)
+        rows = []
+        for field in TRACKED_FIELDS:
+            if before.get(field) == after.get(field):
+                continue
+            if field not in self._changes.get(task.id, {}):
+                # Lần đổi đầu tiên: lưu giá trị cũ làm mốc
+                rows.append(self._row(task.id, task.project_id, field, before.get(field, ""), BASELINE))
+            rows.append(self._row(task.id, task.project_id, field, after.get(field, ""), when))
+        self._append(rows)
+
+    def record_deleted(self, tasks, when=None):
+        when = when or datetime.now()
+        self._append([
+            self._row(t.id, t.project_id, DELETED, json.dumps(t.to_dict(), ensure_ascii=False), when)
+            for t in tasks
+        ])
+
+    # ================= TRA CỨU THEO THỜI ĐIỂM =================
+    def value_at(self, task_id, field, when, default=None):
+        """Giá trị của trường ngay trước thời điểm when (default nếu chưa từng đổi)"""
+        history = self._changes.get(task_id, {}).get(field)
+        if not history:
+            return default
+        times, values = history
+        i = bisect_left(times, when)
+        return values[i - 1] if i else default
+
+    def _row_at(self, row, when):
+        row = dict(row)
+        for field in TRACKED_FIELDS:
+            row[field] = self.value_at(row["task_id"], field, when, row.get(field, ""))
+        return row
+
+    def task_ids_of_project(self, project_id):
+        """Mã các task từng thuộc dự án (kể cả đã chuyển sang dự án khác)"""
+        return set(self._members.get(project_id, ()))
+
+    def tasks_as_of(self, current_tasks, project_id, when):
+        """
+        Trạng thái các task của dự án ngay trước thời điểm when:
+        - current_tasks: các task hiện có từng thuộc dự án (không bị sửa)
+        - Bỏ task tạo sau when (tạo = ngày bắt đầu nếu sớm hơn lúc nhập),
+          thêm lại task bị xóa sau when
+        Trả về các Task mới dựng lại từ lịch sử
+        """
+        result = []
+        for t in current_tasks:
+            if self._created.get(t.id, BASELINE) >= when:
+                continue
+            result.append(Task.from_dict(self._row_at(t.to_dict(), when)))
+
+        for task_id in self._members.get(project_id, ()):
+            if task_id not in self._deleted:
+                continue
+            deleted_at, row = self._deleted[task_id]
+            if deleted_at >= when and self._created.get(task_id, BASELINE) < when:
+                result.append(Task.from_dict(self._row_at(row, when)))
+
+        # Chỉ giữ task thuộc dự án tại thời điểm when
+        return [t for t in result if t.project_id == project_id]
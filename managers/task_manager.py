@@ -1,35 +1,269 @@
 # task_manager.py
 import re
-from datetime import datetime
+from contextlib import contextmanager
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
 from models.task import Task
 from managers.ProjectItem_manager import ProjectItemManager
+from managers.interval_index import IntervalIndex
+from managers.unit_of_work import UnitOfWork
+from managers.assignment_scheduler import AssignmentScheduler
+from managers.snapshot import TaskSnapshot
 
 
 class TaskManager(ProjectItemManager):
-    def __init__(self, filename, staff_manager, project_manager):
+    def __init__(self, filename, staff_manager, project_manager, store=None, history=None):
         super().__init__(
             filename=filename,
             cls=Task,
             fieldnames=Task.csv_fields(),
-            id_field="task_id"
+            id_field="task_id",
+            store=store
         )
         self.staff_manager = staff_manager
         self.project_manager = project_manager
-        self.task_list = self.items
+        # TaskHistory: ghi lịch sử thay đổi task (None = không ghi)
+        self.history = history
+        # DependencyGraph: gán sau khi load task (None = không dùng phụ thuộc)
+        self.dependencies = None
+
+    @property
+    def task_list(self):
+        # Tên cũ của items (items có thể được thay bằng bản sao khi có snapshot)
+        return self.items
 
     # ================= SAVE =================
     def save_to_file(self):
         super().save_to_file()
 
-    # ================= FIND =================
-    def find_by_id(self, task_id):
-        return next((t for t in self.items if t.id == task_id), None)
+    # ================= CHỈ MỤC PHỤ =================
+    # project_id -> {task_id: Task}, assignee_id -> {task_id: Task}
+    def load_from_file(self):
+        self._by_project = {}
+        self._by_assignee = {}
+        # Dự án có bucket đã sao chép riêng từ lần chụp snapshot gần nhất (None = tất cả)
+        self._owned_buckets = None
+        # Cây khoảng [start_date, deadline] dựng khi cần, bỏ đi khi task thay đổi
+        self._intervals = {}         # project_id -> IntervalIndex
+        self._all_intervals = None
+        # (deadline, task_id) của các task chưa đóng, sắp xếp theo deadline
+        self._open_deadlines = []
+        # Bộ đếm theo dự án: project_id -> Counter(status), deadline các task chưa đóng
+        self._status_counts = {}
+        self._project_deadlines = {}
+        # Mảng NumPy cho thống kê, dựng lại khi cần sau mỗi thay đổi
+        self._analytics = None
+        # Tăng sau mỗi thay đổi: snapshot chỉ trả cache lại cho manager khi chưa đổi
+        self._version = 0
+        super().load_from_file()
+
+    @staticmethod
+    def _assignee_key(assignee_id):
+        return (assignee_id or "").strip().upper()
+
+    def _project_bucket(self, project_id):
+        """Bucket task của dự án để ghi, sao chép nếu còn dùng chung với snapshot"""
+        bucket = self._by_project.get(project_id)
+        if bucket is None:
+            bucket = self._by_project[project_id] = {}
+        elif self._owned_buckets is not None and project_id not in self._owned_buckets:
+            bucket = self._by_project[project_id] = dict(bucket)
+        if self._owned_buckets is not None:
+            self._owned_buckets.add(project_id)
+        return bucket
+
+    def _index_item(self, task):
+        super()._index_item(task)
+        self._project_bucket(task.project_id)[task.id] = task
+        self._by_assignee.setdefault(self._assignee_key(task.assignee_id), {})[task.id] = task
+        self._invalidate_intervals(task)
+        self._status_counts.setdefault(task.project_id, Counter())[task.status_task] += 1
+        if self._is_open(task):
+            insort(self._open_deadlines, (task.deadline, task.id))
+            insort(self._project_deadlines.setdefault(task.project_id, []), task.deadline)
+
+    def _unindex_item(self, task):
+        super()._unindex_item(task)
+        if task.project_id in self._by_project:
+            bucket = self._project_bucket(task.project_id)
+            bucket.pop(task.id, None)
+            if not bucket:
+                del self._by_project[task.project_id]
+
+        bucket = self._by_assignee.get(self._assignee_key(task.assignee_id))
+        if bucket is not None:
+            bucket.pop(task.id, None)
+            if not bucket:
+                del self._by_assignee[self._assignee_key(task.assignee_id)]
+        self._invalidate_intervals(task)
+
+        counts = self._status_counts.get(task.project_id)
+        if counts is not None:
+            counts[task.status_task] -= 1
+            if counts[task.status_task] <= 0:
+                del counts[task.status_task]
+            if not counts:
+                del self._status_counts[task.project_id]
+
+        if self._is_open(task):
+            key = (task.deadline, task.id)
+            i = bisect_left(self._open_deadlines, key)
+            if i < len(self._open_deadlines) and self._open_deadlines[i] == key:
+                del self._open_deadlines[i]
+
+            deadlines = self._project_deadlines.get(task.project_id, [])
+            i = bisect_left(deadlines, task.deadline)
+            if i < len(deadlines) and deadlines[i] == task.deadline:
+                del deadlines[i]
+            if not deadlines:
+                self._project_deadlines.pop(task.project_id, None)
+
+    def _search_texts(self, task):
+        return [task.id, task.name, task.description]
+
+    def _substring_texts(self, task):
+        return [task.id, task.name, task.description]
+
+    def _invalidate_intervals(self, task):
+        self._intervals.pop(task.project_id, None)
+        self._all_intervals = None
+        self._analytics = None
+        self._version += 1
+
+    @staticmethod
+    def _is_open(task):
+        return bool(task.deadline) and task.status_task not in ("Completed", "Cancelled")
+
+    def _deadline_range(self, low=None, high=None):
+        """Task chưa đóng có low <= deadline < high, theo thứ tự deadline"""
+        entries = self._open_deadlines
+        i = bisect_left(entries, (low,)) if low is not None else 0
+        j = bisect_left(entries, (high,)) if high is not None else len(entries)
+        return [self._by_id[tid] for _, tid in entries[i:j]]
+
+    def overdue_tasks(self, now=None):
+        """Task chưa hoàn thành/hủy có deadline trước thời điểm now"""
+        return self._deadline_range(high=now or datetime.now())
+
+    def tasks_due_within(self, days, now=None):
+        """Task chưa hoàn thành/hủy có deadline trong N ngày tới (chưa quá hạn)"""
+        now = now or datetime.now()
+        return self._deadline_range(low=now, high=now + timedelta(days=days))
+
+    def status_counts(self, project_id):
+        """Số task của dự án theo trạng thái: {"To Do": 2, "Completed": 1, ...}"""
+        return dict(self._status_counts.get(project_id, {}))
+
+    def count_of_project(self, project_id):
+        return len(self._by_project.get(project_id, ()))
+
+    def overdue_count(self, project_id, now=None):
+        """Số task chưa hoàn thành/hủy của dự án đã quá deadline"""
+        return bisect_left(self._project_deadlines.get(project_id, []), now or datetime.now())
+
+    def analytics(self, build=True):
+        """
+        TaskAnalytics (NumPy) trên toàn bộ task, None nếu chưa cài numpy
+        build=False: chỉ trả về bản đã dựng sẵn (None nếu chưa có)
+        """
+        if self._analytics is None and build:
+            try:
+                from reports.analytics import TaskAnalytics
+            except ImportError:
+                return None
+            self._analytics = TaskAnalytics(self.items)
+        return self._analytics
+
+    def tasks_of_project(self, project_id):
+        return list(self._by_project.get(project_id, {}).values())
+
+    def tasks_of_assignee(self, staff_id):
+        return list(self._by_assignee.get(self._assignee_key(staff_id), {}).values())
+
+    def assignee_ids(self):
+        """Các mã người phụ trách đang có task (đã chuẩn hóa, gồm cả "UNASSIGNED")"""
+        return list(self._by_assignee)
+
+    def tasks_overlapping(self, period_start, period_end, project_id=None):
+        """Các task có [start_date, deadline] giao với kỳ [period_start, period_end]"""
+        if project_id is None:
+            if self._all_intervals is None:
+                self._all_intervals = IntervalIndex(self.items)
+            return self._all_intervals.query(period_start, period_end)
+
+        index = self._intervals.get(project_id)
+        if index is None:
+            index = IntervalIndex(self.tasks_of_project(project_id))
+            self._intervals[project_id] = index
+        return index.query(period_start, period_end)
+
+    # ================= SNAPSHOT =================
+    def _make_snapshot(self):
+        return TaskSnapshot(
+            self.items, self._by_id, self._by_project,
+            self._intervals, self._all_intervals, self._analytics,
+            owner=self, version=self._version
+        )
+
+    def _adopt_cache(self, version, analytics=None, all_intervals=None):
+        """Snapshot vừa dựng cache: giữ lại cho manager nếu task chưa đổi từ lúc chụp"""
+        if version != self._version:
+            return
+        if analytics is not None and self._analytics is None:
+            self._analytics = analytics
+        if all_intervals is not None and self._all_intervals is None:
+            self._all_intervals = all_intervals
+
+    def _copy_shared(self):
+        super()._copy_shared()
+        # Bucket từng dự án chỉ sao chép khi dự án đó bị sửa
+        self._by_project = dict(self._by_project)
+        self._owned_buckets = set()
+        self._intervals = dict(self._intervals)
+
+    # ================= LỊCH SỬ =================
+    def insert_item(self, task):
+        super().insert_item(task)
+        if self.history:
+            self.history.record_created(task)
+        if self.dependencies:
+            self.dependencies.task_changed(task.id)
+
+    def remove_item(self, task):
+        super().remove_item(task)
+        if self.history:
+            self.history.record_deleted([task])
+        if self.dependencies:
+            self.dependencies.remove_task(task.id)
+
+    @contextmanager
+    def editing(self, task):
+        before = self.history.snapshot(task) if self.history else None
+        with super().editing(task) as task:
+            yield task
+        if self.history:
+            self.history.record_changes(task, before)
+        if self.dependencies:
+            # Ngày đổi -> chỉ tính lại lịch các task phía sau
+            self.dependencies.task_changed(task.id)
+
+    def tasks_as_of(self, project_id, when):
+        """Các task của dự án theo trạng thái ngay trước thời điểm when"""
+        tasks = {t.id: t for t in self.tasks_of_project(project_id)}
+        if self.history is None:
+            return list(tasks.values())
+        # Cả các task đã chuyển sang dự án khác
+        for task_id in self.history.task_ids_of_project(project_id):
+            task = self.find_by_id(task_id)
+            if task:
+                tasks.setdefault(task_id, task)
+        return self.history.tasks_as_of(tasks.values(), project_id, when)
 
     # ================= CRUD =================
     def add_task(self):
         print("\n--- THÊM TASK ---")
         task = Task()
-        existing_ids = [t.id for t in self.items]
 
         # ===== CHỌN DỰ ÁN =====
         while True:
@@ -52,7 +286,7 @@ class TaskManager(ProjectItemManager):
             if not re.fullmatch(rf"{prefix}\d{{5}}", task_id):
                 print("Sai định dạng mã task.")
                 continue
-            if task_id in existing_ids:
+            if self.find_by_id(task_id):
                 print("Mã task đã tồn tại.")
                 continue
             break
@@ -62,37 +296,55 @@ class TaskManager(ProjectItemManager):
 
         # ===== NHẬP THÔNG TIN =====
         staff_list = self.staff_manager.staff_list if self.staff_manager else []
+        # Ngày ngoài thời gian dự án bị từ chối ngay khi nhập (giống TaskService)
         task.input_info(staff_list, project)
 
-        # ===== VALIDATE NGÀY =====
-        if task.start_date < project.start_date:
-            print("Ngày bắt đầu task < ngày bắt đầu dự án → tự chỉnh.")
-            task.start_date = project.start_date
-
-        if task.start_date > project.expected_end_date:
-            print("Ngày bắt đầu task > ngày kết thúc dự án → tự chỉnh.")
-            task.start_date = project.expected_end_date
+        # ===== TASK PHỤ THUỘC =====
+        predecessors = []
+        if self.dependencies:
+            while True:
+                raw = input("Task phụ thuộc (mã, cách nhau dấu phẩy, Enter = không có): ").strip()
+                predecessors = [x.strip() for x in raw.split(",") if x.strip()]
+                invalid = [
+                    pid for pid in predecessors
+                    if not self.find_by_id(pid) or self.find_by_id(pid).project_id != project_id
+                ]
+                if invalid:
+                    print(f"Task không tồn tại trong dự án: {', '.join(invalid)}")
+                    continue
+                break
+
+        self.create_task(task, predecessors)
+        print(f"Đã thêm task {task.id} thành công!")
 
-        if task.deadline > project.expected_end_date:
-            print("Deadline task > ngày kết thúc dự án → tự chỉnh.")
-            task.deadline = project.expected_end_date
+    def create_task(self, task, predecessors=(), update_project=True):
+        """
+        Lưu task mới đã kiểm tra hợp lệ (không hỏi):
+        gán cho nhân sự, thêm vào chỉ mục, thêm phụ thuộc, cập nhật trạng thái dự án.
+        tasks / staff / projects ghi 1 lần khi commit (hoặc khi UnitOfWork ngoài commit)
+        update_project=False: người gọi tự cập nhật trạng thái dự án (VD: 1 lần cho cả lô)
+        """
+        with UnitOfWork():
+            # GÁN TASK CHO NHÂN SỰ
+            staff = None
+            if task.assignee_id and self.staff_manager:
+                staff = self.staff_manager.find_by_id(task.assignee_id)
+                if staff:
+                    staff.task_list.append(task.id)
+
+            self.insert_item(task)
+            self.persist_item(task)
+
+            if self.dependencies:
+                for pid in dict.fromkeys(predecessors):
+                    self.dependencies.add_dependency(task.id, pid)
 
-        # ===== GÁN TASK CHO NHÂN SỰ =====
-        if task.assignee_id and self.staff_manager:
-            staff = self.staff_manager.find_by_id(task.assignee_id)
             if staff:
-                staff.task_list.append(task.id)
-
-        self.items.append(task)
-        self.save_to_file()
-
-        if self.staff_manager:
-            self.staff_manager.save_to_file()
+                self.staff_manager.persist_staff(staff)
 
-        # CẬP NHẬT TRẠNG THÁI PROJECT 
-        self.project_manager.update_project_status(project_id, self)
-
-        print(f"Đã thêm task {task.id} thành công!")
+            # CẬP NHẬT TRẠNG THÁI PROJECT 
+            if update_project:
+                self.project_manager.update_project_status(task.project_id, self)
 
     # ================= UPDATE =================
     def update_task(self):
@@ -107,12 +359,14 @@ class TaskManager(ProjectItemManager):
         staff_list = self.staff_manager.staff_list if self.staff_manager else []
         project = self.project_manager.find_by_id(task.project_id)
 
-        task.update_info(staff_list, project)
+        with self.editing(task) as task:
+            task.update_info(staff_list, project)
 
-        self.save_to_file()
+        with UnitOfWork():
+            self.persist_item(task)
 
-        # CẬP NHẬT TRẠNG THÁI PROJECT
-        self.project_manager.update_project_status(task.project_id, self)
+            # CẬP NHẬT TRẠNG THÁI PROJECT
+            self.project_manager.update_project_status(task.project_id, self)
 
         print("Cập nhật task thành công!")
 
@@ -130,19 +384,23 @@ class TaskManager(ProjectItemManager):
         if confirm != "y":
             return
 
-        if task.assignee_id and self.staff_manager:
-            staff = self.staff_manager.find_by_id(task.assignee_id)
-            if staff and task.id in staff.task_list:
-                staff.task_list.remove(task.id)
+        with UnitOfWork():
+            staff = None
+            if task.assignee_id and self.staff_manager:
+                staff = self.staff_manager.find_by_id(task.assignee_id)
+                if staff and task.id in staff.task_list:
+                    staff.task_list.remove(task.id)
+                else:
+                    staff = None
 
-        self.items.remove(task)
-        self.save_to_file()
+            self.remove_item(task)
+            self.persist_delete(task)
 
-        if self.staff_manager:
-            self.staff_manager.save_to_file()
+            if staff:
+                self.staff_manager.persist_staff(staff)
 
-        # CẬP NHẬT TRẠNG THÁI PROJECT
-        self.project_manager.update_project_status(task.project_id, self)
+            # CẬP NHẬT TRẠNG THÁI PROJECT
+            self.project_manager.update_project_status(task.project_id, self)
 
         print("Đã xóa task.")
 
@@ -166,11 +424,7 @@ class TaskManager(ProjectItemManager):
 
     def display_overdue_tasks(self):
         print("\n--- TASK QUÁ HẠN ---")
-        today = datetime.now()
-        overdue = [
-            t for t in self.items
-            if t.deadline and t.deadline < today and t.status_task != "Completed"
-        ]
+        overdue = self.overdue_tasks()
 
         if not overdue:
             print("Không có task quá hạn.")
@@ -179,32 +433,143 @@ class TaskManager(ProjectItemManager):
         for t in overdue:
             print(f"{t.id} | {t.name} | Deadline: {t.deadline.strftime('%d/%m/%Y')}")
 
+    def display_due_soon_tasks(self):
+        print("\n--- TASK SẮP ĐẾN HẠN ---")
+        while True:
+            try:
+                days = int(input("Số ngày tới: ").strip())
+                if days < 0:
+                    print("Số ngày phải >= 0")
+                    continue
+                break
+            except ValueError:
+                print("Phải là số nguyên")
+
+        due = self.tasks_due_within(days)
+        if not due:
+            print(f"Không có task đến hạn trong {days} ngày tới.")
+            return
+
+        today = datetime.now()
+        for t in due:
+            left = (t.deadline - today).days + 1
+            print(
+                f"{t.id} | {t.name} | {t.assignee_id or 'Unassigned'} | "
+                f"Deadline: {t.deadline.strftime('%d/%m/%Y')} (còn {left} ngày)"
+            )
+
+    # ================= PHỤ THUỘC & ĐƯỜNG GĂNG =================
+    def manage_dependencies(self):
+        if not self.dependencies:
+            print("Chưa bật quản lý phụ thuộc.")
+            return
+
+        while True:
+            print("\n--- PHỤ THUỘC GIỮA CÁC TASK ---")
+            print("1. Thêm phụ thuộc")
+            print("2. Xóa phụ thuộc")
+            print("3. Xem đường găng của dự án")
+            print("0. Quay lại")
+            choice = input("Chọn chức năng: ").strip()
+
+            if choice == "1":
+                task_id = input("Mã task: ").strip()
+                pred_id = input("Phải làm xong task (mã): ").strip()
+                try:
+                    with UnitOfWork():
+                        self.dependencies.add_dependency(task_id, pred_id)
+                    print("Đã thêm phụ thuộc.")
+                except ValueError as e:
+                    print(f"Lỗi: {e}")
+            elif choice == "2":
+                task_id = input("Mã task: ").strip()
+                print(f"Đang phụ thuộc: {', '.join(self.dependencies.predecessors(task_id)) or '-'}")
+                pred_id = input("Bỏ phụ thuộc vào task (mã): ").strip()
+                if self.dependencies.remove_dependency(task_id, pred_id):
+                    print("Đã xóa phụ thuộc.")
+                else:
+                    print("Không có phụ thuộc này.")
+            elif choice == "3":
+                self.display_critical_path(input("Mã dự án: ").strip())
+            elif choice == "0":
+                return
+            else:
+                print("Lựa chọn không hợp lệ.")
+
+    def display_critical_path(self, project_id):
+        path = self.dependencies.critical_path(project_id)
+        if not path:
+            print("Dự án chưa có task có ngày bắt đầu/deadline.")
+            return
+
+        print(f"\n--- ĐƯỜNG GĂNG DỰ ÁN {project_id} ---")
+        print(f"{'ID':<18} | {'Tên':<20} | {'BĐ sớm nhất':<12} | {'KT sớm nhất':<12} | {'Deadline':<12}")
+        for tid in path:
+            t = self.find_by_id(tid)
+            es, ef = self.dependencies.early[tid]
+            late = " (trễ)" if t.deadline and ef > t.deadline else ""
+            print(
+                f"{t.id:<18} | {t.name[:20]:<20} | {es.strftime('%d/%m/%Y'):<12} | "
+                f"{ef.strftime('%d/%m/%Y'):<12} | "
+                f"{t.deadline.strftime('%d/%m/%Y') if t.deadline else '--':<12}{late}"
+            )
+        ef = self.dependencies.early[path[-1]][1]
+        print(f"Ngày kết thúc sớm nhất của dự án: {ef.strftime('%d/%m/%Y')}")
+
     # ================= UNASSIGN =================
     def unassign_staff(self, staff_id):
-        updated = False
-        for t in self.items:
-            if t.assignee_id and t.assignee_id.strip().upper() == staff_id.strip().upper():
-                t.assignee_id = "Unassigned"
-                updated = True
+        updated = []
+        for t in self.tasks_of_assignee(staff_id):
+            if t.assignee_id:
+                with self.editing(t) as t:
+                    t.assignee_id = "Unassigned"
+                updated.append(t)
 
         if updated:
-            self.save_to_file()
+            self.persist_items(updated)
             print(f"Đã gỡ task khỏi nhân viên {staff_id}")
 
+    # ================= TỰ ĐỘNG GIAO TASK =================
+    def auto_assign_tasks(self):
+        print("\n--- TỰ ĐỘNG GIAO TASK CHƯA CÓ NGƯỜI LÀM ---")
+        scheduler = AssignmentScheduler(self.staff_manager, self)
+        assignments, skipped = scheduler.plan()
+
+        if not assignments and not skipped:
+            print("Không có task nào cần giao.")
+            return
+
+        lines = [f"{'ID':<18} | {'Tên':<20} | {'Priority':<8} | {'Deadline':<12} | {'Giao cho':<10}"]
+        for t, staff_id in assignments:
+            lines.append(
+                f"{t.id:<18} | {t.name[:20]:<20} | {t.priority:<8} | "
+                f"{t.deadline.strftime('%d/%m/%Y') if t.deadline else '--':<12} | {staff_id:<10}"
+            )
+        print("\n".join(lines))
+        if skipped:
+            print(f"Không có nhân viên phù hợp cho {len(skipped)} task: "
+                  f"{', '.join(t.id for t in skipped)}")
+        if not assignments:
+            return
+
+        confirm = input(f"Giao {len(assignments)} task theo kế hoạch trên? (y/n): ").strip().lower()
+        if confirm != "y":
+            print("Đã hủy.")
+            return
+
+        scheduler.apply(assignments)
+        print(f"Đã giao {len(assignments)} task.")
+
     # ================= SEARCH =================
     def search_task(self):
         print("\n--- TÌM KIẾM TASK ---")
-        keyword = input("Nhập mã task hoặc tên task: ").strip().lower()
+        keyword = input("Nhập mã task hoặc tên task: ").strip()
 
         if not keyword:
             print("Không được để trống.")
             return
 
-        results = [
-            t for t in self.items
-            if keyword in t.id.lower()
-            or keyword in t.name.lower()
-        ]
+        results = self.search_ids(keyword)
 
         if not results:
             print("Không tìm thấy task.")
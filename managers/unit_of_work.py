@@ -0,0 +1,143 @@
+import json
+import os
+
+
+class UnitOfWork:
+    """
+    Gom các lần lưu của nhiều manager trong 1 thao tác thành 1 lần ghi:
+
+        with UnitOfWork():
+            ...  # các manager vẫn gọi save_to_file / persist_* như bình thường
+
+    - Trong khối with, manager chỉ ghi nhận thay đổi, chưa ghi file
+    - Khi kết thúc, mỗi file/bảng chỉ được ghi đúng 1 lần
+    - File CSV được ghi ra file tạm, ghi nhật ký commit rồi mới đổi tên,
+      nếu chương trình dừng giữa chừng thì lần chạy sau recover() sẽ hoàn tất
+    - Nếu có lỗi trong khối with thì không ghi gì cả
+    """
+
+    INTENT_FILE = "pending_commit.json"
+    _current = None
+
+    def __init__(self):
+        self._outer = None
+        self._entries = {}  # id(manager) -> thay đổi của manager đó
+
+    @classmethod
+    def current(cls):
+        return cls._current
+
+    # ================= CONTEXT =================
+    def __enter__(self):
+        # Khối with lồng nhau -> dùng chung unit of work bên ngoài
+        self._outer = UnitOfWork._current
+        if self._outer is None:
+            UnitOfWork._current = self
+        return UnitOfWork._current
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._outer is not None:
+            return False
+        UnitOfWork._current = None
+        if exc_type is None:
+            self.commit()
+        return False
+
+    # ================= GHI NHẬN =================
+    def _entry(self, manager):
+        key = id(manager)
+        if key not in self._entries:
+            self._entries[key] = {"manager": manager, "full": False, "ops": {}}
+        return self._entries[key]
+
+    def mark_full(self, manager):
+        """Manager cần ghi lại toàn bộ dữ liệu"""
+        self._entry(manager)["full"] = True
+
+    def mark_put(self, manager, objs):
+        ops = self._entry(manager)["ops"]
+        for obj in objs:
+            item_id = manager._row_id(obj)
+            ops.pop(item_id, None)
+            ops[item_id] = ("put", obj)
+
+    def mark_delete(self, manager, objs):
+        ops = self._entry(manager)["ops"]
+        for obj in objs:
+            item_id = manager._row_id(obj)
+            ops.pop(item_id, None)
+            ops[item_id] = ("del", obj)
+
+    # ================= COMMIT =================
+    def commit(self):
+        renames = []
+        incremental = []
+
+        # 1. Ghi các file CSV ra file tạm
+        for entry in self._entries.values():
+            manager = entry["manager"]
+            store = manager.store
+            if not entry["full"] and not entry["ops"]:
+                continue
+            if not store.incremental:
+                renames.append((store.write_temp(manager._all_rows()), store.filename))
+            else:
+                incremental.append(entry)
+
+        # 2. Ghi nhật ký commit rồi đổi tên file tạm -> file thật
+        if renames:
+            with open(self.INTENT_FILE, "w", encoding="utf-8") as f:
+                json.dump(renames, f)
+                f.flush()
+                os.fsync(f.fileno())
+            for tmp, target in renames:
+                os.replace(tmp, target)
+            os.remove(self.INTENT_FILE)
+
+        # 3. Store ghi từng dòng (journal/SQLite): mỗi store ghi 1 lần
+        databases = {}
+        try:
+            for entry in incremental:
+                manager = entry["manager"]
+                store = manager.store
+                db = getattr(store, "db", None)
+                if db is not None:
+                    databases[id(db)] = db
+
+                if entry["full"]:
+                    store.save_all(manager._all_rows(), commit=db is None)
+                else:
+                    ops = [
+                        (op, item_id, manager._to_row(obj) if op == "put" else None)
+                        for item_id, (op, obj) in entry["ops"].items()
+                    ]
+                    store.apply(ops, commit=db is None)
+
+                if store.should_compact():
+                    store.compact(manager._all_rows())
+
+            # Các bảng SQLite dùng chung 1 kết nối -> commit 1 lần
+            for db in databases.values():
+                db.conn.commit()
+        except Exception:
+            for db in databases.values():
+                db.conn.rollback()
+            raise
+
+    # ================= KHÔI PHỤC =================
+    @classmethod
+    def recover(cls):
+        """Hoàn tất lần commit bị dừng giữa chừng (gọi khi khởi động)"""
+        if not os.path.exists(cls.INTENT_FILE):
+            return False
+        try:
+            with open(cls.INTENT_FILE, "r", encoding="utf-8") as f:
+                renames = json.load(f)
+        except ValueError:
+            # Nhật ký chưa ghi xong -> chưa đổi tên file nào, bỏ các file tạm
+            renames = []
+        for tmp, target in renames:
+            if os.path.exists(tmp):
+                os.replace(tmp, target)
+        os.remove(cls.INTENT_FILE)
+        return True
@@ -1,8 +1,24 @@
+from bisect import insort
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from reports.weekly_report import WeeklyReport
 from reports.base_report import BaseReport
 import re
 
+# Số task tối thiểu của 1 dự án để thống kê theo kỳ bằng TaskAnalytics (NumPy)
+ANALYTICS_MIN_TASKS = 256
+
+# Các trường task cần cho thống kê kỳ (gửi sang tiến trình con thay cho cả Task)
+_TaskDates = namedtuple("_TaskDates", ["start_date", "deadline", "status_task", "completed_date"])
+
+
+def _project_period_stats(job):
+    """Chạy trong tiến trình con: job = (các dòng _TaskDates của 1 dự án, các kỳ)"""
+    rows, periods = job
+    return WeeklyReport.compute_stats_batch([_TaskDates(*r) for r in rows], periods)
+
 
 class WeeklyReportManager:
     """
@@ -12,8 +28,16 @@ class WeeklyReportManager:
     - Tuần không trùng, không nhảy
     """
 
-    def __init__(self, filename="weekly_reports.csv"):
+    def __init__(self, filename="weekly_reports.csv", store=None, workers=1):
         self.filename = filename
+        # store = None: đọc/ghi trực tiếp file CSV qua BaseReport
+        self.store = store
+        # Số tiến trình khi tạo hàng loạt báo cáo (1 = chạy tuần tự)
+        self.workers = workers
+        # Chỉ mục theo dự án, dựng 1 lần khi cần:
+        # project_id -> [(period_end, report_id)] sắp xếp theo period_end
+        self._by_project = None
+        self._project_of = {}  # report_id -> project_id
 
     # ================= 1. TẠO BÁO CÁO TUẦN =================
     def create_report(self, project_manager, staff_manager, task_manager):
@@ -48,24 +72,15 @@ class WeeklyReportManager:
                 continue
             break
 
-        # ===== LẤY BÁO CÁO CŨ =====
-        reports = BaseReport.load_from_csv(self.filename)
-        project_reports = [r for r in reports if r["project_id"] == pid]
-
-        # ===== XÁC ĐỊNH TUẦN =====
-        if not project_reports:
+        # ===== XÁC ĐỊNH TUẦN (theo chỉ mục dự án) =====
+        report_count = self.report_count(pid)
+        if report_count == 0:
             is_first_week = True
             expected_start = project.start_date
             print(f"Tuần 1 bắt đầu từ: {expected_start.strftime('%d/%m/%Y')}")
         else:
             is_first_week = False
-            last = max(
-                project_reports,
-                key=lambda r: datetime.strptime(r["period_end"], "%Y-%m-%d")
-            )
-            expected_start = datetime.strptime(
-                last["period_end"], "%Y-%m-%d"
-            ) + timedelta(days=1)
+            expected_start = self.last_period_end(pid) + timedelta(days=1)
 
         # ===== XỬ LÝ THỜI GIAN =====
         if is_first_week:
@@ -98,7 +113,7 @@ class WeeklyReportManager:
         )
 
         # ===== SINH MÃ BÁO CÁO TỰ ĐỘNG =====
-        week_no = len(project_reports) + 1
+        week_no = self.next_week_no(pid)
         rid = f"WR{pid}_W{week_no:02d}"
         print(f"Mã báo cáo tự động: {rid}")
 
@@ -116,7 +131,7 @@ class WeeklyReportManager:
 
         report.display()
         if input("Xác nhận lưu báo cáo? (y/n): ").lower() == "y":
-            report.save()
+            self._save_report(report)
             print("Lưu báo cáo thành công.")
         else:
             print("Đã hủy.")
@@ -130,8 +145,7 @@ class WeeklyReportManager:
             if rid.lower() == "exit":
                 return
 
-            rows = BaseReport.search_item(self.filename, rid)
-            row = next((r for r in rows if r["report_id"] == rid), None)
+            row = self._find_report(rid)
             if not row:
                 print("Không tìm thấy. Nhập lại.")
                 continue
@@ -143,6 +157,9 @@ class WeeklyReportManager:
             e_date = datetime.strptime(row["period_end"], "%Y-%m-%d")
             c_date = datetime.strptime(row["created_date"], "%Y-%m-%d %H:%M:%S")
 
+            # Hiện đúng số liệu đã lưu lúc lập báo cáo
+            stats = (int(row["total_tasks"]), int(row["completed_tasks"]), int(row["overdue_tasks"]))
+
             report = WeeklyReport(
                 wreport_id=rid,
                 project=project,
@@ -151,7 +168,8 @@ class WeeklyReportManager:
                 report_date=c_date,
                 period_start_date=s_date,
                 period_end_date=e_date,
-                is_loading=True
+                is_loading=True,
+                stats=stats
             )
 
             report.display()
@@ -159,7 +177,7 @@ class WeeklyReportManager:
 
     # ================= 3. HIỂN THỊ DANH SÁCH =================
     def display_all(self):
-        data = BaseReport.load_from_csv(self.filename)
+        data = self._load_all()
         if not data:
             print("Danh sách báo cáo trống.")
             return
@@ -187,7 +205,7 @@ class WeeklyReportManager:
                 continue
             # --- THỰC HIỆN TÌM KIẾM ---
             # Nếu nhập đúng định dạng thì mới bắt đầu tìm trong file
-            results = BaseReport.search_item(self.filename, keyword)
+            results = self._search(keyword)
             if not results:
                 print(f" Không tìm thấy dữ liệu nào khớp với mã '{keyword}'.")
             else:
@@ -213,8 +231,7 @@ class WeeklyReportManager:
                 continue
 
             # kiểm tra tồn tại trong file
-            results = BaseReport.search_item(self.filename, rid)
-            if not results:
+            if not self._find_report(rid):
                 print(f"Không tìm thấy báo cáo '{rid}'.")
                 continue
 
@@ -223,13 +240,264 @@ class WeeklyReportManager:
                 print("Đã hủy xóa.")
                 return
 
-            if BaseReport.delete_item(self.filename, rid):
+            if self._delete_report(rid):
                 print("Đã xóa báo cáo thành công.")
             else:
                 print("Không thể xóa báo cáo.")
             return
 
 
+    # ================= 7. TẠO HÀNG LOẠT =================
+    def backfill_reports(self, project_manager, staff_manager, task_manager):
+        print("\n--- TẠO BÁO CÁO TUẦN CÒN THIẾU ---")
+
+        while True:
+            d_str = input("Tạo đến ngày (dd/mm/yyyy, Enter = hôm nay): ").strip()
+            if not d_str:
+                until_date = datetime.now()
+                break
+            try:
+                until_date = datetime.strptime(d_str, "%d/%m/%Y")
+                break
+            except ValueError:
+                print("Sai định dạng ngày.")
+
+        ids = input("Mã dự án, cách nhau bởi dấu phẩy (Enter = tất cả): ").strip()
+        project_ids = [x.strip() for x in ids.split(",") if x.strip()] or None
+
+        reports, skipped = self.generate_missing_reports(
+            project_manager, staff_manager, task_manager, until_date, project_ids
+        )
+
+        for pid in skipped:
+            print(f"Bỏ qua {pid}: PM của dự án không hợp lệ.")
+        projects = {r.p_id for r in reports}
+        print(f"Đã tạo {len(reports)} báo cáo cho {len(projects)} dự án.")
+
+    def missing_periods(self, project, until_date):
+        """
+        Các kỳ báo cáo còn thiếu của dự án, chỉ lấy các tuần đã kết thúc trước until_date:
+        - Tuần 1: từ ngày bắt đầu dự án đến Chủ nhật cùng tuần
+        - Các tuần sau: 7 ngày liên tiếp, không vượt ngày kết thúc dự kiến
+        """
+        if not project.start_date or not project.expected_end_date:
+            return []
+
+        last_end = self.last_period_end(project.project_id)
+        if last_end is None:
+            s_date = project.start_date
+            e_date = s_date + timedelta(days=6 - s_date.weekday())
+        else:
+            s_date = last_end + timedelta(days=1)
+            e_date = s_date + timedelta(days=6)
+
+        periods = []
+        while True:
+            e_date = min(e_date, project.expected_end_date)
+            if s_date > e_date or e_date > until_date:
+                break
+            periods.append((s_date, e_date))
+            s_date = e_date + timedelta(days=1)
+            e_date = s_date + timedelta(days=6)
+        return periods
+
+    def generate_missing_reports(
+        self, project_manager, staff_manager, task_manager,
+        until_date=None, project_ids=None, workers=None
+    ):
+        """
+        Tạo (không hỏi) mọi báo cáo tuần còn thiếu đến until_date
+        cho tất cả dự án hoặc các dự án trong project_ids.
+        Thống kê mỗi dự án tính trong 1 lần duyệt task, toàn bộ dòng mới ghi 1 lần.
+        workers > 1: thống kê các dự án tính song song ở nhiều tiến trình.
+        Trả về (danh sách báo cáo mới, các dự án bị bỏ qua vì PM không hợp lệ)
+        """
+        until_date = until_date or datetime.now()
+        if project_ids is None:
+            projects = project_manager.items
+        else:
+            projects = [project_manager.find_by_id(pid) for pid in project_ids]
+
+        jobs, skipped = [], []
+        for project in projects:
+            if project is None:
+                continue
+            periods = self.missing_periods(project, until_date)
+            if not periods:
+                continue
+
+            author = staff_manager.find_by_id(project.pm_id)
+            if getattr(author, "management_title", "") != "Project Manager":
+                skipped.append(project.project_id)
+                continue
+            jobs.append((project, author, periods))
+
+        created = datetime.now()
+        # Mọi dự án thống kê trên cùng 1 snapshot task
+        all_stats = self._compute_period_stats(jobs, task_manager.snapshot(), workers or self.workers)
+        reports = []
+        for (project, author, periods), stats in zip(jobs, all_stats):
+            pid = project.project_id
+            week_no = self.next_week_no(pid) - 1
+            for (s_date, e_date), period_stats in zip(periods, stats):
+                week_no += 1
+                reports.append(WeeklyReport(
+                    wreport_id=f"WR{pid}_W{week_no:02d}",
+                    project=project,
+                    author=author,
+                    task_manager=task_manager,
+                    report_date=created,
+                    period_start_date=s_date,
+                    period_end_date=e_date,
+                    stats=period_stats
+                ))
+
+        self._save_reports(reports)
+        return reports, skipped
+
+    def _compute_period_stats(self, jobs, task_manager, workers):
+        """Thống kê các kỳ của từng job, kết quả theo đúng thứ tự jobs"""
+        if workers > 1 and len(jobs) > 1:
+            # Mỗi tiến trình chỉ nhận task của dự án nó tính, không gửi cả TaskManager
+            payload = [
+                (
+                    [
+                        (t.start_date, t.deadline, t.status_task, t.completed_date)
+                        for t in task_manager.tasks_of_project(project.project_id)
+                    ],
+                    periods,
+                )
+                for project, _, periods in jobs
+            ]
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    # map trả kết quả theo thứ tự đầu vào -> báo cáo luôn cùng thứ tự
+                    return list(executor.map(
+                        _project_period_stats, payload,
+                        chunksize=max(1, len(payload) // (workers * 4))
+                    ))
+            except (OSError, BrokenProcessPool):
+                print("Không tạo được tiến trình con, chuyển sang chạy tuần tự.")
+
+        # Chỉ dùng mảng NumPy đã dựng sẵn (dựng mới chậm hơn tự duyệt task),
+        # và chỉ cho dự án nhiều task (dự án ít task: duyệt thẳng nhanh hơn chi phí gọi NumPy)
+        analytics = task_manager.analytics(build=False)
+        large = {
+            project.project_id for project, _, _ in jobs
+            if task_manager.count_of_project(project.project_id) >= ANALYTICS_MIN_TASKS
+        }
+        return [
+            analytics.period_stats(project.project_id, periods)
+            if analytics is not None and project.project_id in large
+            else WeeklyReport.compute_stats_batch(task_manager.tasks_of_project(project.project_id), periods)
+            for project, _, periods in jobs
+        ]
+
+    # ================= 6. NÉN FILE =================
+    def compact_file(self):
+        """Ghi lại file báo cáo, bỏ các dòng đã bị sửa/xóa"""
+        if self.store:
+            print("Dữ liệu lưu trong SQLite, không cần nén.")
+            return
+        n = BaseReport.compact(self.filename, WeeklyReport.csv_fields())
+        print(f"Đã nén file báo cáo ({n} báo cáo).")
+
+    # ================= CHỈ MỤC THEO DỰ ÁN =================
+    def _project_index(self):
+        if self._by_project is None:
+            self._by_project = {}
+            self._project_of = {}
+            for r in self._load_all():
+                self._index_report(
+                    r["report_id"], r["project_id"],
+                    datetime.strptime(r["period_end"], "%Y-%m-%d")
+                )
+        return self._by_project
+
+    def _index_report(self, rid, pid, period_end):
+        if rid in self._project_of:
+            self._unindex_report(rid)
+        insort(self._by_project.setdefault(pid, []), (period_end, rid))
+        self._project_of[rid] = pid
+
+    def _unindex_report(self, rid):
+        pid = self._project_of.pop(rid, None)
+        entries = self._by_project.get(pid, [])
+        for i, (_, report_id) in enumerate(entries):
+            if report_id == rid:
+                del entries[i]
+                break
+        if not entries:
+            self._by_project.pop(pid, None)
+
+    def report_count(self, pid):
+        return len(self._project_index().get(pid, ()))
+
+    def last_period_end(self, pid):
+        entries = self._project_index().get(pid)
+        return entries[-1][0] if entries else None
+
+    def next_week_no(self, pid):
+        """
+        Số tuần của báo cáo tiếp theo = số tuần trong mã báo cáo cuối cùng + 1
+        (không dùng số báo cáo: xóa 1 tuần ở giữa sẽ sinh lại mã đã có)
+        """
+        entries = self._project_index().get(pid)
+        if not entries:
+            return 1
+        match = re.search(r"_W(\d+)$", entries[-1][1])
+        return int(match.group(1)) + 1 if match else len(entries) + 1
+
+    def report_ids(self, pid):
+        """Mã các báo cáo của dự án theo thứ tự tuần"""
+        return [rid for _, rid in self._project_index().get(pid, ())]
+
+    # ================= LƯU TRỮ =================
+    def _load_all(self):
+        if self.store:
+            return self.store.load()
+        return BaseReport.load_from_csv(self.filename)
+
+    def _find_report(self, rid):
+        if self.store:
+            return next(iter(self.store.find(report_id=rid)), None)
+        rows = BaseReport.search_item(self.filename, rid)
+        return next((r for r in rows if r["report_id"] == rid), None)
+
+    def _search(self, keyword):
+        if self.store:
+            keyword = keyword.lower()
+            return [
+                r for r in self.store.load()
+                if keyword in r["report_id"].lower() or keyword in r["project_id"].lower()
+            ]
+        return BaseReport.search_item(self.filename, keyword)
+
+    def _save_report(self, report):
+        self._save_reports([report])
+
+    def _save_reports(self, reports):
+        """Ghi các báo cáo mới trong 1 lần (1 lần ghi nối file / 1 transaction)"""
+        if not reports:
+            return
+        if self.store:
+            self.store.apply([("put", r.report_id, r.as_dict()) for r in reports])
+        else:
+            BaseReport.append_rows(self.filename, [r.as_dict() for r in reports])
+        if self._by_project is not None:
+            for r in reports:
+                self._index_report(r.report_id, r.p_id, r.period_end_date)
+
+    def _delete_report(self, rid):
+        if self.store:
+            self.store.delete(rid)
+            deleted = True
+        else:
+            deleted = BaseReport.delete_item(self.filename, rid)
+        if deleted and self._by_project is not None:
+            self._unindex_report(rid)
+        return deleted
+
     # ================= HÀM PHỤ IN BẢNG =================
     def _display_table(self, data):
         print(
@@ -1,8 +1,12 @@
+from collections import Counter
+
+
 class Progress:
-    def __init__(self, project_list, all_tasks):
+    def __init__(self, project_list, all_tasks=None, task_manager=None):
         """
         project_list: danh sách tất cả Project
         all_tasks: danh sách tất cả Task object
+        task_manager: nếu có thì lấy task theo chỉ mục dự án, không cần all_tasks
         """
         # Nhập mã dự án
         while True:
@@ -23,11 +27,21 @@ class Progress:
             self.pid = pid # Lưu lại pid đã nhập để dùng về sau
             break
 
-        self.tasks = [t for t in all_tasks if t.project_id == self.pid]
+        # Số task theo trạng thái: lấy từ bộ đếm của TaskManager nếu có
+        if task_manager is not None:
+            self.tasks = task_manager.tasks_of_project(self.pid)
+            self.status_counts = task_manager.status_counts(self.pid)
+        else:
+            self.tasks = [t for t in all_tasks if t.project_id == self.pid]
+            self.status_counts = Counter(t.status_task for t in self.tasks)
 
     # Tổng số task (bỏ qua task Cancelled)
     def total_tasks(self):
-        return len([t for t in self.tasks if t.status_task != "Cancelled"])
+        return sum(self.status_counts.values()) - self.count_by_status("Cancelled")
+
+    # Số task theo trạng thái
+    def count_by_status(self, status):
+        return self.status_counts.get(status, 0)
 
     # Task theo trạng thái (bỏ qua Cancelled khi tính tổng)
     def tasks_by_status(self, status):
@@ -40,16 +54,16 @@ class Progress:
         total = self.total_tasks()
         if total == 0:
             return 0
-        completed = len(self.tasks_by_status("Completed"))
+        completed = self.count_by_status("Completed")
         return round((completed / total) * 100, 2)
 
     # Hiển thị bảng tổng quan và chi tiết task
     def display_summary_with_tasks(self):
         total = self.total_tasks()
-        completed = len(self.tasks_by_status("Completed"))
-        in_progress = len(self.tasks_by_status("In Progress"))
-        todo = len(self.tasks_by_status("To Do"))
-        cancelled = len(self.tasks_by_status("Cancelled"))
+        completed = self.count_by_status("Completed")
+        in_progress = self.count_by_status("In Progress")
+        todo = self.count_by_status("To Do")
+        cancelled = self.count_by_status("Cancelled")
 
         p_name = getattr(self.project, 'project_name', getattr(self.project, 'name', 'Unknown'))
         p_id = getattr(self.project, 'project_id', getattr(self.project, 'id', self.pid))
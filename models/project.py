@@ -219,14 +219,16 @@ class Project(ProjectItem):
 
     # ================= AUTO STATUS =================
     def auto_update_status(self, task_manager):
-        tasks = [t for t in task_manager.items if t.project_id == self.project_id]
+        # Đọc bộ đếm trạng thái của TaskManager, không duyệt lại các task
+        total = task_manager.count_of_project(self.project_id)
 
-        if not tasks:
+        if not total:
             self.status_project = "Chưa khởi động"
             self.actual_end_date = None
             return
 
-        all_completed = all(t.status_task == "Completed" for t in tasks)
+        counts = task_manager.status_counts(self.project_id)
+        all_completed = counts.get("Completed", 0) == total
 
         if all_completed:
             self.status_project = "Hoàn thành"
@@ -116,6 +116,9 @@ class Task(ProjectItem):
                 if project and project.start_date and s_date < project.start_date:
                     print(f"Ngày bắt đầu task phải ≥ ngày bắt đầu dự án ({project.start_date.strftime('%d/%m/%Y')})")
                     continue
+                if project and project.expected_end_date and s_date > project.expected_end_date:
+                    print(f"Ngày bắt đầu task phải ≤ ngày kết thúc dự án ({project.expected_end_date.strftime('%d/%m/%Y')})")
+                    continue
                 self.start_date = s_date
                 break
             except ValueError:
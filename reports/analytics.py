@@ -0,0 +1,157 @@
+from datetime import datetime
+import numpy as np
+from models.task import Task
+
+# Mã số trạng thái task (trạng thái lạ -> -1)
+STATUS_CODES = {s: i for i, s in enumerate(Task.STATUS_LIST)}
+TODO, IN_PROGRESS, COMPLETED, CANCELLED = (
+    STATUS_CODES[s] for s in ("To Do", "In Progress", "Completed", "Cancelled")
+)
+
+
+def _to_datetime64(values):
+    # None -> NaT (mọi phép so sánh với NaT đều False)
+    return np.array(
+        [np.datetime64(v, "us") if v else np.datetime64("NaT", "us") for v in values],
+        dtype="datetime64[us]"
+    )
+
+
+def _as_datetime64(d):
+    return np.datetime64(d, "us")
+
+
+class TaskAnalytics:
+    """Thống kê task trên mảng NumPy, kết quả giống các vòng lặp trong FinalReport/WeeklyReport/Progress"""
+
+    def __init__(self, tasks):
+        tasks = list(tasks)
+        self.task_ids = [t.id for t in tasks]
+
+        projects, self.project_codes = np.unique(
+            np.array([t.project_id for t in tasks], dtype=str), return_inverse=True
+        )
+        self.project_list = [str(p) for p in projects]
+        self._project_index = {pid: i for i, pid in enumerate(self.project_list)}
+
+        self.status = np.array(
+            [STATUS_CODES.get(t.status_task, -1) for t in tasks], dtype=np.int8
+        )
+        self.start = _to_datetime64(t.start_date for t in tasks)
+        self.deadline = _to_datetime64(t.deadline for t in tasks)
+        self.completed = _to_datetime64(t.completed_date for t in tasks)
+        # Thứ tự task theo dự án, dựng khi cần (period_stats)
+        self._order = self._bounds = None
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    # ================= THEO DỰ ÁN =================
+    def _count_by_project(self, mask):
+        return np.bincount(
+            self.project_codes[mask], minlength=len(self.project_list)
+        )
+
+    def project_summary(self, project_id=None, now=None):
+        """
+        Số task theo dự án:
+        total, to_do, in_progress, completed, cancelled,
+        overdue (chưa đóng, deadline < now), late (hoàn thành sau deadline)
+        project_id = None -> dict project_id -> thống kê của mọi dự án
+        """
+        now = _as_datetime64(now or datetime.now())
+        is_open = (self.status != COMPLETED) & (self.status != CANCELLED)
+
+        columns = {
+            "total": np.ones(len(self), dtype=bool),
+            "to_do": self.status == TODO,
+            "in_progress": self.status == IN_PROGRESS,
+            "completed": self.status == COMPLETED,
+            "cancelled": self.status == CANCELLED,
+            "overdue": is_open & (self.deadline < now),
+            # Giống FinalReport: có deadline và ngày hoàn thành, hoàn thành trễ
+            "late": self.completed > self.deadline,
+        }
+        counts = {name: self._count_by_project(mask) for name, mask in columns.items()}
+
+        def row(i):
+            return {name: int(c[i]) for name, c in counts.items()}
+
+        if project_id is not None:
+            i = self._project_index.get(project_id)
+            return row(i) if i is not None else dict.fromkeys(columns, 0)
+        return {pid: row(i) for i, pid in enumerate(self.project_list)}
+
+    # ================= THEO KỲ BÁO CÁO =================
+    def _rows_of(self, i):
+        """Vị trí các task của dự án mã số i (sắp xếp theo dự án 1 lần, dùng lại)"""
+        if self._bounds is None:
+            self._order = np.argsort(self.project_codes, kind="stable")
+            self._bounds = np.searchsorted(
+                self.project_codes[self._order], np.arange(len(self.project_list) + 1)
+            )
+        return self._order[self._bounds[i]:self._bounds[i + 1]]
+
+    def period_stats(self, project_id, periods):
+        """(tổng CV, hoàn thành, quá hạn) cho từng kỳ [(start, end)] tăng dần, không chồng nhau"""
+        i = self._project_index.get(project_id)
+        if i is None or not periods:
+            return [(0, 0, 0)] * len(periods)
+
+        rows = self._rows_of(i)
+        status, s = self.status[rows], self.start[rows]
+        d, c = self.deadline[rows], self.completed[rows]
+        n = len(periods)
+        starts = np.array([p[0] for p in periods], dtype="datetime64[us]")
+        ends = np.array([p[1] for p in periods], dtype="datetime64[us]")
+
+        # Task có đủ ngày, start <= deadline: các kỳ giao với [start, deadline] là dãy [lo, hi]
+        regular = ~np.isnat(s) & ~np.isnat(d) & (s <= d)
+        status_r, d_r, c_r = status[regular], d[regular], c[regular]
+        lo = np.searchsorted(ends, s[regular], side="left")
+        hi = np.searchsorted(starts, d_r, side="right") - 1
+        hit = lo <= hi
+
+        def add_ranges(mask, first, last):
+            # +1 cho mọi kỳ trong [first, last] của các task trong mask
+            diff = (
+                np.bincount(first[mask], minlength=n + 1)
+                - np.bincount(last[mask] + 1, minlength=n + 1)
+            )
+            return np.cumsum(diff[:n])
+
+        total = add_ranges(hit & (status_r != CANCELLED), lo, hi)
+
+        # Hoàn thành: kỳ chứa completed_date, nằm trong dãy [lo, hi]
+        k = np.searchsorted(starts, c_r, side="right") - 1
+        done = hit & (status_r == COMPLETED) & ~np.isnat(c_r) & (k >= lo) & (k <= hi)
+        done &= c_r <= ends[np.clip(k, 0, n - 1)]
+        completed = np.bincount(k[done], minlength=n)[:n]
+
+        # Quá hạn: các kỳ có period_end > deadline trong dãy [lo, hi]
+        first_late = np.maximum(lo, np.searchsorted(ends, d_r, side="right"))
+        is_open = (status_r != COMPLETED) & (status_r != CANCELLED)
+        overdue = add_ranges(hit & is_open & (first_late <= hi), first_late, hi)
+
+        # Task thiếu ngày / ngày ngược (hiếm): so từng kỳ như compute_stats
+        odd = ~regular
+        if odd.any():
+            st, so, do, co = status[odd][:, None], s[odd][:, None], d[odd][:, None], c[odd][:, None]
+            ps, pe = starts[None, :], ends[None, :]
+            in_period = (
+                ((ps <= so) & (so <= pe))
+                | ((ps <= do) & (do <= pe))
+                | ((so < ps) & (do > pe))
+            )
+            total = total + (in_period & (st != CANCELLED)).sum(axis=0)
+            completed = completed + (
+                in_period & (st == COMPLETED) & (ps <= co) & (co <= pe)
+            ).sum(axis=0)
+            overdue = overdue + (
+                in_period & (do < pe) & (st != COMPLETED) & (st != CANCELLED)
+            ).sum(axis=0)
+
+        return [
+            (int(t), int(cp), int(od))
+            for t, cp, od in zip(total, completed, overdue)
+        ]
@@ -22,14 +22,27 @@ class BaseReport(ABC):
         }
 
     # ================= CSV =================
+    # File báo cáo chỉ ghi nối (append):
+    # - Dòng mới / dòng sửa: ghi nguyên dòng, dòng sau đè dòng trước cùng report_id
+    # - Dòng xóa: chỉ có report_id và row_op = "delete"
+    # Khi đọc sẽ gộp lại; compact() mới ghi lại cả file.
+    OP_FIELD = "row_op"
+
     @staticmethod
     def load_from_csv(filename):
-        """Đọc CSV và trả về danh sách dict"""
+        """Đọc CSV, gộp các dòng sửa/xóa và trả về danh sách dict"""
         if not os.path.exists(filename):
             return []
+        rows = {}
         with open(filename, mode="r", newline="", encoding="utf-8") as file:
             reader = csv.DictReader(file)
-            return list(reader)
+            for row in reader:
+                op = row.pop(BaseReport.OP_FIELD, "")
+                if op == "delete":
+                    rows.pop(row["report_id"], None)
+                else:
+                    rows[row["report_id"]] = row
+        return list(rows.values())
 
     @staticmethod
     def save_to_csv(filename, data_list):
@@ -41,30 +54,86 @@ class BaseReport(ABC):
             writer.writeheader()
             writer.writerows(data_list)
 
+    @staticmethod
+    def _read_header(filename):
+        if not os.path.exists(filename):
+            return None
+        with open(filename, mode="r", newline="", encoding="utf-8") as file:
+            return next(csv.reader(file), None)
+
+    @staticmethod
+    def append_rows(filename, data_list, op=""):
+        """Ghi nối các dòng vào cuối file (không đọc lại toàn bộ file)"""
+        if not data_list:
+            return
+        fieldnames = list(data_list[0].keys())
+        header = BaseReport._read_header(filename)
+
+        if not header:
+            header = fieldnames + [BaseReport.OP_FIELD]
+            with open(filename, mode="w", newline="", encoding="utf-8") as file:
+                csv.writer(file).writerow(header)
+        elif (op and BaseReport.OP_FIELD not in header) or not set(fieldnames) <= set(header):
+            # File cũ chưa có cột row_op / thiếu cột -> gộp lại 1 lần với header mới
+            header = (
+                [h for h in header if h != BaseReport.OP_FIELD]
+                + [f for f in fieldnames if f not in header]
+                + [BaseReport.OP_FIELD]
+            )
+            BaseReport.compact(filename, header)
+
+        with open(filename, mode="rb") as file:
+            file.seek(-1, os.SEEK_END)
+            missing_newline = file.read(1) != b"\n"
+
+        with open(filename, mode="a", newline="", encoding="utf-8") as file:
+            if missing_newline:
+                file.write("\n")
+            writer = csv.DictWriter(file, fieldnames=header, restval="")
+            for row in data_list:
+                if BaseReport.OP_FIELD in header:
+                    row = dict(row, **{BaseReport.OP_FIELD: op})
+                writer.writerow(row)
+
+    @staticmethod
+    def compact(filename, fieldnames=None):
+        """Ghi lại file chỉ còn các dòng hiện hành (bỏ dòng đã bị sửa/xóa)"""
+        data = BaseReport.load_from_csv(filename)
+        header = fieldnames or BaseReport._read_header(filename)
+        if not header:
+            return 0
+        if BaseReport.OP_FIELD not in header:
+            header = header + [BaseReport.OP_FIELD]
+        tmp = filename + ".tmp"
+        with open(tmp, mode="w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=header, restval="", extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(data)
+        os.replace(tmp, filename)
+        return len(data)
+
     # ================= CÁC PHƯƠNG THỨC =================
     def add_item(self, filename):
-        data = BaseReport.load_from_csv(filename)
-        data.append(self.as_dict())
-        BaseReport.save_to_csv(filename, data)
+        BaseReport.append_rows(filename, [self.as_dict()])
         return True
 
     @staticmethod
     def update_item(filename, report_id, new_data):
-        data = BaseReport.load_from_csv(filename)
-        updated = False
-        for row in data:
-            if row["report_id"] == report_id:
-                row.update({k: v for k, v in new_data.items() if k in row})
-                updated = True
-                break
-        BaseReport.save_to_csv(filename, data)
-        return updated
+        row = next(
+            (r for r in BaseReport.load_from_csv(filename) if r["report_id"] == report_id),
+            None
+        )
+        if not row:
+            return False
+        row.update({k: v for k, v in new_data.items() if k in row})
+        BaseReport.append_rows(filename, [row], op="update")
+        return True
 
     @staticmethod
     def delete_item(filename, report_id):
-        data = BaseReport.load_from_csv(filename)
-        new_data = [r for r in data if r["report_id"] != report_id]
-        BaseReport.save_to_csv(filename, new_data)
+        if not os.path.exists(filename):
+            return True
+        BaseReport.append_rows(filename, [{"report_id": report_id}], op="delete")
         return True
 
     @staticmethod
@@ -75,17 +75,27 @@ class FinalReport(BaseReport):
 
         self._validate_report_date()
 
-        tasks = [t for t in task_manager.task_list if t.project_id == self.project_id]
+        # Số liệu lấy từ 1 snapshot, nhất quán dù task đang bị sửa
+        task_manager = task_manager.snapshot()
+        analytics = task_manager.analytics()
+        if analytics is not None:
+            summary = analytics.project_summary(self.project_id)
+            self.total_tasks = summary["total"]
+            self.completed_tasks = summary["completed"]
+            self.cancelled_tasks = summary["cancelled"]
+            self.overdue_tasks = summary["late"]
+        else:
+            tasks = task_manager.tasks_of_project(self.project_id)
 
-        self.total_tasks = len(tasks)
-        self.completed_tasks = len([t for t in tasks if t.status_task == "Completed"])
-        self.cancelled_tasks = len([t for t in tasks if t.status_task == "Cancelled"])
+            self.total_tasks = len(tasks)
+            self.completed_tasks = len([t for t in tasks if t.status_task == "Completed"])
+            self.cancelled_tasks = len([t for t in tasks if t.status_task == "Cancelled"])
 
-        self.overdue_tasks = 0
-        for t in tasks:
-            if t.deadline and t.completed_date:
-                if self._parse_date(t.completed_date) > self._parse_date(t.deadline):
-                    self.overdue_tasks += 1
+            self.overdue_tasks = 0
+            for t in tasks:
+                if t.deadline and t.completed_date:
+                    if self._parse_date(t.completed_date) > self._parse_date(t.deadline):
+                        self.overdue_tasks += 1
 
         self.ontime_tasks = max(0, self.completed_tasks - self.overdue_tasks)
 
@@ -0,0 +1,243 @@
+import random
+from datetime import datetime, timedelta
+
+OPEN_STATUSES = ("To Do", "In Progress")
+CLOSED_PROJECT_STATUSES = ("Hoàn thành", "Hủy")
+
+# Giới hạn số phần tử ma trận mô phỏng mỗi lần (số lần mô phỏng x số task)
+MAX_CELLS = 4_000_000
+
+
+class ForecastReport:
+    """
+    Dự báo ngày hoàn thành (P50 / P90) các dự án đang mở bằng mô phỏng Monte Carlo
+    trên thời lượng các task đã hoàn thành
+    """
+
+    def __init__(self, project_manager, task_manager, staff_manager,
+                 simulations=2000, now=None, seed=None):
+        self.now = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.simulations = simulations
+        self.seed = seed
+        self.staff_manager = staff_manager
+        task_manager = task_manager.snapshot()
+        self.pools = self._duration_pools(task_manager)
+
+        projects = [
+            p for p in project_manager.items
+            if p.status_project not in CLOSED_PROJECT_STATUSES
+        ]
+        self.rows = self._forecast(projects, task_manager)
+
+    # ================= DỮ LIỆU LỊCH SỬ =================
+    def _role_of(self, task):
+        staff = self.staff_manager.find_by_id(task.assignee_id) if self.staff_manager else None
+        return staff.role if staff else None
+
+    def _duration_pools(self, task_manager):
+        """(priority, role) / (priority, None) / (None, None) -> [thời lượng (ngày)]"""
+        pools = {}
+        for t in task_manager.items:
+            if t.status_task != "Completed" or not t.start_date or not t.completed_date:
+                continue
+            days = (t.completed_date - t.start_date).days
+            if days < 0:
+                continue
+            for key in ((t.priority, self._role_of(t)), (t.priority, None), (None, None)):
+                pools.setdefault(key, []).append(days)
+        return pools
+
+    def _pool_for(self, task):
+        for key in ((task.priority, self._role_of(task)), (task.priority, None), (None, None)):
+            if key in self.pools:
+                return key
+        return None
+
+    # ================= CHUẨN BỊ =================
+    def _lanes(self, project, task_manager):
+        """
+        Các luồng công việc của dự án: [(độ trễ bắt đầu, [(pool, ngày đã làm, tối thiểu)])]
+        Mỗi nhân viên 1 luồng làm tuần tự, task chưa giao là 1 luồng riêng
+        """
+        lanes = {}
+        for t in task_manager.tasks_of_project(project.project_id):
+            if t.status_task not in OPEN_STATUSES:
+                continue
+            assignee = (t.assignee_id or "").strip()
+            lane_key = assignee if self.staff_manager and self.staff_manager.find_by_id(assignee) else t.id
+
+            elapsed, minimum, wait = 0, 0, 0
+            if t.start_date:
+                if t.status_task == "In Progress":
+                    # Đã làm được 1 phần: còn lại ít nhất 1 ngày
+                    elapsed, minimum = max((self.now - t.start_date).days, 0), 1
+                else:
+                    wait = max((t.start_date - self.now).days, 0)
+
+            pool = self._pool_for(t)
+            if pool is None:
+                # Chưa có lịch sử: dùng thời lượng kế hoạch
+                planned = 0
+                if t.start_date and t.deadline and t.deadline >= t.start_date:
+                    planned = (t.deadline - t.start_date).days
+                pool = ("planned", planned)
+                self.pools.setdefault(pool, [planned])
+
+            lane = lanes.setdefault(lane_key, [None, []])
+            lane[0] = wait if lane[0] is None else min(lane[0], wait)
+            lane[1].append((pool, elapsed, minimum))
+        return list(lanes.values())
+
+    # ================= MÔ PHỎNG =================
+    def _forecast(self, projects, task_manager):
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        plans = [(p, self._lanes(p, task_manager)) for p in projects]
+        if np is not None:
+            self._rng, simulate = np.random.default_rng(self.seed), self._simulate_numpy
+        else:
+            self._rng, simulate = random.Random(self.seed), self._simulate_python
+
+        rows, batch, cells = [], [], 0
+        for plan in plans:
+            size = sum(len(tasks) for _, tasks in plan[1]) * self.simulations
+            if batch and cells + size > MAX_CELLS:
+                rows.extend(simulate(batch))
+                batch, cells = [], 0
+            batch.append(plan)
+            cells += size
+        if batch:
+            rows.extend(simulate(batch))
+        return rows
+
+    def _simulate_numpy(self, plans):
+        import numpy as np
+
+        keys = list(self.pools)
+        offsets, start = {}, 0
+        for k in keys:
+            offsets[k] = start
+            start += len(self.pools[k])
+        values = np.array([d for k in keys for d in self.pools[k]], dtype=np.int64)
+
+        # Task xếp liền nhau theo luồng, luồng xếp liền nhau theo dự án
+        offset, size, elapsed, minimum = [], [], [], []
+        lane_starts, lane_wait, project_starts = [], [], []
+        for _, lanes in plans:
+            if not lanes:
+                continue
+            project_starts.append(len(lane_starts))
+            for wait, tasks in lanes:
+                lane_starts.append(len(offset))
+                lane_wait.append(wait)
+                for pool, el, mn in tasks:
+                    offset.append(offsets[pool])
+                    size.append(len(self.pools[pool]))
+                    elapsed.append(el)
+                    minimum.append(mn)
+
+        stats = iter(())
+        if offset:
+            offset, size = np.array(offset), np.array(size)
+            elapsed, minimum, lane_wait = np.array(elapsed), np.array(minimum), np.array(lane_wait)
+            # 1 dự án rất nhiều task vẫn có thể vượt MAX_CELLS -> chia theo số lần mô phỏng
+            block = max(1, MAX_CELLS // len(offset))
+            parts = []
+            for done in range(0, self.simulations, block):
+                u = self._rng.random((min(block, self.simulations - done), len(offset)))
+                idx = offset + (u * size).astype(np.int64)
+                remaining = np.maximum(values[idx] - elapsed, minimum)
+                lane_total = np.add.reduceat(remaining, lane_starts, axis=1) + lane_wait
+                parts.append(np.maximum.reduceat(lane_total, project_starts, axis=1))
+            # finish[lần mô phỏng, dự án] = số ngày tới khi xong
+            finish = np.concatenate(parts)
+
+            p50, p90 = np.percentile(finish, [50, 90], axis=0)
+            limits = np.array([self._days_to_deadline(p) for p, lanes in plans if lanes])
+            on_time = (finish <= limits).mean(axis=0) * 100
+            stats = zip(p50.tolist(), p90.tolist(), on_time.tolist())
+
+        rows = []
+        for p, lanes in plans:
+            remaining = sum(len(tasks) for _, tasks in lanes)
+            p50, p90, on_time = next(stats) if lanes else (0, 0, 100.0)
+            rows.append(self._row(p, remaining, p50, p90, on_time))
+        return rows
+
+    def _simulate_python(self, plans):
+        rows = []
+        for p, lanes in plans:
+            finish = None
+            if lanes:
+                finish = []
+                for _ in range(self.simulations):
+                    finish.append(max(
+                        wait + sum(
+                            max(self._rng.choice(self.pools[pool]) - el, mn)
+                            for pool, el, mn in tasks
+                        )
+                        for wait, tasks in lanes
+                    ))
+            rows.append(self._row(p, sum(len(t) for _, t in lanes), *self._finish_stats(p, finish)))
+        return rows
+
+    # ================= KẾT QUẢ =================
+    @staticmethod
+    def _percentile(sorted_values, q):
+        # Cùng cách nội suy tuyến tính với numpy.percentile
+        pos = (len(sorted_values) - 1) * q / 100
+        lo = int(pos)
+        hi = min(lo + 1, len(sorted_values) - 1)
+        return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+    def _days_to_deadline(self, project):
+        # Không có ngày kết thúc dự kiến -> luôn "đúng hạn" (không hiển thị)
+        if not project.expected_end_date:
+            return float("inf")
+        return (project.expected_end_date - self.now).days
+
+    def _finish_stats(self, project, finish):
+        """finish: số ngày tới khi xong của từng lần mô phỏng (None = không còn task mở)"""
+        if finish is None:
+            return 0, 0, 100.0
+        finish = sorted(finish)
+        limit = self._days_to_deadline(project)
+        on_time = sum(1 for d in finish if d <= limit) / len(finish) * 100
+        return self._percentile(finish, 50), self._percentile(finish, 90), on_time
+
+    def _row(self, project, remaining, p50, p90, on_time):
+        return {
+            "project": project,
+            "remaining": remaining,
+            "p50": self.now + timedelta(days=round(p50)),
+            "p90": self.now + timedelta(days=round(p90)),
+            "on_time": round(on_time, 1) if project.expected_end_date else None,
+        }
+
+    # ================= HIỂN THỊ =================
+    def display(self):
+        if not self.rows:
+            print("Không có dự án đang mở.")
+            return
+
+        print("\n" + "=" * 110)
+        print(f"DỰ BÁO NGÀY HOÀN THÀNH ({self.simulations} lần mô phỏng)".center(110))
+        print("=" * 110)
+
+        lines = [
+            f"{'Mã DA':<10} | {'Tên dự án':<25} | {'Task mở':>7} | {'Dự kiến KT':<10} | "
+            f"{'P50':<10} | {'P90':<10} | {'Đúng hạn'}",
+            "-" * 110,
+        ]
+        for r in self.rows:
+            p = r["project"]
+            expected = p.expected_end_date.strftime("%d/%m/%Y") if p.expected_end_date else "--"
+            on_time = f"{r['on_time']}%" if r["on_time"] is not None else "--"
+            lines.append(
+                f"{p.project_id:<10} | {p.project_name[:25]:<25} | {r['remaining']:>7} | {expected:<10} | "
+                f"{r['p50'].strftime('%d/%m/%Y'):<10} | {r['p90'].strftime('%d/%m/%Y'):<10} | {on_time}"
+            )
+        print("\n".join(lines))
@@ -0,0 +1,135 @@
+from collections import Counter
+from datetime import datetime
+
+
+class PortfolioReport:
+    """
+    Báo cáo tổng quan tất cả dự án (1 bảng):
+    tiến độ %, số task quá hạn, số ngày còn lại, ngân sách, điểm rủi ro.
+    Số liệu task được gom theo dự án trong 1 lần duyệt (không quét lại cho từng dự án).
+    """
+
+    SORT_KEYS = {
+        "risk": (lambda r: r["risk"], True),
+        "progress": (lambda r: r["progress"], False),
+        "days_left": (lambda r: r["days_left"] if r["days_left"] is not None else float("inf"), False),
+        "budget": (lambda r: r["budget"], True),
+    }
+
+    CLOSED_STATUSES = ("Hoàn thành", "Hủy")
+
+    def __init__(self, project_manager, task_manager, now=None):
+        self.now = now or datetime.now()
+        summary = self._summarize_tasks(task_manager.snapshot())
+        self.rows = [
+            self._build_row(p, summary.get(p.project_id))
+            for p in project_manager.items
+        ]
+
+    # ================= GOM THEO DỰ ÁN =================
+    def _summarize_tasks(self, task_manager):
+        """project_id -> {"total", "completed", "cancelled", "overdue"}"""
+        analytics = task_manager.analytics()
+        if analytics is not None:
+            return analytics.project_summary(now=self.now)
+
+        # Không có numpy: 1 vòng lặp qua toàn bộ task
+        summary = {}
+        for t in task_manager.items:
+            counts = summary.get(t.project_id)
+            if counts is None:
+                counts = summary[t.project_id] = Counter()
+            counts["total"] += 1
+            if t.status_task == "Completed":
+                counts["completed"] += 1
+            elif t.status_task == "Cancelled":
+                counts["cancelled"] += 1
+            elif t.deadline and t.deadline < self.now:
+                counts["overdue"] += 1
+        return summary
+
+    def _build_row(self, project, counts):
+        counts = counts or {}
+        # Giống Progress: bỏ qua task Cancelled khi tính tiến độ
+        active = counts.get("total", 0) - counts.get("cancelled", 0)
+        completed = counts.get("completed", 0)
+        overdue = counts.get("overdue", 0)
+        progress = round(completed / active * 100, 2) if active else 0.0
+
+        days_left = None
+        if project.expected_end_date:
+            days_left = (project.expected_end_date - self.now).days
+
+        return {
+            "project": project,
+            "tasks": active,
+            "progress": progress,
+            "overdue": overdue,
+            "days_left": days_left,
+            "budget": project.budget,
+            "risk": self._risk_score(project, active, overdue, progress, days_left),
+        }
+
+    # ================= RỦI RO =================
+    def _risk_score(self, project, active, overdue, progress, days_left):
+        """
+        Điểm rủi ro 0 - 100:
+        - 50% theo tỉ lệ task quá hạn
+        - 50% theo mức chậm so với thời gian đã trôi qua
+        - Quá ngày kết thúc dự kiến mà chưa xong -> 100
+        """
+        if project.status_project in self.CLOSED_STATUSES:
+            return 0.0
+        if days_left is not None and days_left < 0 and progress < 100:
+            return 100.0
+
+        overdue_part = overdue / active * 100 if active else 0
+
+        elapsed = 0
+        if project.start_date and project.expected_end_date:
+            span = (project.expected_end_date - project.start_date).days
+            if span > 0:
+                passed = (self.now - project.start_date).days
+                elapsed = min(max(passed / span * 100, 0), 100)
+        behind = max(elapsed - progress, 0)
+
+        return round(overdue_part * 0.5 + behind * 0.5, 2)
+
+    @staticmethod
+    def risk_level(score):
+        if score >= 60:
+            return "Cao"
+        if score >= 30:
+            return "Trung bình"
+        return "Thấp"
+
+    # ================= HIỂN THỊ =================
+    def sorted_rows(self, sort_by="risk"):
+        key, reverse = self.SORT_KEYS[sort_by]
+        return sorted(self.rows, key=key, reverse=reverse)
+
+    def display(self, sort_by="risk"):
+        if not self.rows:
+            print("Chưa có dự án nào.")
+            return
+
+        print("\n" + "=" * 120)
+        print("TỔNG QUAN DANH MỤC DỰ ÁN".center(120))
+        print("=" * 120)
+
+        lines = [
+            f"{'Mã DA':<10} | {'Tên dự án':<25} | {'Trạng thái':<15} | {'Số CV':>5} | "
+            f"{'Tiến độ':>8} | {'Quá hạn':>7} | {'Còn (ngày)':>10} | {'Ngân sách':>15} | {'Rủi ro'}",
+            "-" * 120,
+        ]
+        for r in self.sorted_rows(sort_by):
+            p = r["project"]
+            days_left = r["days_left"] if r["days_left"] is not None else "--"
+            lines.append(
+                f"{p.project_id:<10} | {p.project_name[:25]:<25} | {p.status_project:<15} | "
+                f"{r['tasks']:>5} | {r['progress']:>7}% | {r['overdue']:>7} | "
+                f"{days_left:>10} | {r['budget']:>15,.0f} | "
+                f"{r['risk']:>6} ({self.risk_level(r['risk'])})"
+            )
+        # In 1 lần cho nhanh khi có hàng nghìn dự án
+        print("\n".join(lines))
@@ -1,5 +1,6 @@
+from bisect import bisect_left, bisect_right
 from reports.base_report import BaseReport
-from datetime import timedelta
+from managers.interval_index import overlaps_period
 
 
 class WeeklyReport(BaseReport):
@@ -14,7 +15,8 @@ class WeeklyReport(BaseReport):
         report_date,
         period_start_date,
         period_end_date,
-        is_loading=False
+        is_loading=False,
+        stats=None
     ):
         self.p_id = project.project_id
         if not is_loading:
@@ -32,46 +34,19 @@ class WeeklyReport(BaseReport):
         self.period_start_date = period_start_date
         self.period_end_date = period_end_date
 
-        self.project_tasks = [
-            t for t in task_manager.task_list if t.project_id == self.p_id
-        ]
-
-        self.task_list = [
-            t for t in self.project_tasks
-            if (
-                (t.start_date and self.period_start_date <= t.start_date <= self.period_end_date)
-                or
-                (t.deadline and self.period_start_date <= t.deadline <= self.period_end_date)
-                or
-                (
-                    t.start_date and t.deadline
-                    and t.start_date < self.period_start_date
-                    and t.deadline > self.period_end_date
-                )
+        if stats is None:
+            # Các task giao với kỳ báo cáo (tra cây khoảng của dự án),
+            # đọc trên snapshot để task bị sửa giữa chừng không làm lệch số liệu
+            tasks = task_manager.snapshot()
+            self.task_list = tasks.tasks_overlapping(
+                self.period_start_date, self.period_end_date, project_id=self.p_id
             )
-        ]
-
-        self.total_tasks_count = len(
-            [t for t in self.task_list if t.status_task != "Cancelled"]
-        )
-
-        self.completed_tasks_count = len(
-            [
-                t for t in self.task_list
-                if t.status_task == "Completed"
-                and t.completed_date
-                and self.period_start_date <= t.completed_date <= self.period_end_date
-            ]
-        )
-
-        self.overdue_tasks = [
-            t for t in self.task_list
-            if t.deadline
-            and t.deadline < self.period_end_date
-            and t.status_task not in ("Completed", "Cancelled")
-        ]
+            stats = self.compute_stats(self.task_list, period_start_date, period_end_date)
+        else:
+            # Thống kê đã tính sẵn (tạo hàng loạt)
+            self.task_list = None
 
-        self.overdue_tasks_count = len(self.overdue_tasks)
+        self.total_tasks_count, self.completed_tasks_count, self.overdue_tasks_count = stats
 
         self.actual_progress = (
             round(self.completed_tasks_count / self.total_tasks_count * 100, 2)
@@ -80,6 +55,78 @@ class WeeklyReport(BaseReport):
 
         self.progress_status = self._get_progress_status()
 
+    # ================= THỐNG KÊ =================
+    @staticmethod
+    def compute_stats(task_list, period_start, period_end):
+        """(tổng CV, hoàn thành trong kỳ, quá hạn) của các task thuộc kỳ"""
+        total = len([t for t in task_list if t.status_task != "Cancelled"])
+
+        completed = len([
+            t for t in task_list
+            if t.status_task == "Completed"
+            and t.completed_date
+            and period_start <= t.completed_date <= period_end
+        ])
+
+        overdue = len([
+            t for t in task_list
+            if t.deadline
+            and t.deadline < period_end
+            and t.status_task not in ("Completed", "Cancelled")
+        ])
+        return total, completed, overdue
+
+    @staticmethod
+    def compute_stats_batch(tasks, periods):
+        """
+        Thống kê nhiều kỳ liên tiếp của 1 dự án trong 1 lần duyệt task.
+        periods: [(start, end)] tăng dần, không chồng nhau.
+        Trả về [(tổng CV, hoàn thành, quá hạn)] theo thứ tự periods,
+        kết quả giống gọi compute_stats() cho từng kỳ.
+        """
+        n = len(periods)
+        starts = [ps for ps, _ in periods]
+        ends = [pe for _, pe in periods]
+        # Mảng hiệu: cộng 1 cho cả dãy kỳ [i, j] bằng 2 phép gán
+        total_diff = [0] * (n + 1)
+        overdue_diff = [0] * (n + 1)
+        completed = [0] * n
+
+        for t in tasks:
+            if t.start_date and t.deadline and t.start_date <= t.deadline:
+                # Các kỳ giao với [start_date, deadline] là 1 dãy liên tiếp [i, j]
+                segments = [(bisect_left(ends, t.start_date), bisect_right(starts, t.deadline) - 1)]
+            else:
+                # Task thiếu ngày/ngày ngược: xét từng kỳ như compute_stats
+                segments = [(k, k) for k in range(n) if overlaps_period(t, *periods[k])]
+
+            for i, j in segments:
+                if i > j:
+                    continue
+                if t.status_task != "Cancelled":
+                    total_diff[i] += 1
+                    total_diff[j + 1] -= 1
+
+                if t.status_task == "Completed":
+                    if t.completed_date:
+                        k = bisect_right(starts, t.completed_date) - 1
+                        if i <= k <= j and t.completed_date <= ends[k]:
+                            completed[k] += 1
+                elif t.status_task != "Cancelled" and t.deadline:
+                    # Quá hạn ở các kỳ có period_end > deadline
+                    k = max(i, bisect_right(ends, t.deadline))
+                    if k <= j:
+                        overdue_diff[k] += 1
+                        overdue_diff[j + 1] -= 1
+
+        result = []
+        total = overdue = 0
+        for k in range(n):
+            total += total_diff[k]
+            overdue += overdue_diff[k]
+            result.append((total, completed[k], overdue))
+        return result
+
     def _validate_author(self, author):
         if getattr(author, "management_title", "") != "Project Manager":
             raise PermissionError("Chỉ Project Manager được tạo báo cáo tuần")
@@ -93,6 +140,14 @@ class WeeklyReport(BaseReport):
             return "At Risk"
         return "On Track"
 
+    @staticmethod
+    def csv_fields():
+        return [
+            "report_id", "project_id", "author_id", "created_date",
+            "period_start", "period_end", "total_tasks", "completed_tasks",
+            "overdue_tasks", "progress", "status",
+        ]
+
     def as_dict(self):
         data = super().as_dict()
         data.update({
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+# Trọng số theo độ ưu tiên của task
+PRIORITY_WEIGHTS = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+
+
+class WorkloadReport:
+    """
+    Khối lượng công việc của từng nhân viên theo tuần:
+    ô [nhân viên, tuần] = tổng trọng số ưu tiên của các task đang mở
+    (không Completed/Cancelled) có [start_date, deadline] giao với tuần đó.
+
+    Mỗi task chỉ ghi 2 điểm vào mảng hiệu (tuần đầu +w, sau tuần cuối -w),
+    cộng dồn theo hàng là ra cả ma trận -> không duyệt từng ô.
+    """
+
+    def __init__(self, staff_manager, task_manager, start_date=None, weeks=8):
+        start_date = start_date or datetime.now()
+        # Tuần bắt đầu từ thứ Hai
+        self.start = (start_date - timedelta(days=start_date.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.weeks = weeks
+        self.staff = list(staff_manager.staff_list)
+        self.matrix = self._build(task_manager.snapshot())
+
+    def week_start(self, k):
+        return self.start + timedelta(weeks=k)
+
+    # ================= TÍNH TOÁN =================
+    def _task_spans(self, task_manager, row_of):
+        """(hàng, tuần đầu, tuần cuối, trọng số) của các task đang mở thuộc khoảng tuần"""
+        spans = []
+        for t in task_manager.items:
+            if t.status_task in ("Completed", "Cancelled"):
+                continue
+            row = row_of.get((t.assignee_id or "").strip().upper())
+            if row is None:
+                continue
+            s = t.start_date or t.deadline
+            e = t.deadline or t.start_date
+            if not s or not e or e < s:
+                continue
+
+            first = max((s - self.start).days // 7, 0)
+            last = min((e - self.start).days // 7, self.weeks - 1)
+            if first <= last:
+                spans.append((row, first, last, PRIORITY_WEIGHTS.get(t.priority, 1)))
+        return spans
+
+    def _build(self, task_manager):
+        row_of = {s.staff_id.upper(): i for i, s in enumerate(self.staff)}
+        spans = self._task_spans(task_manager, row_of)
+
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if np is not None:
+            diff = np.zeros((len(self.staff), self.weeks + 1), dtype=np.int64)
+            if spans:
+                rows, first, last, weight = (np.array(c) for c in zip(*spans))
+                np.add.at(diff, (rows, first), weight)
+                np.add.at(diff, (rows, last + 1), -weight)
+            return np.cumsum(diff[:, :-1], axis=1).tolist()
+
+        # Không có numpy: cùng thuật toán mảng hiệu bằng list
+        diff = [[0] * (self.weeks + 1) for _ in self.staff]
+        for row, first, last, weight in spans:
+            diff[row][first] += weight
+            diff[row][last + 1] -= weight
+        matrix = []
+        for d in diff:
+            total, line = 0, []
+            for v in d[:-1]:
+                total += v
+                line.append(total)
+            matrix.append(line)
+        return matrix
+
+    # ================= HIỂN THỊ =================
+    def display(self):
+        if not self.staff:
+            print("Danh sách nhân viên trống.")
+            return
+
+        print("\n=== KHỐI LƯỢNG CÔNG VIỆC THEO TUẦN (trọng số: Low 1, Medium 2, High 3, Critical 4) ===")
+        header = f"{'Mã NV':<10} | {'Họ và tên':<20} | " + " ".join(
+            f"{self.week_start(k).strftime('%d/%m'):>5}" for k in range(self.weeks)
+        ) + " | Tổng"
+        lines = [header, "-" * len(header)]
+        for s, row in zip(self.staff, self.matrix):
+            lines.append(
+                f"{s.staff_id:<10} | {s.full_name[:20]:<20} | "
+                + " ".join(f"{v:>5}" for v in row)
+                + f" | {sum(row)}"
+            )
+        print("\n".join(lines))
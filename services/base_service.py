@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from managers.unit_of_work import UnitOfWork
+
+# Định dạng mã dùng chung
+PROJECT_ID_PATTERN = r"P\d{2}_\d{5}"
+STAFF_ID_PATTERN = r"NV_\d{5}"
+
+# Ngày nhận dạng chuỗi: dd/mm/yyyy (như khi nhập tay) hoặc yyyy-mm-dd
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+
+
+class ServiceError(ValueError):
+    """
+    Dữ liệu không hợp lệ, gồm mọi lỗi tìm được (không dừng ở lỗi đầu tiên):
+        errors = [{"field": "deadline", "message": "Deadline phải ≥ ngày bắt đầu task"}, ...]
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(f"{e['field']}: {e['message']}" for e in errors))
+
+
+class FieldErrors:
+    """Gom lỗi theo trường khi kiểm tra 1 bản ghi"""
+
+    def __init__(self):
+        self.errors = []
+
+    def add(self, field, message):
+        self.errors.append({"field": field, "message": message})
+
+    def check(self, field, validate, *args):
+        """Gọi hàm validate của model, ValueError -> ghi lỗi và trả về None"""
+        try:
+            return validate(*args)
+        except ValueError as e:
+            self.add(field, str(e))
+            return None
+
+    def has(self, field):
+        return any(e["field"] == field for e in self.errors)
+
+    def raise_if_any(self):
+        if self.errors:
+            raise ServiceError(self.errors)
+
+
+class BatchResult:
+    """
+    Kết quả 1 lô:
+    - items: các object đã tạo/sửa (theo thứ tự bản ghi)
+    - errors: [{"index": vị trí bản ghi (từ 0), "errors": [...]}]
+    """
+
+    def __init__(self):
+        self.items = []
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def text(value):
+    return "" if value is None else str(value).strip()
+
+
+def parse_date(value, field, errors):
+    """datetime / date / chuỗi ngày -> datetime, rỗng -> None"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            pass
+    errors.add(field, f"Ngày không hợp lệ (dd/mm/yyyy): {value!r}")
+    return None
+
+
+class BaseService(ABC):
+    """
+    Tạo / sửa dữ liệu từ code (không hỏi input), dùng chung ràng buộc với các model
+    - create(**fields) / update(item_id, **changes): ServiceError nếu có lỗi
+    - create_many / update_many: bản ghi lỗi bị bỏ qua, bản ghi hợp lệ
+      được lưu trong 1 UnitOfWork -> mỗi file ghi 1 lần cho cả lô
+    Lớp con cài đặt _create(fields) và _update(item_id, changes):
+    kiểm tra xong toàn bộ rồi mới sửa dữ liệu.
+    """
+
+    CREATE_FIELDS = ()
+    UPDATE_FIELDS = ()
+    ID_FIELD = "id"
+
+    # ================= 1 BẢN GHI =================
+    def create(self, **fields):
+        with UnitOfWork():
+            item = self._create(fields)
+            self._finish()
+        return item
+
+    def update(self, item_id, **changes):
+        with UnitOfWork():
+            item = self._update(item_id, changes)
+            self._finish()
+        return item
+
+    # ================= THEO LÔ =================
+    def create_many(self, records):
+        """records: các dict (có thể là generator) -> BatchResult"""
+        return self._batch(records, self._create)
+
+    def update_many(self, records):
+        """records: các dict gồm ID_FIELD và các trường cần sửa -> BatchResult"""
+        def update_one(record):
+            changes = dict(record)
+            return self._update(changes.pop(self.ID_FIELD, None), changes)
+        return self._batch(records, update_one)
+
+    def _batch(self, records, apply):
+        result = BatchResult()
+        with UnitOfWork():
+            for index, record in enumerate(records):
+                try:
+                    if not isinstance(record, dict):
+                        raise ServiceError([{"field": None, "message": "Bản ghi phải là dict"}])
+                    result.items.append(apply(record))
+                except ServiceError as e:
+                    result.errors.append({"index": index, "errors": e.errors})
+            self._finish()
+        return result
+
+    # ================= DÙNG CHUNG =================
+    def _check_fields(self, fields, allowed, errors):
+        for name in fields:
+            if name not in allowed:
+                errors.add(name, "Trường không hợp lệ")
+
+    def _finish(self):
+        """Việc làm 1 lần sau khi tạo/sửa (VD: cập nhật trạng thái dự án)"""
+
+    @abstractmethod
+    def _create(self, fields):
+        """Kiểm tra rồi tạo 1 object, ServiceError nếu có lỗi"""
+
+    @abstractmethod
+    def _update(self, item_id, changes):
+        """Kiểm tra rồi sửa 1 object, ServiceError nếu có lỗi"""
@@ -0,0 +1,100 @@
+import csv
+import json
+import os
+from managers.unit_of_work import UnitOfWork
+from services.project_service import ProjectService
+from services.staff_service import StaffService
+from services.task_service import TaskService
+
+# Thứ tự nhập: task cần dự án / nhân viên, dự án cần PM
+IMPORT_ORDER = ("staff", "projects", "tasks")
+
+# Cột tự tính (có trong file xuất ra) -> bỏ qua khi nhập
+IGNORED_FIELDS = {
+    "staff": {"project_list", "task_list"},
+    "projects": {"actual_end_date", "status_project"},
+    "tasks": set(),
+}
+
+
+class ImportResult:
+    """Kết quả nhập 1 file: số dòng đã nhập, lỗi [(số dòng, [{"field", "message"}])]"""
+
+    def __init__(self, path):
+        self.path = path
+        self.imported = 0
+        self.errors = []
+
+
+def read_records(path, row_numbers, errors):
+    """
+    Đọc lần lượt từng bản ghi của file CSV (dòng đầu là tên cột) hoặc JSON Lines (.jsonl/.json)
+    - Số dòng trong file của bản ghi thứ i ghi vào row_numbers[i]
+    - Dòng JSON hỏng ghi vào errors, không trả về
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if os.path.splitext(path)[1].lower() in (".jsonl", ".json"):
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    errors.append((line_no, [{"field": None, "message": f"JSON không hợp lệ: {e}"}]))
+                    continue
+                row_numbers.append(line_no)
+                yield record
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                row_numbers.append(reader.line_num)
+                yield row
+
+
+class BulkImporter:
+    """
+    Nhập hàng loạt nhân viên / dự án / task từ file:
+        BulkImporter(staff_manager, project_manager, task_manager).run({"tasks": "tasks.csv"})
+    - Đọc từng dòng (không nạp cả file), kiểm tra bằng các service:
+      định dạng mã, dự án / nhân viên tồn tại (tra chỉ mục), ràng buộc ngày
+    - Dòng lỗi bị bỏ qua và báo lại kèm số dòng, dòng hợp lệ được nhập
+    - Mọi file nhập trong 1 UnitOfWork -> mỗi file dữ liệu chỉ ghi 1 lần
+    Dòng sau được tham chiếu dòng trước trong cùng lần nhập (PM, task phụ thuộc...).
+    """
+
+    def __init__(self, staff_manager, project_manager, task_manager):
+        self.services = {
+            "staff": StaffService(staff_manager),
+            "projects": ProjectService(project_manager),
+            "tasks": TaskService(task_manager),
+        }
+
+    def run(self, sources):
+        """sources: {"staff" / "projects" / "tasks": đường dẫn file} -> {loại: ImportResult}"""
+        for kind, path in sources.items():
+            if kind not in self.services:
+                raise ValueError(f"Loại dữ liệu không hợp lệ: {kind}")
+            if not os.path.isfile(path):
+                raise ValueError(f"Không tìm thấy file: {path}")
+
+        results = {}
+        with UnitOfWork():
+            for kind in IMPORT_ORDER:
+                if kind in sources:
+                    results[kind] = self._import(kind, sources[kind])
+        return results
+
+    def _import(self, kind, path):
+        result = ImportResult(path)
+        row_numbers = []
+        ignored = IGNORED_FIELDS[kind]
+        records = (
+            {k: v for k, v in r.items() if k not in ignored} if isinstance(r, dict) else r
+            for r in read_records(path, row_numbers, result.errors)
+        )
+
+        batch = self.services[kind].create_many(records)
+        result.imported = len(batch.items)
+        result.errors.extend((row_numbers[e["index"]], e["errors"]) for e in batch.errors)
+        result.errors.sort(key=lambda e: e[0])
+        return result
@@ -0,0 +1,111 @@
+import copy
+import re
+from models.project import Project
+from services.base_service import (
+    BaseService, FieldErrors, ServiceError, PROJECT_ID_PATTERN, parse_date, text,
+)
+
+
+class ProjectService(BaseService):
+    """
+    Thêm / sửa dự án không qua input(), cùng ràng buộc với ProjectManager.add_project / update_project:
+        ProjectService(project_manager).update("P25_00001", budget=2e9, pm_id="NV_00001")
+    Tên trường giống cột trong projects.csv (trạng thái / ngày kết thúc thực tế tự tính).
+    """
+
+    CREATE_FIELDS = [
+        "project_id", "project_name", "customer", "description",
+        "start_date", "expected_end_date", "budget", "pm_id",
+    ]
+    UPDATE_FIELDS = CREATE_FIELDS[1:]
+    ID_FIELD = "project_id"
+
+    def __init__(self, project_manager):
+        self.project_manager = project_manager
+        self.staff_manager = project_manager.staff_manager
+
+    # ================= TẠO =================
+    def _create(self, fields):
+        errors = FieldErrors()
+        self._check_fields(fields, self.CREATE_FIELDS, errors)
+
+        project = Project()
+        project.project_id = project.id = text(fields.get("project_id"))
+        if not re.fullmatch(PROJECT_ID_PATTERN, project.project_id):
+            errors.add("project_id", "Sai định dạng (VD: P25_00001)")
+        elif self.project_manager.find_by_id(project.project_id):
+            errors.add("project_id", "Mã dự án đã tồn tại")
+
+        self._apply(project, {"project_name": "", "customer": "", "pm_id": "", **fields}, errors)
+        for field in ("start_date", "expected_end_date", "budget"):
+            if field not in fields and not errors.has(field):
+                errors.add(field, "Không được để trống")
+        self._check_dates(project, errors)
+        errors.raise_if_any()
+
+        self.project_manager.insert_item(project)
+        self.project_manager.persist_item(project)
+        return project
+
+    # ================= SỬA =================
+    def _update(self, project_id, changes):
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ServiceError([{"field": "project_id", "message": f"Không tìm thấy dự án '{project_id}'."}])
+
+        errors = FieldErrors()
+        self._check_fields(changes, self.UPDATE_FIELDS, errors)
+        draft = copy.copy(project)
+        self._apply(draft, changes, errors)
+        self._check_dates(draft, errors)
+        errors.raise_if_any()
+
+        with self.project_manager.editing(project) as project:
+            vars(project).update(vars(draft))
+        self.project_manager.persist_item(project)
+        return project
+
+    # ================= KIỂM TRA =================
+    def _apply(self, project, fields, errors):
+        """Kiểm tra các trường có trong fields và gán lên project (bản nháp)"""
+        if "project_name" in fields:
+            name = text(fields["project_name"])
+            if len(name) < 2:
+                errors.add("project_name", "Tên tối thiểu 2 ký tự")
+            project.project_name = project.name = name.title()
+        if "customer" in fields:
+            customer = text(fields["customer"])
+            if not customer:
+                errors.add("customer", "Không được để trống")
+            project.customer = customer.title()
+        if "description" in fields:
+            project.description = text(fields["description"])
+        for field in ("start_date", "expected_end_date"):
+            if field in fields:
+                value = parse_date(fields[field], field, errors)
+                if value is None and not errors.has(field):
+                    errors.add(field, "Không được để trống")
+                setattr(project, field, value)
+        if "budget" in fields:
+            try:
+                project.budget = float(fields["budget"])
+                if project.budget <= 0:
+                    errors.add("budget", "Ngân sách phải > 0")
+            except (TypeError, ValueError):
+                errors.add("budget", "Phải là số")
+        if "pm_id" in fields:
+            project.pm_id = text(fields["pm_id"])
+            pm = self.staff_manager.find_by_id(project.pm_id)
+            if not pm:
+                errors.add("pm_id", "Nhân viên không tồn tại.")
+            elif getattr(pm, "management_title", "") != "Project Manager":
+                errors.add("pm_id", "Người này không phải Project Manager.")
+
+    def _check_dates(self, project, errors):
+        if errors.has("start_date") or errors.has("expected_end_date"):
+            return
+        if project.start_date and project.expected_end_date and project.expected_end_date < project.start_date:
+            errors.add(
+                "expected_end_date",
+                f"Ngày dự kiến phải >= ngày bắt đầu ({project.start_date.strftime('%d/%m/%Y')})"
+            )
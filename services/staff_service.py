@@ -0,0 +1,86 @@
+import copy
+from models.staff import Staff, CAP_DO_HOP_LE, VAI_TRO_HOP_LE
+from services.base_service import BaseService, FieldErrors, ServiceError, text
+
+
+class StaffService(BaseService):
+    """
+    Thêm / sửa nhân viên không qua input(), cùng ràng buộc với Staff.input_info / update_info:
+        StaffService(staff_manager).create(staff_id="NV_00010", full_name="nguyễn văn a", age=25,
+                                           level="Senior", role="Developer", management_title="Team Leader")
+    Tên trường giống cột trong staff.csv (task_list do TaskManager quản lý).
+    """
+
+    CREATE_FIELDS = ["staff_id", "full_name", "age", "level", "role", "management_title"]
+    UPDATE_FIELDS = CREATE_FIELDS[1:]
+    ID_FIELD = "staff_id"
+
+    def __init__(self, staff_manager):
+        self.staff_manager = staff_manager
+
+    # ================= TẠO =================
+    def _create(self, fields):
+        errors = FieldErrors()
+        self._check_fields(fields, self.CREATE_FIELDS, errors)
+
+        staff = Staff()
+        # Kiểm tra định dạng bằng model, trùng mã bằng chỉ mục của StaffManager
+        staff.staff_id = errors.check("staff_id", staff.validate_staff_id, text(fields.get("staff_id")), ())
+        if staff.staff_id and self.staff_manager.find_by_id(staff.staff_id):
+            errors.add("staff_id", "Mã nhân viên đã tồn tại")
+
+        self._apply(staff, {"full_name": "", "age": "", "level": "", "role": "", **fields}, errors)
+        errors.raise_if_any()
+
+        self.staff_manager.staff_list.append(staff)
+        self.staff_manager._index_staff(staff)
+        self.staff_manager.persist_staff(staff)
+        return staff
+
+    # ================= SỬA =================
+    def _update(self, staff_id, changes):
+        staff = self.staff_manager.find_by_id(staff_id)
+        if not staff:
+            raise ServiceError([{"field": "staff_id", "message": f"Mã nhân viên không tồn tại: {staff_id}"}])
+
+        errors = FieldErrors()
+        self._check_fields(changes, self.UPDATE_FIELDS, errors)
+        draft = copy.copy(staff)
+        self._apply(draft, changes, errors)
+        errors.raise_if_any()
+
+        vars(staff).update(vars(draft))
+        self.staff_manager._index_staff(staff)
+        self.staff_manager.persist_staff(staff)
+        return staff
+
+    # ================= KIỂM TRA =================
+    def _apply(self, staff, fields, errors):
+        """Kiểm tra các trường có trong fields và gán lên staff (bản nháp)"""
+        if "full_name" in fields:
+            staff.full_name = errors.check("full_name", staff.validate_name, text(fields["full_name"]))
+        if "age" in fields:
+            try:
+                age = int(text(fields["age"]))
+            except ValueError:
+                errors.add("age", "Tuổi phải là số nguyên")
+            else:
+                staff.age = errors.check("age", staff.validate_age, age)
+        if "level" in fields:
+            staff.level = errors.check(
+                "level", staff.validate_choice, text(fields["level"]).title(), CAP_DO_HOP_LE, "Cấp độ"
+            )
+        if "role" in fields:
+            staff.role = errors.check(
+                "role", staff.validate_choice, text(fields["role"]).title(), VAI_TRO_HOP_LE, "Vai trò"
+            )
+        if "management_title" in fields:
+            staff.management_title = errors.check(
+                "management_title", staff.validate_management_title, text(fields["management_title"]).title()
+            )
+
+        # Chỉ nhân viên Senior mới được giữ chức danh quản lý (khi đổi 1 trong 2 trường)
+        if "level" not in fields and "management_title" not in fields:
+            return
+        if staff.management_title and staff.level and staff.level != "Senior" and not errors.has("level"):
+            errors.add("management_title", "Nhân sự chưa đạt level Senior → không được gán chức danh quản lý.")
@@ -0,0 +1,192 @@
+import copy
+import re
+from contextlib import nullcontext
+from datetime import datetime
+from models.task import Task
+from services.base_service import (
+    BaseService, FieldErrors, ServiceError, PROJECT_ID_PATTERN, STAFF_ID_PATTERN,
+    parse_date, text,
+)
+
+
+class TaskService(BaseService):
+    """
+    Thêm / sửa task không qua input(), cùng ràng buộc với TaskManager.add_task / update_task:
+        service = TaskService(task_manager)
+        service.create(project_id="P25_00001", task_id="TP25_00001_00003", task_name="Thiết kế",
+                       start_date="01/12/2025", deadline="10/12/2025", priority="High")
+        service.update("TP25_00001_00003", status_task="Completed")
+    Tên trường giống cột trong tasks.csv, thêm depends_on (mã task phụ thuộc) khi tạo.
+    Trạng thái dự án được tính lại 1 lần cho mỗi dự án bị ảnh hưởng.
+    """
+
+    CREATE_FIELDS = Task.csv_fields() + ["depends_on"]
+    UPDATE_FIELDS = [
+        "task_name", "task_description", "assignee_id", "start_date",
+        "deadline", "completed_date", "priority", "status_task",
+    ]
+    ID_FIELD = "task_id"
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        self.project_manager = task_manager.project_manager
+        self.staff_manager = task_manager.staff_manager
+        self._touched = set()  # dự án cần tính lại trạng thái
+
+    # ================= TẠO =================
+    def _create(self, fields):
+        errors = FieldErrors()
+        self._check_fields(fields, self.CREATE_FIELDS, errors)
+
+        project_id = text(fields.get("project_id"))
+        project = None
+        if not re.fullmatch(PROJECT_ID_PATTERN, project_id):
+            errors.add("project_id", "Sai định dạng dự án. VD: P25_00001")
+        else:
+            project = self.project_manager.find_by_id(project_id)
+            if not project:
+                errors.add("project_id", "Dự án không tồn tại.")
+
+        task_id = text(fields.get("task_id"))
+        if project_id and not errors.has("project_id"):
+            if not re.fullmatch(rf"T{project_id}_\d{{5}}", task_id):
+                errors.add("task_id", f"Sai định dạng mã task (T{project_id}_NNNNN)")
+            elif self.task_manager.find_by_id(task_id):
+                errors.add("task_id", "Mã task đã tồn tại.")
+
+        task = Task(project_id=project_id, task_id=task_id)
+        self._apply(task, {"priority": "Low", "status_task": "To Do", "task_name": "", **fields}, errors)
+        max_end = project.expected_end_date if project else None
+        self._check_dates(task, project, max_end, errors, required=True)
+        predecessors = self._predecessors(fields.get("depends_on"), project_id, errors)
+        errors.raise_if_any()
+
+        self.task_manager.create_task(task, predecessors, update_project=False)
+        self._touched.add(project_id)
+        return task
+
+    # ================= SỬA =================
+    def _update(self, task_id, changes):
+        task = self.task_manager.find_by_id(task_id)
+        if not task:
+            raise ServiceError([{"field": "task_id", "message": f"Không tìm thấy task: {task_id}"}])
+
+        errors = FieldErrors()
+        self._check_fields(changes, self.UPDATE_FIELDS, errors)
+        draft = copy.copy(task)
+        self._apply(draft, changes, errors)
+        project = self.project_manager.find_by_id(task.project_id)
+        if project and ("start_date" in changes or "deadline" in changes):
+            max_end = project.actual_end_date or project.expected_end_date
+            self._check_dates(draft, project, max_end, errors)
+        errors.raise_if_any()
+
+        old_assignee = task.assignee_id
+        with self.task_manager.editing(task) as task:
+            vars(task).update(vars(draft))
+        self.task_manager.persist_item(task)
+        if task.assignee_id != old_assignee:
+            self._move_task(task.id, old_assignee, task.assignee_id)
+        self._touched.add(task.project_id)
+        return task
+
+    # ================= KIỂM TRA =================
+    def _apply(self, task, fields, errors):
+        """Kiểm tra các trường có trong fields và gán lên task (bản nháp)"""
+        if "task_name" in fields:
+            task.name = errors.check("task_name", task._validate_name, text(fields["task_name"]))
+        if "task_description" in fields:
+            task.description = text(fields["task_description"])
+        if "assignee_id" in fields:
+            task.assignee_id = self._assignee(text(fields["assignee_id"]), errors)
+        for field in ("start_date", "deadline"):
+            if field in fields:
+                setattr(task, field, parse_date(fields[field], field, errors))
+        if "priority" in fields:
+            task.priority = errors.check(
+                "priority", task._validate_choice, text(fields["priority"]), Task.PRIORITY_LEVELS, "Priority"
+            )
+        if "status_task" in fields:
+            task.status_task = errors.check(
+                "status_task", task._validate_choice, text(fields["status_task"]), Task.STATUS_LIST, "Status"
+            )
+
+        # Ngày hoàn thành: chỉ task Completed mới có, không nhập thì lấy hôm nay
+        completed = parse_date(fields.get("completed_date"), "completed_date", errors)
+        if task.status_task == "Completed":
+            task.completed_date = completed or task.completed_date or datetime.now()
+        else:
+            if completed:
+                errors.add("completed_date", "Chỉ task Completed mới có ngày hoàn thành")
+            task.completed_date = None
+
+    def _assignee(self, assignee_id, errors):
+        # Tra mã nhân viên bằng chỉ mục của StaffManager
+        if assignee_id in ("", "Unassigned"):
+            return "Unassigned"
+        if not re.fullmatch(STAFF_ID_PATTERN, assignee_id):
+            errors.add("assignee_id", "Sai định dạng NV_00001")
+        elif not self.staff_manager or not self.staff_manager.find_by_id(assignee_id):
+            errors.add("assignee_id", "Nhân viên không tồn tại trong hệ thống")
+        return assignee_id
+
+    def _check_dates(self, task, project, max_end, errors, required=False):
+        if errors.has("start_date") or errors.has("deadline"):
+            return
+        if task.start_date is None or task.deadline is None:
+            if required:
+                for field in ("start_date", "deadline"):
+                    if getattr(task, field) is None:
+                        errors.add(field, "Không được để trống")
+            return
+        if project and project.start_date and task.start_date < project.start_date:
+            errors.add(
+                "start_date",
+                f"Ngày bắt đầu task phải ≥ ngày bắt đầu dự án ({project.start_date.strftime('%d/%m/%Y')})"
+            )
+        if max_end and task.start_date > max_end:
+            errors.add("start_date", f"Ngày bắt đầu task phải ≤ ngày kết thúc dự án ({max_end.strftime('%d/%m/%Y')})")
+        if task.deadline < task.start_date:
+            errors.add("deadline", "Deadline phải ≥ ngày bắt đầu task")
+        elif max_end and task.deadline > max_end:
+            errors.add("deadline", f"Deadline phải ≤ ngày kết thúc dự án ({max_end.strftime('%d/%m/%Y')})")
+
+    def _predecessors(self, value, project_id, errors):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = value.split(",")
+        predecessors = [text(x) for x in value if text(x)]
+        invalid = [
+            pid for pid in predecessors
+            if not self.task_manager.find_by_id(pid)
+            or self.task_manager.find_by_id(pid).project_id != project_id
+        ]
+        if invalid:
+            errors.add("depends_on", f"Task không tồn tại trong dự án: {', '.join(invalid)}")
+        return predecessors
+
+    # ================= ĐỒNG BỘ =================
+    def _move_task(self, task_id, old_assignee, new_assignee):
+        """Đổi người phụ trách -> chuyển task_id giữa task_list của 2 nhân viên"""
+        if not self.staff_manager:
+            return
+        old = self.staff_manager.find_by_id(old_assignee)
+        if old and task_id in old.task_list:
+            old.task_list.remove(task_id)
+            self.staff_manager.persist_staff(old)
+        new = self.staff_manager.find_by_id(new_assignee)
+        if new and task_id not in new.task_list:
+            new.task_list.append(task_id)
+            self.staff_manager.persist_staff(new)
+
+    def _batch(self, records, apply):
+        # Lịch sử task của cả lô: ghi nối 1 lần
+        history = self.task_manager.history
+        with history.batch() if history else nullcontext():
+            return super()._batch(records, apply)
+
+    def _finish(self):
+        for project_id in sorted(self._touched):
+            self.project_manager.update_project_status(project_id, self.task_manager)
+        self._touched.clear()
@@ -0,0 +1,27 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA_FILES = ["staff.csv", "projects.csv", "tasks.csv", "weekly_reports.csv", "final_reports.csv"]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Thư mục tạm làm thư mục hiện hành (các manager đọc/ghi file theo đường dẫn tương đối)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def managers(workdir, monkeypatch):
+    """(staff, project, task, weekly report, final report) trên bản sao dữ liệu mẫu, lưu CSV"""
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(ROOT, name), workdir)
+    import main
+    monkeypatch.setattr(main, "STORAGE_MODE", "csv")
+    return main.build_managers(main.make_stores())
@@ -0,0 +1,76 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from managers.interval_index import overlaps_period
+from models.task import Task
+from reports.weekly_report import WeeklyReport
+
+np = pytest.importorskip("numpy")
+from reports.analytics import TaskAnalytics  # noqa: E402
+
+DAY0 = datetime(2026, 1, 5)
+PROJECTS = ["P26_00001", "P26_00002", "P26_00003"]
+
+
+def make_tasks(n, seed=5):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        project_id = rng.choice(PROJECTS)
+        task = Task(project_id=project_id, task_id=f"T{project_id}_{i:05d}")
+        start = DAY0 + timedelta(days=rng.randint(-5, 60))
+        task.start_date = start if rng.random() > 0.05 else None
+        task.deadline = start + timedelta(days=rng.randint(-2, 25)) if rng.random() > 0.05 else None
+        task.status_task = rng.choice(Task.STATUS_LIST)
+        if task.status_task == "Completed" and rng.random() > 0.1:
+            task.completed_date = start + timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23))
+        tasks.append(task)
+    return tasks
+
+
+def weekly_periods(first_start, count):
+    return [
+        (first_start + timedelta(days=7 * k), first_start + timedelta(days=7 * k + 6))
+        for k in range(count)
+    ]
+
+
+def expected_stats(tasks, project_id, periods):
+    own = [t for t in tasks if t.project_id == project_id]
+    return [
+        WeeklyReport.compute_stats([t for t in own if overlaps_period(t, ps, pe)], ps, pe)
+        for ps, pe in periods
+    ]
+
+
+@pytest.mark.parametrize("periods", [
+    weekly_periods(DAY0, 10),
+    [(DAY0 + timedelta(days=2), DAY0 + timedelta(days=6))] + weekly_periods(DAY0 + timedelta(days=21), 3),
+])
+def test_period_stats_matches_compute_stats(periods):
+    tasks = make_tasks(600)
+    analytics = TaskAnalytics(tasks)
+    for project_id in PROJECTS:
+        assert analytics.period_stats(project_id, periods) == expected_stats(tasks, project_id, periods)
+
+
+def test_period_stats_unknown_project_or_no_periods():
+    analytics = TaskAnalytics(make_tasks(20))
+    assert analytics.period_stats("P99_00001", weekly_periods(DAY0, 2)) == [(0, 0, 0), (0, 0, 0)]
+    assert analytics.period_stats(PROJECTS[0], []) == []
+
+
+def test_project_summary_matches_loops():
+    tasks = make_tasks(300)
+    now = DAY0 + timedelta(days=30)
+    summary = TaskAnalytics(tasks).project_summary(now=now)
+    for project_id in PROJECTS:
+        own = [t for t in tasks if t.project_id == project_id]
+        assert summary[project_id]["total"] == len(own)
+        assert summary[project_id]["completed"] == sum(t.status_task == "Completed" for t in own)
+        assert summary[project_id]["overdue"] == sum(
+            1 for t in own
+            if t.deadline and t.deadline < now and t.status_task not in ("Completed", "Cancelled")
+        )
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from managers.dependency_graph import DependencyGraph
+from managers.unit_of_work import UnitOfWork
+from models.task import Task
+
+PID = "P25_00001"
+
+
+@pytest.fixture
+def graph(managers):
+    """Đồ thị phụ thuộc trên 3 task mới của dự án P25_00001: A, B, C"""
+    task_manager = managers[2]
+    for i, day in ((91, 1), (92, 5), (93, 9)):
+        task = Task(project_id=PID, task_id=f"T{PID}_{i:05d}", task_name=f"Task {i}")
+        task.start_date = datetime(2025, 12, day)
+        task.deadline = task.start_date + timedelta(days=2)
+        task_manager.insert_item(task)
+    return task_manager.dependencies
+
+
+A, B, C = (f"T{PID}_{i:05d}" for i in (91, 92, 93))
+
+
+def test_cycle_is_rejected(graph):
+    graph.add_dependency(B, A)
+    graph.add_dependency(C, B)
+
+    with pytest.raises(ValueError, match="vòng lặp"):
+        graph.add_dependency(A, C)
+    with pytest.raises(ValueError):
+        graph.add_dependency(A, A)
+    with pytest.raises(ValueError):
+        graph.add_dependency(C, B)  # đã tồn tại
+    assert graph.predecessors(A) == []
+    assert graph.predecessors(C) == [B]
+
+
+def test_other_project_is_rejected(graph):
+    other = next(t for t in graph.task_manager.items if t.project_id != PID)
+    with pytest.raises(ValueError):
+        graph.add_dependency(A, other.id)
+
+
+def test_earliest_start_follows_predecessors(graph):
+    graph.add_dependency(B, A)
+    graph.add_dependency(C, B)
+    a_finish = graph.early[A][1]
+    assert graph.early[B][0] == max(a_finish + timedelta(days=1), datetime(2025, 12, 5))
+
+    task_a = graph.task_manager.find_by_id(A)
+    with graph.task_manager.editing(task_a) as task_a:
+        task_a.deadline = task_a.deadline + timedelta(days=10)
+    assert graph.early[B][0] == task_a.deadline + timedelta(days=1)
+    assert graph.early[C][0] == graph.early[B][1] + timedelta(days=1)
+
+
+def test_edges_saved_and_reloaded(graph):
+    graph.add_dependency(B, A)
+    graph.add_dependency(C, A)
+    graph.add_dependency(C, B)
+    graph.remove_dependency(C, A)
+
+    reloaded = DependencyGraph(graph.filename, graph.task_manager)
+    assert reloaded.preds == {B: {A}, C: {B}}
+
+
+def test_remove_dependency_waits_for_unit_of_work(graph, workdir):
+    graph.add_dependency(B, A)
+    saved = (workdir / graph.filename).read_text(encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork():
+            graph.remove_dependency(B, A)
+            raise RuntimeError("hủy")
+    assert (workdir / graph.filename).read_text(encoding="utf-8") == saved
+
+
+def test_task_changed_drops_edges_to_missing_tasks(graph):
+    graph.add_dependency(B, A)
+    graph.add_dependency(C, B)
+    graph.task_manager._unindex_item(graph.task_manager.find_by_id(A))
+
+    graph.task_changed(B)
+    assert graph.predecessors(B) == []
+    assert A not in graph.succs
+    assert DependencyGraph(graph.filename, graph.task_manager).preds == {C: {B}}
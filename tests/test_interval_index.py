@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timedelta
+
+from managers.interval_index import IntervalIndex, overlaps_period
+from models.task import Task
+
+DAY0 = datetime(2026, 1, 1)
+
+
+def make_tasks(n, seed=7):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        start = DAY0 + timedelta(days=rng.randint(0, 120))
+        deadline = start + timedelta(days=rng.randint(-3, 20))  # có cả deadline < ngày bắt đầu
+        task = Task(project_id="P26_00001", task_id=f"TP26_00001_{i:05d}")
+        task.start_date = start if rng.random() > 0.05 else None
+        task.deadline = deadline if rng.random() > 0.05 else None
+        tasks.append(task)
+    return tasks
+
+
+def test_query_matches_linear_scan():
+    tasks = make_tasks(500)
+    index = IntervalIndex(tasks)
+    assert len(index) == len(tasks)
+
+    rng = random.Random(1)
+    for _ in range(200):
+        lo = DAY0 + timedelta(days=rng.randint(-10, 140))
+        hi = lo + timedelta(days=rng.randint(0, 14))
+        expected = {t.id for t in tasks if overlaps_period(t, lo, hi)}
+        found = [t.id for t in index.query(lo, hi)]
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+
+def test_query_includes_period_boundaries():
+    task = Task(project_id="P26_00001", task_id="TP26_00001_00001")
+    task.start_date, task.deadline = datetime(2026, 1, 10), datetime(2026, 1, 12)
+    index = IntervalIndex([task])
+
+    assert index.query(datetime(2026, 1, 12), datetime(2026, 1, 20)) == [task]
+    assert index.query(datetime(2026, 1, 1), datetime(2026, 1, 10)) == [task]
+    assert index.query(datetime(2026, 1, 13), datetime(2026, 1, 20)) == []
+
+
+def test_task_manager_rebuilds_index_after_edit(managers):
+    task_manager = managers[2]
+    task = next(t for t in task_manager.items if t.start_date and t.deadline)
+    far = datetime(2030, 6, 1)
+    assert task not in task_manager.tasks_overlapping(far, far + timedelta(days=6))
+
+    with task_manager.editing(task) as task:
+        task.start_date, task.deadline = far, far + timedelta(days=2)
+    assert [t.id for t in task_manager.tasks_overlapping(far, far + timedelta(days=6))] == [task.id]
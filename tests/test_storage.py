@@ -0,0 +1,50 @@
+from managers.storage import JournalStore
+
+FIELDS = ["id", "name"]
+
+
+def test_journal_replays_puts_and_deletes(workdir):
+    store = JournalStore("items.csv", FIELDS, "id")
+    store.save_all([{"id": "1", "name": "a"}, {"id": "2", "name": "b"}])
+    store.put("3", {"id": "3", "name": "c"})
+    store.apply([("put", "1", {"id": "1", "name": "a2"}), ("del", "2", None)])
+
+    rows = JournalStore("items.csv", FIELDS, "id").load()
+    assert sorted((r["id"], r["name"]) for r in rows) == [("1", "a2"), ("3", "c")]
+
+
+def test_journal_ignores_torn_last_line(workdir):
+    store = JournalStore("items.csv", FIELDS, "id")
+    store.save_all([{"id": "1", "name": "a"}])
+    store.put("2", {"id": "2", "name": "b"})
+    with open(store.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "id": "3", "ro')
+
+    rows = JournalStore("items.csv", FIELDS, "id").load()
+    assert sorted(r["id"] for r in rows) == ["1", "2"]
+
+
+def test_journal_finishes_interrupted_compaction(workdir):
+    store = JournalStore("items.csv", FIELDS, "id")
+    store.save_all([{"id": "1", "name": "a"}])
+    store.put("2", {"id": "2", "name": "b"})
+    # Dừng sau khi đổi tên journal, trước khi ghi snapshot mới
+    (workdir / store.journal_file).rename(workdir / store.old_journal_file)
+    store.put("3", {"id": "3", "name": "c"})
+
+    reloaded = JournalStore("items.csv", FIELDS, "id")
+    assert sorted(r["id"] for r in reloaded.load()) == ["1", "2", "3"]
+    assert not (workdir / reloaded.old_journal_file).exists()
+
+
+def test_compaction_keeps_every_row(workdir):
+    store = JournalStore("items.csv", FIELDS, "id", compact_threshold=5)
+    rows = {}
+    for i in range(12):
+        rows[str(i)] = {"id": str(i), "name": f"n{i}"}
+        store.put(str(i), rows[str(i)])
+        if store.should_compact():
+            store.compact(list(rows.values()))
+    store.wait_compaction()
+
+    assert sorted(r["id"] for r in JournalStore("items.csv", FIELDS, "id").load()) == sorted(rows)
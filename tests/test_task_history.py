@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+from managers.task_history import TaskHistory
+from models.task import Task
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+PID = "P26_00001"
+
+
+def make_task(task_id, start_days_ago=10, project_id=PID):
+    task = Task(project_id=project_id, task_id=task_id)
+    task.start_date = NOW - timedelta(days=start_days_ago)
+    task.deadline = NOW + timedelta(days=5)
+    return task
+
+
+def ids(tasks):
+    return sorted(t.id for t in tasks)
+
+
+def change(history, task, when, **fields):
+    before = history.snapshot(task)
+    for name, value in fields.items():
+        setattr(task, name, value)
+    history.record_changes(task, before, when=when)
+
+
+def test_field_value_as_of(workdir):
+    history = TaskHistory("history.csv")
+    task = make_task("TP26_00001_00001")
+    history.record_created(task, when=NOW)
+    change(history, task, NOW + timedelta(days=1), status_task="In Progress")
+    change(history, task, NOW + timedelta(days=3), status_task="Completed")
+
+    def status_at(days):
+        (t,) = history.tasks_as_of([task], PID, NOW + timedelta(days=days))
+        return t.status_task
+
+    assert (status_at(1), status_at(2), status_at(4)) == ("To Do", "In Progress", "Completed")
+    # Đọc lại từ file cho cùng kết quả
+    (t,) = TaskHistory("history.csv").tasks_as_of([task], PID, NOW + timedelta(days=2))
+    assert t.status_task == "In Progress"
+
+
+def test_created_counts_from_earlier_start_date(workdir):
+    history = TaskHistory("history.csv")
+    late_entry = make_task("TP26_00001_00001", start_days_ago=10)
+    future = make_task("TP26_00001_00002", start_days_ago=-3)
+    history.record_created(late_entry, when=NOW)
+    history.record_created(future, when=NOW)
+
+    assert ids(history.tasks_as_of([late_entry, future], PID, NOW - timedelta(days=5))) == [late_entry.id]
+    assert ids(history.tasks_as_of([late_entry, future], PID, NOW + timedelta(seconds=1))) == [
+        late_entry.id, future.id
+    ]
+
+
+def test_deleted_task_is_back_before_deletion(workdir):
+    history = TaskHistory("history.csv")
+    task = make_task("TP26_00001_00001")
+    history.record_created(task, when=NOW - timedelta(days=20))
+    history.record_deleted([task], when=NOW)
+
+    assert ids(history.tasks_as_of([], PID, NOW - timedelta(days=1))) == [task.id]
+    assert history.tasks_as_of([], PID, NOW + timedelta(days=1)) == []
+
+
+def test_recreated_id_drops_old_history(workdir):
+    history = TaskHistory("history.csv")
+    old = make_task("TP26_00001_00001", start_days_ago=30)
+    history.record_created(old, when=NOW - timedelta(days=30))
+    change(history, old, NOW - timedelta(days=20), status_task="Completed")
+    history.record_deleted([old], when=NOW - timedelta(days=10))
+
+    new = make_task("TP26_00001_00001", start_days_ago=0)
+    history.record_created(new, when=NOW)
+    for h in (history, TaskHistory("history.csv")):
+        (t,) = h.tasks_as_of([new], PID, NOW + timedelta(days=1))
+        assert t.status_task == "To Do"
+        assert h.tasks_as_of([new], PID, NOW - timedelta(days=15)) == []
+
+
+def test_moved_task_stays_in_old_project_before_move(workdir):
+    history = TaskHistory("history.csv")
+    task = make_task("TP26_00001_00001")
+    history.record_created(task, when=NOW - timedelta(days=10))
+    change(history, task, NOW, project_id="P26_00002")
+
+    assert ids(history.tasks_as_of([task], PID, NOW - timedelta(days=1))) == [task.id]
+    assert history.tasks_as_of([task], PID, NOW + timedelta(days=1)) == []
+    assert ids(history.tasks_as_of([task], "P26_00002", NOW + timedelta(days=1))) == [task.id]
+
+
+def test_task_manager_tasks_as_of(managers):
+    task_manager = managers[2]
+    task = task_manager.items[0]
+    project_id, old_status = task.project_id, task.status_task
+    edited_at = datetime.now()
+
+    with task_manager.editing(task) as task:
+        task.status_task = "Cancelled" if old_status != "Cancelled" else "To Do"
+    task_manager.persist_item(task)
+
+    before = {t.id: t for t in task_manager.tasks_as_of(project_id, edited_at - timedelta(seconds=1))}
+    assert before[task.id].status_task == old_status
+    assert ids(before.values()) == ids(task_manager.tasks_of_project(project_id))
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from managers.storage import CsvStore
+from managers.unit_of_work import UnitOfWork
+
+
+def read(path):
+    return path.read_text(encoding="utf-8")
+
+
+def test_error_inside_unit_writes_nothing(managers, workdir):
+    staff_manager, project_manager, *_ = managers
+    before = read(workdir / "staff.csv"), read(workdir / "projects.csv")
+
+    staff = staff_manager.staff_list[0]
+    project = project_manager.items[0]
+    with pytest.raises(RuntimeError):
+        with UnitOfWork():
+            staff.full_name = "Đổi Tên"
+            staff_manager.persist_staff(staff)
+            with project_manager.editing(project) as project:
+                project.customer = "Khách Mới"
+            project_manager.persist_item(project)
+            raise RuntimeError("dừng giữa chừng")
+
+    assert (read(workdir / "staff.csv"), read(workdir / "projects.csv")) == before
+    assert UnitOfWork.current() is None
+
+
+def test_nested_units_commit_once_at_outer_exit(managers, workdir):
+    staff_manager = managers[0]
+    staff = staff_manager.staff_list[0]
+    before = read(workdir / "staff.csv")
+
+    with UnitOfWork() as outer:
+        with UnitOfWork() as inner:
+            assert inner is outer
+            staff.full_name = "Tên Mới"
+            staff_manager.persist_staff(staff)
+        assert read(workdir / "staff.csv") == before
+
+    assert "Tên Mới" in read(workdir / "staff.csv")
+
+
+def test_recover_finishes_interrupted_renames(workdir):
+    a = CsvStore("a.csv", ["id"], "id")
+    b = CsvStore("b.csv", ["id"], "id")
+    a.save_all([{"id": "old"}])
+    b.save_all([{"id": "old"}])
+
+    # Dừng sau khi ghi nhật ký, mới đổi tên được file đầu tiên
+    renames = [(a.write_temp([{"id": "new"}]), "a.csv"), (b.write_temp([{"id": "new"}]), "b.csv")]
+    (workdir / UnitOfWork.INTENT_FILE).write_text(json.dumps(renames), encoding="utf-8")
+    (workdir / "a.csv.tmp").replace(workdir / "a.csv")
+
+    assert UnitOfWork.recover()
+    assert a.load() == [{"id": "new"}] and b.load() == [{"id": "new"}]
+    assert not (workdir / UnitOfWork.INTENT_FILE).exists()
+    assert not UnitOfWork.recover()
+
+
+def test_recover_ignores_torn_intent_file(workdir):
+    a = CsvStore("a.csv", ["id"], "id")
+    a.save_all([{"id": "old"}])
+    a.write_temp([{"id": "new"}])
+    (workdir / UnitOfWork.INTENT_FILE).write_text('[["a.csv.tmp", "a.c', encoding="utf-8")
+
+    assert UnitOfWork.recover()
+    assert a.load() == [{"id": "old"}]
+    assert not (workdir / UnitOfWork.INTENT_FILE).exists()
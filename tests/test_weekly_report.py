@@ -0,0 +1,57 @@
+import random
+from datetime import datetime, timedelta
+
+from managers.interval_index import overlaps_period
+from models.task import Task
+from reports.weekly_report import WeeklyReport
+
+DAY0 = datetime(2026, 1, 5)
+
+
+def make_tasks(n, project_id="P26_00001", seed=3):
+    """Task ngẫu nhiên gồm cả task thiếu ngày, deadline < ngày bắt đầu, Cancelled"""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        task = Task(project_id=project_id, task_id=f"T{project_id}_{i:05d}")
+        start = DAY0 + timedelta(days=rng.randint(-5, 60))
+        task.start_date = start if rng.random() > 0.05 else None
+        task.deadline = start + timedelta(days=rng.randint(-2, 25)) if rng.random() > 0.05 else None
+        task.status_task = rng.choice(Task.STATUS_LIST)
+        if task.status_task == "Completed" and rng.random() > 0.1:
+            task.completed_date = start + timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23))
+        tasks.append(task)
+    return tasks
+
+
+def weekly_periods(first_start, count):
+    periods, start = [], first_start
+    for _ in range(count):
+        periods.append((start, start + timedelta(days=6)))
+        start += timedelta(days=7)
+    return periods
+
+
+def test_batch_matches_per_period_stats():
+    tasks = make_tasks(400)
+    periods = weekly_periods(DAY0, 10)
+    expected = [
+        WeeklyReport.compute_stats([t for t in tasks if overlaps_period(t, ps, pe)], ps, pe)
+        for ps, pe in periods
+    ]
+    assert WeeklyReport.compute_stats_batch(tasks, periods) == expected
+
+
+def test_batch_with_short_first_week_and_gaps():
+    tasks = make_tasks(200, seed=11)
+    periods = [(DAY0 + timedelta(days=3), DAY0 + timedelta(days=6))] + weekly_periods(DAY0 + timedelta(days=14), 4)
+    expected = [
+        WeeklyReport.compute_stats([t for t in tasks if overlaps_period(t, ps, pe)], ps, pe)
+        for ps, pe in periods
+    ]
+    assert WeeklyReport.compute_stats_batch(tasks, periods) == expected
+
+
+def test_batch_without_periods_or_tasks():
+    assert WeeklyReport.compute_stats_batch(make_tasks(10), []) == []
+    assert WeeklyReport.compute_stats_batch([], weekly_periods(DAY0, 2)) == [(0, 0, 0), (0, 0, 0)]